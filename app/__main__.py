@@ -6,20 +6,48 @@ import traceback
 import sys
 from argparse import ArgumentParser, SUPPRESS
 from app.parser import *
+from app.stream_parser import *
 from app.schema import *
 from app.definition_helper import *
+from app.generator import GeneratorBase, GeneratorOptions
+from app.dispatch import DISPATCH_STRATEGIES
+from app.tag_profile import TagProfile
+from app.cache import *
+
+def load_ir(schema_path: str, package_name: str | None, options: GeneratorOptions, cache: SchemaCache | None, decimal_scales: dict | None = None) -> dict:
+    ''' returns the generator IR, from the cache when the schema and its fragments did not change '''
+    decimal_scales = decimal_scales if decimal_scales != None else {}
+    if cache != None:
+        key = cache.make_key(schema_path, package_name, options.cache_key() + tuple(f'scale={name}:{scale}' for name, scale in sorted(decimal_scales.items())))
+        entry = cache.load(key)
+        if entry != None:
+            ir = entry.get_ir()
+            if ir != None:
+                return ir
+    stream_parser = StreamParser.from_file(schema_path)
+    schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(stream_parser.get_schema(package_name), decimal_scales)
+    ir = GeneratorBase.make_ir(schema_definition, options)
+    if cache != None:
+        cache.store(key, [schema_path] + stream_parser.included_files, schema_definition, ir)
+    return ir
 
 def main() -> None:
     parser = ArgumentParser(prog='fix-converter-gen', description='FIX codec generator')
     parser.add_argument('--schema', help='path to xml schema', required=True)
     parser.add_argument('--destination', help='path to directory where codec will be written', required=True)
-    parser.add_argument('--generator', help='choose generator (available: cpp, rust or cppng)', default='cpp', type=str)
+    parser.add_argument('--generator', help='choose generator (available: cpp, rust, cppng or python)', default='cpp', type=str)
     parser.add_argument('--package', help='override model name property', default='', type=str)
+    parser.add_argument('--dispatch', help='tag dispatch of the messages and groups, auto picks the cheapest of the cost model', default='auto', choices=['auto'] + DISPATCH_STRATEGIES)
+    parser.add_argument('--tag-profile', help='tag histograms collected from FIX logs with python -m app.tag_profile, the hot tags are dispatched first', default='', type=str)
+    parser.add_argument('--decimal-scales', help='JSON file of the decimals of PRICE, QTY, AMT and PERCENTAGE fields by name, {"Price": 4}', default='', type=str)
+    parser.add_argument('--no-cache', help='always parse and resolve the schema, do not read or write the cache', action='store_true')
+    parser.add_argument('--cache-dir', help='path to the directory of the parsed schema cache', default=SchemaCache.default_directory(), type=str)
+    parser.add_argument('--cache-size', help='maximum size of the cache directory in MB', default=DEFAULT_CACHE_SIZE // (1024 * 1024), type=int)
 
     args = parser.parse_args()
 
-    if args.generator != 'cpp' and args.generator != 'rust' and args.generator != 'cppng':
-        sys.exit('The possible generator are cpp, rust and cppng')
+    if args.generator != 'cpp' and args.generator != 'rust' and args.generator != 'cppng' and args.generator != 'python':
+        sys.exit('The possible generator are cpp, rust, cppng and python')
 
     try:
         module = importlib.import_module(f'app.generation.{args.generator}')
@@ -27,9 +55,19 @@ def main() -> None:
         package_name = None
         if len(args.package) != 0:
             package_name = args.package
-        schema = Parser.from_file(args.schema).get_schema(package_name)
+        cache = None
+        if not args.no_cache:
+            cache = SchemaCache(args.cache_dir, args.cache_size * 1024 * 1024)
         generator = Generator(args.destination)
-        generator.generate(DefinitionHelper.generate_schema_definition_from_schema_parser(schema))
+        tag_profile = None
+        if len(args.tag_profile) != 0:
+            tag_profile = TagProfile.load(args.tag_profile)
+        decimal_scales = {}
+        if len(args.decimal_scales) != 0:
+            decimal_scales = DefinitionHelper.load_decimal_scales(args.decimal_scales)
+        options = GeneratorOptions(dispatch=args.dispatch, tag_profile=tag_profile)
+        generator.generate_from_ir(load_ir(args.schema, package_name, options, cache, decimal_scales))
+        print(f'{args.destination}: {generator.writer.summary()}')
     except Exception as e:
         sys.exit(traceback.format_exc())
         sys.exit(f'error: {e}')
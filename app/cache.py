@@ -0,0 +1,145 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from typing import Optional, List, Tuple, Any
+
+""" bump it when the layout of the cache entries changes """
+CACHE_FORMAT_VERSION = 1
+
+""" default bound of the cache directory size, in bytes """
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+CACHE_ENTRY_SUFFIX = '.pickle'
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class CacheEntry:
+    ''' the payloads are pickled apart, a warm run only pays the unpickling of what it uses '''
+
+    def __init__(self, dependencies: List[Tuple[str, str]], schema_definition_blob: bytes, ir_blob: bytes | None) -> None:
+        self.dependencies = dependencies
+        self.schema_definition_blob = schema_definition_blob
+        self.ir_blob = ir_blob
+
+    def get_schema_definition(self) -> Any:
+        return pickle.loads(self.schema_definition_blob)
+
+    def get_ir(self) -> dict | None:
+        if self.ir_blob == None:
+            return None
+        return pickle.loads(self.ir_blob)
+
+class SchemaCache:
+    ''' On-disk cache of the resolved SchemaDefinition and of the generator IR.
+
+        An entry is keyed by the hash of the schema file, the package override, the generator
+        options and the code of the application. The hashes of the xi:included fragments are
+        stored inside the entry and checked on load, a changed fragment is a cache miss. '''
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def default_directory() -> str:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(cache_home, 'fix-converter-gen')
+
+    @staticmethod
+    def code_hash() -> str:
+        ''' hash of the application sources, an upgrade of the generator invalidates the entries '''
+        digest = hashlib.sha256()
+        app_path = pathlib.Path(__file__).parent
+        for source_path in sorted(app_path.rglob('*.py')):
+            if source_path.name.startswith('test_'):
+                continue
+            digest.update(str(source_path.relative_to(app_path)).encode())
+            digest.update(source_path.read_bytes())
+        return digest.hexdigest()
+
+    def make_key(self, schema_path: str, package: str | None, options: Tuple[str, ...] = ()) -> str:
+        digest = hashlib.sha256()
+        digest.update(f'{CACHE_FORMAT_VERSION}\0{SchemaCache.code_hash()}\0'.encode())
+        digest.update(hash_file(schema_path).encode())
+        digest.update(f'\0{package}'.encode())
+        for option in options:
+            digest.update(f'\0{option}'.encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_ENTRY_SUFFIX)
+
+    def load(self, key: str) -> Optional[CacheEntry]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                entry = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # corrupted or written by an incompatible version
+            self._remove(entry_path)
+            return None
+
+        for dependency_path, dependency_hash in entry.dependencies:
+            try:
+                if hash_file(dependency_path) != dependency_hash:
+                    return None
+            except OSError:
+                return None
+
+        # the modification time is the last use, used by the eviction
+        os.utime(entry_path)
+        return entry
+
+    def store(self, key: str, dependencies: List[str], schema_definition: Any, ir: dict | None = None) -> None:
+        entry = CacheEntry(
+            dependencies = [(path, hash_file(path)) for path in dependencies],
+            schema_definition_blob = pickle.dumps(schema_definition, protocol=pickle.HIGHEST_PROTOCOL),
+            ir_blob = None if ir == None else pickle.dumps(ir, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                pickle.dump(entry, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        ''' removes the least recently used entries until the cache fits in max_size '''
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                continue
+            entry_stat = entry.stat()
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+            total_size += entry_stat.st_size
+        entries.sort()
+        for _, entry_size, entry_path in entries:
+            if total_size <= self.max_size:
+                break
+            self._remove(entry_path)
+            total_size -= entry_size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,440 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.definition import FieldDefinition, SchemaDefinition
+
+""" the null of the int64, scaled decimal and timestamp columns, NaT for a datetime64[ns] """
+INT64_NULL = np.iinfo(np.int64).min
+
+""" a value left in the buffer, its offset from the start of the buffer, -1 when the field is absent """
+SLICE_DTYPE = np.dtype([('offset', np.int64), ('length', np.int32)])
+
+""" the digits of the longest number parsed, the ones of the int64 range, a longer value is null """
+MAX_DIGITS = 19
+
+POWERS_OF_TEN = np.array([10 ** exponent for exponent in range(MAX_DIGITS + 1)], dtype=np.uint64)
+
+""" the largest magnitude of a positive int64 """
+INT64_MAX = np.uint64(np.iinfo(np.int64).max)
+
+""" the low length bytes of a packed value, by length """
+PACKED_MASKS = np.array([(1 << (8 * length)) - 1 for length in range(9)], dtype=np.uint64)
+
+""" the '0' padding the digits of a tag packed in the high bytes, by length """
+PACKED_ZEROS = np.array([int.from_bytes(b'0' * (8 - length), 'little') for length in range(9)], dtype=np.uint64)
+
+""" the kind of column of a field by FIX type, the decimal fields are scaled and the other types are slices """
+COLUMN_KINDS = {
+    'INT': 'int',
+    'LENGTH': 'int',
+    'SEQNUM': 'int',
+    'NUMINGROUP': 'int',
+    'DAYOFMONTH': 'int',
+    'TAGNUM': 'int',
+    'FLOAT': 'float',
+    'PRICEOFFSET': 'float',
+    'BOOLEAN': 'bool',
+    'UTCTIMESTAMP': 'timestamp',
+    'LOCALMKTDATE': 'timestamp',
+}
+
+""" the multiplier of the decimals of second of a UTCTIMESTAMP, by length of the value """
+FRACTION_MULTIPLIERS = {17: 0, 21: 1000000, 24: 1000, 27: 1}
+
+@dataclass(frozen=True)
+class Column:
+    ''' a field of a message type, a column of its structured array. The kind tells how the value is stored:
+        int, scaled (int64 * 10^scale), float, timestamp (ns since the epoch), enum (code of the value in
+        categories), bool or slice (offset and length of the value in the buffer) '''
+    name: str
+    tag: int
+    kind: str
+    scale: Optional[int] = field(default=None)
+    # the values of an enum field, the code of a value is its position + 1, 0 when absent or unknown
+    categories: Tuple[bytes, ...] = field(default=())
+
+    @property
+    def dtype(self) -> np.dtype:
+        if self.kind == 'enum':
+            return np.dtype(np.uint8 if len(self.categories) < 256 else np.uint16)
+        return np.dtype({'int': np.int64, 'scaled': np.int64, 'float': np.float64, 'timestamp': 'datetime64[ns]', 'bool': np.int8}.get(self.kind, SLICE_DTYPE))
+
+    @property
+    def null(self):
+        return {'int': INT64_NULL, 'scaled': INT64_NULL, 'float': np.nan, 'timestamp': np.datetime64('NaT'), 'enum': 0, 'bool': -1}.get(self.kind, (-1, 0))
+
+    @staticmethod
+    def from_field(tag: int, definition: FieldDefinition) -> Column:
+        # the values of a MULTIPLEVALUESTRING are lists, the values packed in more than 8 bytes are not coded
+        if len(definition.values) != 0 and definition.type != 'MULTIPLEVALUESTRING' and max(len(value) for value in definition.values) <= 8:
+            return Column(definition.name, tag, 'enum', categories=tuple(value.encode('latin-1') for value in definition.values))
+        if definition.primitive_type == 'decimal':
+            return Column(definition.name, tag, 'scaled', definition.scale)
+        return Column(definition.name, tag, COLUMN_KINDS.get(definition.type, 'slice'))
+
+class ColumnarDecoder:
+    ''' Bulk decoder of FIX logs into a NumPy structured array per MsgType, a row per message.
+
+        The messages are framed by their BodyLength, the text between them (new lines, timestamps of the log) is
+        skipped. The fields of a chunk of messages are split, their tags parsed and their values converted with
+        array operations, there is no Python object per message nor per field. The columns are the fields of the
+        message in the dictionary, header and trailer included, the fields of the repeating groups are left out and
+        their NUMINGROUP is the count. A field set twice keeps its last value, a malformed value is null. '''
+
+    def __init__(self, schema: SchemaDefinition, msg_types: Optional[Iterable[str]] = None, fields: Optional[Iterable[str]] = None, chunk_size: int = 4 << 20) -> None:
+        ''' the columns of the messages of msg_types, of every message when None, limited to the fields named in
+            fields when given. chunk_size is the bytes of messages decoded at a time '''
+        self.chunk_size = chunk_size
+        self.columns: Dict[str, List[Column]] = {}
+        for message in schema.messages.values():
+            if msg_types == None or message.msg_type in msg_types:
+                self.columns[message.msg_type] = [Column.from_field(tag, schema.fields[value.name]) for tag, value in message.fields.items() if fields == None or value.name in fields]
+        self.dtypes = {msg_type: np.dtype([('message_offset', np.int64), ('message_length', np.int32)] + [(column.name, column.dtype) for column in columns])
+                       for msg_type, columns in self.columns.items()}
+        # the tag of the LENGTH field of each DATA field
+        self.data_tags = {definition.number: schema.fields[definition.length_field].number for definition in schema.fields.values() if definition.length_field != None}
+        # the column of a field by the index of its MsgType and the tag, -1 outside the columns
+        self.width = max([len(columns) for columns in self.columns.values()], default=0)
+        tags = sorted({column.tag for columns in self.columns.values() for column in columns})
+        # one more entry for the tags out of the table and the -1 of the malformed tags
+        self.tag_ids = np.full((tags[-1] if len(tags) != 0 else 0) + 2, -1, dtype=np.int32)
+        self.tag_ids[tags] = np.arange(len(tags))
+        self.type_columns = np.full((len(self.columns) + 1, len(tags) + 1), -1, dtype=np.int32)
+        for type_index, columns in enumerate(self.columns.values()):
+            for index, column in enumerate(columns):
+                self.type_columns[type_index, self.tag_ids[column.tag]] = index
+        packed_types = np.array([ColumnarDecoder.pack_value(msg_type.encode('latin-1')) for msg_type in self.columns], dtype=np.uint64)
+        self.type_order = np.argsort(packed_types)
+        self.sorted_types = packed_types[self.type_order]
+        self.enum_keys = {}
+        for columns in self.columns.values():
+            for column in columns:
+                if column.kind == 'enum' and column.name not in self.enum_keys:
+                    keys = np.array([ColumnarDecoder.pack_value(value) for value in column.categories], dtype=np.uint64)
+                    order = np.argsort(keys)
+                    self.enum_keys[column.name] = (keys[order], (order + 1).astype(column.dtype))
+
+    def column(self, msg_type: str, name: str) -> Column:
+        return next(column for column in self.columns[msg_type] if column.name == name)
+
+    @staticmethod
+    def pack_value(value: bytes) -> int:
+        ''' the bytes of a value of up to 8 bytes in one integer, the first byte in the low byte '''
+        return int.from_bytes(value, 'little') if len(value) <= 8 else 0
+
+    @staticmethod
+    def slice_value(data, value) -> Optional[bytes]:
+        ''' the bytes of a slice column, None when the field is absent '''
+        offset, length = int(value['offset']), int(value['length'])
+        return None if offset < 0 else bytes(data[offset:offset + length])
+
+    @staticmethod
+    def find_messages(data) -> Tuple[np.ndarray, np.ndarray]:
+        ''' the start and the end of the messages framed by their BodyLength and followed by a CheckSum, the
+            8=FIX inside a message (a DATA payload, a text) does not start another one '''
+        starts, ends, _ = ColumnarDecoder.frame_messages(data, 0, len(data))
+        return starts, ends
+
+    @staticmethod
+    def frame_messages(data, position: int, stop: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        ''' find_messages from position, up to the first message starting at or after stop. Returns the start of
+            that message too, -1 when there is none '''
+        starts = []
+        ends = []
+        start = data.find(b'8=FIX', position)
+        while start >= 0:
+            length_start = data.find(b'\x019=', start, start + 24)
+            length_end = data.find(b'\x01', length_start + 3, length_start + 13) if length_start >= 0 else -1
+            length = data[length_start + 3:length_end]
+            if length_end >= 0 and length.isdigit():
+                body_end = length_end + 1 + int(length)
+                if data[body_end:body_end + 3] == b'10=' and data[body_end + 6:body_end + 7] == b'\x01':
+                    if start >= stop:
+                        break
+                    starts.append(start)
+                    ends.append(body_end + 7)
+                    start = data.find(b'8=FIX', body_end + 7)
+                    continue
+            start = data.find(b'8=FIX', start + 1)
+        return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64), start
+
+    @staticmethod
+    def gather(region: np.ndarray, start: np.ndarray, length: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        ''' the first width bytes of each value as the rows of a matrix, and which of them are inside the value '''
+        offsets = np.arange(width)
+        inside = offsets < length[:, None]
+        characters = region[np.minimum(start[:, None] + offsets, len(region) - 1)]
+        return np.where(inside, characters, 0), inside
+
+    @staticmethod
+    def pack_values(window: np.ndarray, start: np.ndarray, length: np.ndarray) -> np.ndarray:
+        ''' pack_value of each value, 0 for a value longer than 8 bytes '''
+        return np.where(length <= 8, window[start] & PACKED_MASKS[np.clip(length, 0, 8)], 0)
+
+    @staticmethod
+    def parse_tags(window: np.ndarray, start: np.ndarray, length: np.ndarray) -> np.ndarray:
+        ''' the tags of 1 to 8 digits, -1 for a tag of other bytes. The digits are packed in one integer, checked
+            and combined by pairs, then by fours and by eights '''
+        clipped = np.clip(length, 1, 8)
+        digits = ((window[start] & PACKED_MASKS[clipped]) << (np.uint64(64) - clipped.astype(np.uint64) * np.uint64(8)) | PACKED_ZEROS[clipped]) - np.uint64(0x3030303030303030)
+        valid = ((digits | (digits + np.uint64(0x7676767676767676))) & np.uint64(0x8080808080808080) == 0) & (length >= 1) & (length <= 8)
+        digits = ((digits & np.uint64(0x0F0F0F0F0F0F0F0F)) * np.uint64(2561)) >> np.uint64(8)
+        digits = ((digits & np.uint64(0x00FF00FF00FF00FF)) * np.uint64(6553601)) >> np.uint64(16)
+        digits = ((digits & np.uint64(0x0000FFFF0000FFFF)) * np.uint64(42949672960001)) >> np.uint64(32)
+        return np.where(valid, digits.astype(np.int64), -1)
+
+    @staticmethod
+    def parse_unsigned(region: np.ndarray, start: np.ndarray, length: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ''' the values of 1 to MAX_DIGITS digits, and which of them are valid, the ones above the int64 range are not '''
+        valid = (length >= 1) & (length <= MAX_DIGITS)
+        values = np.zeros(len(start), dtype=np.uint64)
+        last = len(region) - 1
+        for position in range(min(int(length.max(initial=0)), MAX_DIGITS)):
+            digits = region[np.minimum(start + position, last)] - np.uint8(48)
+            inside = position < length
+            valid &= ~inside | (digits <= 9)
+            values = np.where(inside, values * 10 + digits, values)
+        return values.astype(np.int64), valid & (values <= INT64_MAX)
+
+    @staticmethod
+    def parse_decimal(region: np.ndarray, start: np.ndarray, length: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        ''' the sign and the unsigned mantissa of values of up to MAX_DIGITS digits with at most one decimal point,
+            their number of decimals, and which of them are valid '''
+        width = min(int(length.max(initial=1)), MAX_DIGITS + 2)
+        characters, inside = ColumnarDecoder.gather(region, start, length, width)
+        negative = characters[:, 0] == ord('-')
+        point = characters == ord('.')
+        digits = characters - np.uint8(48)
+        is_digit = inside & (digits <= 9)
+        sign = np.zeros_like(inside)
+        sign[:, 0] = negative
+        digit_count = is_digit.sum(axis=1)
+        points = point.sum(axis=1)
+        valid = (is_digit | point | sign | ~inside).all(axis=1) & (points <= 1) & (digit_count >= 1) & (digit_count <= MAX_DIGITS) & (length <= width)
+        mantissa = np.zeros(len(start), dtype=np.uint64)
+        for position in range(width):
+            mantissa = np.where(is_digit[:, position], mantissa * 10 + digits[:, position], mantissa)
+        decimals = np.where(points == 1, length - 1 - point.argmax(axis=1), 0)
+        return negative, mantissa, decimals, valid
+
+    @staticmethod
+    def parse_scaled(region: np.ndarray, start: np.ndarray, length: np.ndarray, scale: int) -> Tuple[np.ndarray, np.ndarray]:
+        ''' the values as int64 scaled by 10^scale, the extra decimals must be zeros and the scaled value fit in
+            the int64 range '''
+        negative, mantissa, decimals, valid = ColumnarDecoder.parse_decimal(region, start, length)
+        shift = scale - decimals
+        up = shift >= 0
+        power = POWERS_OF_TEN[np.clip(np.abs(shift), 0, MAX_DIGITS)]
+        # the magnitude of the int64 minimum is one more than the maximum
+        bound = INT64_MAX + negative.astype(np.uint64)
+        valid &= np.where(up, mantissa <= bound // power, mantissa % power == 0)
+        values = np.where(up, mantissa * np.where(valid, power, 1), mantissa // power).astype(np.int64)
+        return np.where(negative, -values, values), valid
+
+    @staticmethod
+    def days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+        ''' the days from 1970-01-01 to dates of the proleptic Gregorian calendar '''
+        year = year - (month <= 2)
+        era = year // 400
+        year_of_era = year - era * 400
+        day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+        return era * 146097 + year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year - 719468
+
+    @staticmethod
+    def parse_timestamp(region: np.ndarray, start: np.ndarray, length: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ''' the nanoseconds since the epoch of UTCTIMESTAMP values, YYYYMMDD-HH:MM:SS with 0, 3, 6 or 9 decimals of
+            second, or of the midnight of LOCALMKTDATE values, YYYYMMDD. The dates are the ones of datetime64[ns],
+            1678 to 2261, and 60 seconds is a leap second '''
+        characters, inside = ColumnarDecoder.gather(region, start, length, 27)
+        digits = characters.astype(np.int64) - 48
+        is_digit = (digits >= 0) & (digits <= 9)
+
+        def number(first: int, last: int) -> np.ndarray:
+            value = np.zeros(len(start), dtype=np.int64)
+            for position in range(first, last):
+                value = value * 10 + digits[:, position]
+            return value
+
+        with_time = length > 8
+        with_fraction = length > 17
+        valid = np.isin(length, [8] + list(FRACTION_MULTIPLIERS)) & is_digit[:, 0:8].all(axis=1)
+        valid &= ~with_time | ((characters[:, 8] == ord('-')) & (characters[:, 11] == ord(':')) & (characters[:, 14] == ord(':')) & is_digit[:, [9, 10, 12, 13, 15, 16]].all(axis=1))
+        valid &= ~with_fraction | ((characters[:, 17] == ord('.')) & (is_digit[:, 18:] | ~inside[:, 18:]).all(axis=1))
+        year, month, day = number(0, 4), number(4, 6), number(6, 8)
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_days = np.where(month == 2, 28 + leap, 30 + ((month + (month >> 3)) & 1))
+        valid &= (year >= 1678) & (year <= 2261) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+        hour, minute, second = number(9, 11), number(12, 14), number(15, 17)
+        # 60 is a leap second
+        valid &= ~with_time | ((hour <= 23) & (minute <= 59) & (second <= 60))
+        seconds = ColumnarDecoder.days_from_civil(year, month, day) * 86400 + np.where(with_time, hour * 3600 + minute * 60 + second, 0)
+        fraction = np.zeros(len(start), dtype=np.int64)
+        for position in range(18, 27):
+            fraction = np.where(inside[:, position], fraction * 10 + digits[:, position], fraction)
+        multiplier = np.select([length == 21, length == 24, length == 27], [1000000, 1000, 1], 0)
+        return np.where(valid, seconds * 1000000000 + fraction * multiplier, INT64_NULL), valid
+
+    def fill(self, rows: np.ndarray, column: Column, chunk: dict, row: np.ndarray, start: np.ndarray, length: np.ndarray) -> None:
+        ''' the values of a column in the rows, the values not valid for their kind stay null '''
+        region = chunk['region']
+        if column.kind == 'slice':
+            rows[column.name]['offset'][row] = start + chunk['base']
+            rows[column.name]['length'][row] = length
+            return
+        if column.kind == 'enum':
+            keys, codes = self.enum_keys[column.name]
+            packed = ColumnarDecoder.pack_values(chunk['window'], start, length)
+            position = np.minimum(np.searchsorted(keys, packed), len(keys) - 1)
+            values, valid = codes[position], keys[position] == packed
+        elif column.kind == 'bool':
+            values = (region[start] == ord('Y')).astype(np.int8)
+            valid = (length == 1) & ((region[start] == ord('Y')) | (region[start] == ord('N')))
+        elif column.kind == 'int':
+            negative = region[start] == ord('-')
+            values, valid = ColumnarDecoder.parse_unsigned(region, start + negative, length - negative)
+            values = np.where(negative, -values, values)
+        elif column.kind == 'scaled':
+            values, valid = ColumnarDecoder.parse_scaled(region, start, length, column.scale)
+        elif column.kind == 'float':
+            negative, mantissa, decimals, valid = ColumnarDecoder.parse_decimal(region, start, length)
+            values = np.where(negative, -1.0, 1.0) * mantissa / np.power(10.0, decimals)
+        elif column.kind == 'timestamp':
+            values, valid = ColumnarDecoder.parse_timestamp(region, start, length)
+            values = values.view('datetime64[ns]')
+        else:
+            raise Exception(f'Internal Error: unknown column kind "{column.kind}"')
+        rows[column.name][row[valid]] = values[valid]
+
+    def split_fields(self, chunk: dict, payload_separators: Optional[np.ndarray] = None) -> dict:
+        ''' the message, tag and value of every field of the messages of the chunk, the SOH inside the DATA
+            payloads are not separators. A field without a tag of digits has the tag -1 '''
+        region, starts, ends = chunk['region'], chunk['starts'], chunk['ends']
+        # the SOH and the = in the order of the buffer, the first one after a SOH ends the tag of the next field
+        delimiters = np.flatnonzero((region == 1) | (region == ord('=')))
+        is_separator = region[delimiters] == 1
+        if payload_separators is not None:
+            is_separator[np.isin(delimiters, payload_separators)] = False
+        separator_index = np.flatnonzero(is_separator)
+        separators = delimiters[separator_index]
+        # the separators of a message are a range, those of the text between the messages are dropped
+        first = np.searchsorted(separators, starts)
+        counts = np.searchsorted(separators, ends) - first
+        message_first = np.cumsum(counts) - counts
+        if len(separators) != counts.sum():
+            kept = np.repeat(first - message_first, counts) + np.arange(counts.sum())
+            separators, separator_index = separators[kept], separator_index[kept]
+        field_start = np.empty_like(separators)
+        field_start[1:] = separators[:-1] + 1
+        following = np.empty_like(separator_index)
+        following[1:] = separator_index[:-1] + 1
+        # the text before a message may hold a =
+        field_start[message_first] = starts
+        following[message_first] = np.searchsorted(delimiters, starts)
+        equal = delimiters[following]
+        tag_end = np.where(equal < separators, equal, field_start)
+        return {
+            'message': np.repeat(np.arange(len(starts)), counts),
+            'start': field_start,
+            'tag': ColumnarDecoder.parse_tags(chunk['window'], field_start, tag_end - field_start),
+            'value_start': tag_end + 1,
+            'value_length': separators - tag_end - 1,
+        }
+
+    def find_payload_separators(self, chunk: dict, fields: dict) -> np.ndarray:
+        ''' the SOH inside the DATA payloads, a payload is as long as the value of the LENGTH field before it '''
+        region = chunk['region']
+        separators = []
+        payload_end = -1
+        for index in np.flatnonzero(np.isin(fields['tag'], list(self.data_tags), kind='table')):
+            # a payload holding text looking like a DATA field
+            if fields['start'][index] < payload_end or index == 0 or fields['tag'][index - 1] != self.data_tags[int(fields['tag'][index])]:
+                continue
+            length = bytes(region[fields['value_start'][index - 1]:fields['value_start'][index - 1] + fields['value_length'][index - 1]])
+            if not length.isdigit():
+                continue
+            value_start = int(fields['value_start'][index])
+            end = value_start + int(length)
+            if end >= chunk['ends'][fields['message'][index]] or region[end] != 1:
+                continue
+            separators.append(np.flatnonzero(region[value_start:end] == 1) + value_start)
+            payload_end = end
+        return np.concatenate(separators) if len(separators) != 0 else None
+
+    def decode_chunk(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+        base = int(starts[0])
+        # 8 bytes of padding, the window reads 8 bytes at any position of the region
+        region = np.zeros(int(ends[-1]) - base + 8, dtype=np.uint8)
+        region[:-8] = buffer[base:int(ends[-1])]
+        chunk = {
+            'base': base,
+            'region': region,
+            'window': np.ndarray(shape=(len(region) - 7,), dtype='<u8', buffer=region, strides=(1,)),
+            'starts': starts - base,
+            'ends': ends - base,
+        }
+        fields = self.split_fields(chunk)
+        if len(self.data_tags) != 0 and np.isin(fields['tag'], list(self.data_tags), kind='table').any():
+            payload_separators = self.find_payload_separators(chunk, fields)
+            if payload_separators is not None:
+                fields = self.split_fields(chunk, payload_separators)
+        message, tags = fields['message'], fields['tag']
+
+        # the type of a message is its first MsgType, the index of the last row of type_columns when unknown
+        type_fields = np.flatnonzero(tags == 35)
+        type_fields = type_fields[np.unique(message[type_fields], return_index=True)[1]]
+        packed = ColumnarDecoder.pack_values(chunk['window'], fields['value_start'][type_fields], fields['value_length'][type_fields])
+        position = np.minimum(np.searchsorted(self.sorted_types, packed), len(self.sorted_types) - 1)
+        message_types = np.full(len(starts), len(self.columns), dtype=np.int64)
+        message_types[message[type_fields]] = np.where(self.sorted_types[position] == packed, self.type_order[position], len(self.columns))
+
+        # the fields of the columns grouped by type and column, in the order of the messages inside a group
+        field_types = message_types[message]
+        columns = self.type_columns[field_types, self.tag_ids[np.minimum(tags, len(self.tag_ids) - 1)]]
+        width = self.width
+        keys = field_types * width + columns
+        selected = np.flatnonzero(columns >= 0)
+        keys = keys[selected].astype(np.uint16 if len(self.columns) * width < 1 << 16 else np.int64)
+        selected = selected[np.argsort(keys, kind='stable')]
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=len(self.columns) * width))])
+
+        tables = {}
+        rows_of_message = np.zeros(len(starts), dtype=np.int64)
+        for type_index, msg_type in enumerate(self.columns):
+            messages = np.flatnonzero(message_types == type_index)
+            if len(messages) == 0:
+                continue
+            rows = np.empty(len(messages), dtype=self.dtypes[msg_type])
+            rows['message_offset'] = starts[messages]
+            rows['message_length'] = ends[messages] - starts[messages]
+            rows_of_message[messages] = np.arange(len(messages))
+            for index, column in enumerate(self.columns[msg_type]):
+                rows[column.name] = column.null
+                picked = selected[bounds[type_index * width + index]:bounds[type_index * width + index + 1]]
+                if len(picked) != 0:
+                    self.fill(rows, column, chunk, rows_of_message[message[picked]], fields['value_start'][picked], fields['value_length'][picked])
+            tables[msg_type] = rows
+        return tables
+
+    def decode(self, data) -> Dict[str, np.ndarray]:
+        ''' the rows of the messages of data (bytes, bytearray, mmap) by MsgType, in the order of the messages.
+            The messages of a MsgType outside the decoder are skipped '''
+        if len(self.columns) == 0:
+            return {}
+        starts, ends = ColumnarDecoder.find_messages(data)
+        return self.decode_messages(data, starts, ends)
+
+    def decode_messages(self, data, starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+        ''' the rows of the messages of data between starts and ends, framed by frame_messages '''
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        parts: Dict[str, list] = {msg_type: [] for msg_type in self.columns}
+        first = 0
+        while first < len(starts):
+            last = max(int(np.searchsorted(starts, starts[first] + self.chunk_size)), first + 1)
+            for msg_type, rows in self.decode_chunk(buffer, starts[first:last], ends[first:last]).items():
+                parts[msg_type].append(rows)
+            first = last
+        return {msg_type: np.concatenate(rows) for msg_type, rows in parts.items() if len(rows) != 0}
@@ -4,8 +4,9 @@
 from __future__ import annotations
 
 import enum
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, List, Union, Mapping, Iterator
 
 @dataclass(frozen=True)
 class ValueDefinition:
@@ -21,6 +22,10 @@ class FieldDefinition:
     primitive_type: str = field(default_factory=str)
     is_enum: bool = field(default=False)
     values: Dict[str, ValueDefinition] = field(default_factory=dict)
+    # the LENGTH field announcing the size of a DATA field
+    length_field: Optional[str] = field(default=None)
+    # the decimals of a decimal field, its values are int64 scaled by 10^scale
+    scale: Optional[int] = field(default=None)
 
 @dataclass(frozen=True)
 class GroupDefinition:
@@ -28,7 +33,7 @@ class GroupDefinition:
     number_element_field: FieldValue = field(default=None)
     start_group_field: Union[FieldValue, GroupValue] = field(default=None)
     fields: Dict[int, Union[FieldValue, GroupValue]] = field(default_factory=dict)
-    fields_by_tree: TreeDefinition = field(default=None)
+    fields_by_tree: TagTree = field(default=None)
 
 @dataclass
 class FieldValue:
@@ -52,7 +57,9 @@ class GroupValue:
 @dataclass(frozen=True)
 class ComponentValue:
     name: str = field(default_factory=str)
-    fields: Dict[int, Union[FieldValue, GroupValue]] = field(default_factory=dict)
+    fields: Mapping[str, Union[FieldValue, GroupValue]] = field(default_factory=dict)
+    # flattened fields seen through a reference, by the required flag of the reference
+    fields_by_reference: Mapping[bool, Mapping[str, Union[FieldValue, GroupValue]]] = field(default_factory=dict, compare=False)
 
 @dataclass(frozen=True)
 class MessageDefinition:
@@ -60,7 +67,7 @@ class MessageDefinition:
     msg_type: str = field(default_factory=str)
     msg_category: Optional[str] = field(default=None)
     fields: Dict[int, Union[FieldValue, GroupValue]] = field(default_factory=dict)
-    fields_by_tree: TreeDefinition = field(default=None)
+    fields_by_tree: TagTree = field(default=None)
 
 @dataclass(frozen=True)
 class HeaderDefinition:
@@ -83,18 +90,133 @@ class SchemaDefinition:
     version: Optional[str] = field(default=None)
 
 class TreeDefinition:
-    def __init__(self):
-        self.value = None
-        self.tree_ids = dict()
-        self.depth = 1
+    ''' view of one node of a TagTree, with the interface of a dict based tree node '''
+    __slots__ = ('tree', 'index')
 
-    def find(self, id_field: str) -> bool:
-        if id_field in self.tree_ids:
-            return True
-        return False
+    def __init__(self, tree: TagTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    @property
+    def value(self) -> Optional[Union[FieldValue, GroupValue]]:
+        return self.tree.values[self.index]
+
+    @property
+    def depth(self) -> int:
+        return self.tree.depths[self.index]
 
-    def add_value(self, value: Union[FieldValue, GroupValue]):
-        self.value = value
+    @property
+    def tree_ids(self) -> Optional[Dict[str, TreeDefinition]]:
+        if self.tree.first_child[self.index] == -1:
+            return None
+        return {self.tree.label(child): TreeDefinition(self.tree, child) for child in self.tree.children(self.index)}
 
-    def add_sub_node(self, id_field: str, node):
-        self.tree_ids[id_field] = node
+    def find(self, id_field: str) -> bool:
+        return self.tree.find_child(self.index, id_field) != -1
+
+class TagTree:
+    ''' Trie of the tag numbers of a message or a group, keyed by the decimal digits.
+        The last digit of a tag has a '=' child, the leaf holding the FieldValue or GroupValue.
+        The nodes live in flat arrays, node 0 is the root and the children of a node are linked by
+        first_child / next_sibling offsets, in the order of the sorted tags. '''
+    __slots__ = ('labels', 'first_child', 'next_sibling', 'depths', 'values')
+
+    def __init__(self) -> None:
+        self.labels = bytearray(b'\0')
+        self.first_child = array('i', [-1])
+        self.next_sibling = array('i', [-1])
+        self.depths = array('H', [1])
+        self.values: List[Optional[Union[FieldValue, GroupValue]]] = [None]
+
+    @staticmethod
+    def from_fields(fields: Mapping[int, Union[FieldValue, GroupValue]]) -> TagTree:
+        ''' one pass over the tags sorted as strings, each tag only adds the nodes after the
+            prefix shared with the previous tag '''
+        # built in lists, packed into the arrays at the end
+        labels = [0]
+        first_child = [-1]
+        next_sibling = [-1]
+        depths = [1]
+        values = [None]
+        # nodes of the previous tag by depth, path[0] is the root and the last one its leaf
+        path = [0]
+        previous_tag = ''
+        for tag, value in sorted([(str(number), value) for number, value in fields.items()], key=lambda x: x[0]):
+            if tag == previous_tag:
+                raise Exception(f'Internal Error: already defined value "{tag}"')
+            common = 0
+            while common < len(previous_tag) and previous_tag[common] == tag[common]:
+                common += 1
+            # the tags are sorted, the node of the previous tag below the shared prefix is the last child
+            sibling = path[common + 1] if len(path) > common + 1 else -1
+            del path[common + 1:]
+            parent = path[-1]
+            for label in tag[common:] + '=':
+                node = len(labels)
+                labels.append(ord(label))
+                first_child.append(-1)
+                next_sibling.append(-1)
+                depths.append(depths[parent] + 1)
+                values.append(None)
+                if sibling == -1:
+                    first_child[parent] = node
+                else:
+                    next_sibling[sibling] = node
+                path.append(node)
+                parent = node
+                sibling = -1
+            values[parent] = value
+            previous_tag = tag
+        tree = TagTree()
+        tree.labels = bytearray(labels)
+        tree.first_child = array('i', first_child)
+        tree.next_sibling = array('i', next_sibling)
+        tree.depths = array('H', depths)
+        tree.values = values
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def label(self, index: int) -> str:
+        return chr(self.labels[index])
+
+    def children(self, index: int) -> Iterator[int]:
+        child = self.first_child[index]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def find_child(self, index: int, label: str) -> int:
+        for child in self.children(index):
+            if self.labels[child] == ord(label):
+                return child
+        return -1
+
+    def find_value(self, tag: Union[int, str]) -> Optional[Union[FieldValue, GroupValue]]:
+        index = 0
+        for label in str(tag) + '=':
+            index = self.find_child(index, label)
+            if index == -1:
+                return None
+        return self.values[index]
+
+    @property
+    def root(self) -> TreeDefinition:
+        return TreeDefinition(self, 0)
+
+    # the tree itself reads as its root node
+    @property
+    def value(self) -> Optional[Union[FieldValue, GroupValue]]:
+        return self.root.value
+
+    @property
+    def depth(self) -> int:
+        return self.root.depth
+
+    @property
+    def tree_ids(self) -> Optional[Dict[str, TreeDefinition]]:
+        return self.root.tree_ids
+
+    def find(self, id_field: str) -> bool:
+        return self.root.find(id_field)
@@ -2,8 +2,11 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from app.definition import FieldValue
+from dataclasses import replace
+import json
+from types import MappingProxyType
 from typing import Required
-from typing import Dict, Union
+from typing import Dict, List, Union, Mapping
 from app.schema import *
 from app.definition import *
 from app.helpers import *
@@ -12,12 +15,12 @@ class DefinitionHelper:
 
     """ define primiteive data type conversion """
     PRIMITIVE_TYPE_BY_DEFINITION = UniqueKeysDict({
-        "LOCALMKTDATE": 'string',
+        "LOCALMKTDATE": 'timestamp',
         "STRING": 'string',
         "BOOLEAN": 'bool',
         "EXCHANGE": 'string',
-        "PRICE": 'long',
-        "QTY": 'int',
+        "PRICE": 'decimal',
+        "QTY": 'decimal',
         "SEQNUM": 'int',
         "NUMINGROUP": 'int',
         "INT": 'int',
@@ -25,15 +28,35 @@ class DefinitionHelper:
         "LENGTH": 'int',
         "DATA": 'string',
         "PADDEDSEQNUM": 'int',
-        "AMT": 'string',
+        "AMT": 'decimal',
         "VERSION_44": 'string',
-        "PERCENTAGE": 'long',
+        "PERCENTAGE": 'decimal',
         "CURRENCY": 'long',
         "CHAR": 'char',
         "MULTIPLEVALUESTRING": 'string',
-        "UTCTIMESTAMP": 'string',
+        "UTCTIMESTAMP": 'timestamp',
     })
 
+    """ the default scale of the decimal fields by type, a scales file overrides it by field name """
+    DEFAULT_SCALE_BY_TYPE = {
+        "PRICE": 8,
+        "QTY": 4,
+        "AMT": 4,
+        "PERCENTAGE": 6,
+    }
+
+    """ the largest scale, 10^18 is the largest power of ten of an int64 """
+    MAX_SCALE = 18
+
+    @staticmethod
+    def load_decimal_scales(path: str) -> Dict[str, int]:
+        ''' the scales of a JSON file, {"Price": 4, "OrderQty": 0} '''
+        with open(path, 'r') as scales_file:
+            scales = json.load(scales_file)
+        if not isinstance(scales, dict) or any(not isinstance(scale, int) or isinstance(scale, bool) for scale in scales.values()):
+            raise Exception(f'Internal Error: the scales of "{path}" are not an object of integers')
+        return scales
+
     @staticmethod
     def get_value_def(parsed_value: Field_Value) -> ValueDefinition:
         return ValueDefinition(
@@ -43,7 +66,7 @@ class DefinitionHelper:
         )
 
     @staticmethod
-    def get_field_def(field_parsed: Field) -> FieldDefinition:
+    def get_field_def(field_parsed: Field, decimal_scales: Mapping[str, int] = {}) -> FieldDefinition:
         primitive_result =  DefinitionHelper.PRIMITIVE_TYPE_BY_DEFINITION[field_parsed.field_type]
         if primitive_result == None:
             raise Exception(f'Internal Error: unsupported primitive "{field_parsed.field_type}"')
@@ -55,6 +78,14 @@ class DefinitionHelper:
                 values_definition_result = DefinitionHelper.get_value_def(value_parsed)
                 values_dict[values_definition_result.name] = values_definition_result
 
+        scale = None
+        if primitive_result == 'decimal':
+            scale = decimal_scales.get(field_parsed.name, DefinitionHelper.DEFAULT_SCALE_BY_TYPE[field_parsed.field_type])
+            if scale < 0 or scale > DefinitionHelper.MAX_SCALE:
+                raise Exception(f'Internal Error: the scale {scale} of "{field_parsed.name}" is not between 0 and {DefinitionHelper.MAX_SCALE}')
+        elif field_parsed.name in decimal_scales:
+            raise Exception(f'Internal Error: "{field_parsed.name}" is not a decimal field, it has no scale')
+
         return FieldDefinition(
             name = field_parsed.name,
             number = field_parsed.number,
@@ -62,16 +93,36 @@ class DefinitionHelper:
             primitive_type = primitive_result,
             is_enum = is_enum_bool,
             values = values_dict,
+            scale = scale,
         )
 
     @staticmethod
-    def generate_fields_definition(field_parsed: Dict[str, Field]) ->  Dict[str, FieldDefinition]:
+    def generate_fields_definition(field_parsed: Dict[str, Field], decimal_scales: Mapping[str, int] = {}) ->  Dict[str, FieldDefinition]:
+        for name in decimal_scales:
+            if name not in field_parsed:
+                raise Exception(f'Internal Error: scale of the undefined field "{name}"')
         fields_definition = UniqueKeysDict()
         for field_value in field_parsed.values():
-            fields_definition_result = DefinitionHelper.get_field_def(field_value)
+            fields_definition_result = DefinitionHelper.get_field_def(field_value, decimal_scales)
             fields_definition[fields_definition_result.name] = fields_definition_result
+        # a DATA field is paired with its LENGTH field, the decoders skip its payload without looking for a SOH
+        for name, field_definition in fields_definition.items():
+            if field_definition.type == 'DATA':
+                fields_definition.data[name] = replace(field_definition, length_field = DefinitionHelper.find_length_field(field_definition, fields_definition))
         return fields_definition
 
+    @staticmethod
+    def find_length_field(data_field: FieldDefinition, fields_definition: Dict[str, FieldDefinition]) -> str:
+        ''' the LENGTH field of a DATA field: named after it, RawDataLength for RawData or XmlDataLen for XmlData,
+            else the LENGTH field numbered just before it '''
+        for name in [f'{data_field.name}Length', f'{data_field.name}Len']:
+            if name in fields_definition and fields_definition[name].type == 'LENGTH':
+                return name
+        for field_definition in fields_definition.values():
+            if field_definition.type == 'LENGTH' and data_field.number != None and field_definition.number == data_field.number - 1:
+                return field_definition.name
+        raise Exception(f'Internal Error: no LENGTH field for the DATA field "{data_field.name}"')
+
     @staticmethod
     def get_field_value(field_name: str, required_bool: bool, field_parsed: Dict[str, Field]) -> FieldValue:
         if field_parsed[field_name] == None:
@@ -92,21 +143,28 @@ class DefinitionHelper:
         return GroupValue(name = message_group.name, required = message_group.required)
 
     @staticmethod
-    def get_fields_in_component(message_component: MessageComponent, actual_component_dict : Dict[str, ComponentValue])-> Dict[int, Union[FieldValue, GroupValue]]:
-        fields_in_component = UniqueKeysDict()
-        found_component = actual_component_dict[message_component.name]
+    def get_fields_in_component(message_component: MessageComponent, actual_component_dict : Dict[str, ComponentValue])-> Mapping[str, Union[FieldValue, GroupValue]]:
+        found_component = actual_component_dict.get(message_component.name)
         if found_component == None:
-            raise Exception(f'Internal Error: component "{message_component.name}" undefined or not defined at correct sequence')
-        for fields_in_found_component in found_component.fields.values():
+            raise Exception(f'Internal Error: component "{message_component.name}" undefined or not resolved')
+        fields_in_component = found_component.fields_by_reference.get(message_component.required)
+        if fields_in_component == None:
+            fields_in_component = DefinitionHelper.make_fields_by_reference(found_component.fields, message_component.required)
+        return fields_in_component
+
+    @staticmethod
+    def make_fields_by_reference(component_fields: Mapping[str, Union[FieldValue, GroupValue]], required_group: bool) -> Mapping[str, Union[FieldValue, GroupValue]]:
+        fields_in_component = UniqueKeysDict()
+        for fields_in_found_component in component_fields.values():
             if isinstance(fields_in_found_component, FieldValue):
                 fields_in_component[fields_in_found_component.name] = fields_in_found_component
             elif isinstance(fields_in_found_component, GroupValue):
                 fields_in_component[fields_in_found_component.name] = GroupValue(
                     name = fields_in_found_component.name,
                     required = fields_in_found_component.required,
-                    required_group = message_component.required,
+                    required_group = required_group,
                 )
-        return fields_in_component
+        return MappingProxyType(fields_in_component.data)
 
     @staticmethod
     def generate_component_value(component: Component, field_parsed: Dict[str, Field], actual_component_dict : Dict[str, ComponentValue]) -> ComponentValue:
@@ -124,19 +182,60 @@ class DefinitionHelper:
                 result_field = DefinitionHelper.get_group_value_from_message_group(field_in_component)
                 field_dict[result_field.name] = result_field
             elif isinstance(field_in_component, MessageComponent):
-                if actual_component_dict[field_in_component.name] == None:
-                    raise Exception(f'Internal Error: component "{field_in_component.name}" has to be defined before use it "{component.name}"')
+                if actual_component_dict.get(field_in_component.name) == None:
+                    raise Exception(f'Internal Error: component "{field_in_component.name}" has to be resolved before "{component.name}"')
                 result_fields =  DefinitionHelper.get_fields_in_component(field_in_component, actual_component_dict)
                 for result_field in result_fields.values():
                     field_dict[result_field.name] = result_field
-        return ComponentValue(name = name_str, fields = field_dict)
+        # the component is flattened only once, every reference shares the same immutable fields
+        fields_by_reference = {
+            False: DefinitionHelper.make_fields_by_reference(field_dict, False),
+            True: DefinitionHelper.make_fields_by_reference(field_dict, True),
+        }
+        return ComponentValue(name = name_str, fields = MappingProxyType(field_dict.data), fields_by_reference = MappingProxyType(fields_by_reference))
+
+    @staticmethod
+    def get_component_dependencies(component: Component) -> List[str]:
+        return [element.name for element in component.field_group_by_name.values() if isinstance(element, MessageComponent)]
+
+    @staticmethod
+    def sort_components(component_parsed: Dict[str, Component]) -> List[str]:
+        ''' names of the components in dependency order, whatever the order in the xml '''
+        sorted_names = []
+        # absent: not visited, False: in the current path, True: sorted
+        visit_state = {}
+        for root_name in component_parsed:
+            if root_name in visit_state:
+                continue
+            visit_state[root_name] = False
+            stack = [(root_name, iter(DefinitionHelper.get_component_dependencies(component_parsed[root_name])))]
+            while len(stack) != 0:
+                name, dependencies = stack[-1]
+                dependency = next(dependencies, None)
+                if dependency == None:
+                    stack.pop()
+                    visit_state[name] = True
+                    sorted_names.append(name)
+                elif dependency not in component_parsed:
+                    raise Exception(f'Malformed XML: undefined component "{dependency}" used in "{name}"')
+                elif dependency not in visit_state:
+                    visit_state[dependency] = False
+                    stack.append((dependency, iter(DefinitionHelper.get_component_dependencies(component_parsed[dependency]))))
+                elif visit_state[dependency] == False:
+                    path = [element[0] for element in stack]
+                    cycle = path[path.index(dependency):] + [dependency]
+                    raise Exception(f'Malformed XML: cyclic component definition "{" -> ".join(cycle)}"')
+        return sorted_names
 
     @staticmethod
     def generate_component_definition(component_parsed: Dict[str, Component], field_parsed: Dict[str, Field]) -> Dict[str, ComponentValue]:
+        resolved_components = dict()
+        for component_name in DefinitionHelper.sort_components(component_parsed):
+            resolved_components[component_name] = DefinitionHelper.generate_component_value(component_parsed[component_name], field_parsed, resolved_components)
+        # same order as the xml
         components_dict = UniqueKeysDict()
-        for component_data in component_parsed.values():
-            component_result =  DefinitionHelper.generate_component_value(component_data, field_parsed, components_dict)
-            components_dict[component_result.name] = component_result
+        for component_name in component_parsed:
+            components_dict[component_name] = resolved_components[component_name]
         return components_dict
 
     @staticmethod
@@ -157,17 +256,12 @@ class DefinitionHelper:
         keys = list(fields_dict)
         fields_dict[keys[-1]].set_end_message()
 
-        sorted_dictionary = sorted(fields_dict.items(), key=lambda x: str(x[0]))
-        root_node = TreeDefinition()
-        for field in sorted_dictionary:
-            DefinitionHelper.generate_tree_definition(str(field[0]), root_node, field[1])
-
         return MessageDefinition(
             name = parsed_message.name,
             msg_type = parsed_message.msg_type,
             msg_category = parsed_message.msg_category,
             fields = fields_dict,
-            fields_by_tree= root_node,
+            fields_by_tree = TagTree.from_fields(fields_dict),
         )
 
     @staticmethod
@@ -213,9 +307,18 @@ class DefinitionHelper:
     def get_group_definition_from_message_group(message_group: MessageGroup, field_parsed: Dict[str, Field], component_definition: Dict[str, ComponentValue]) -> GroupDefinition:
         number_element_field_field_value = DefinitionHelper.get_field_value(message_group.name, message_group.required, field_parsed)
         fields_in_group = DefinitionHelper.generate_field_group_values_from_field_component_group(message_group.field_by_name, field_parsed, component_definition)
-        start_value = list(fields_in_group.values())[0]
+        start_key = list(fields_in_group)[0]
+        start_value = fields_in_group[start_key]
         if start_value.required == False:
-            raise Exception(f'Start field "{start_value.name}" has to be required field')
+            # the first field delimits the entries of the group, it is present in every entry
+            # even when the dictionary declares it as not required. A new value is built, the parsed
+            # one may be shared by other messages and groups
+            if isinstance(start_value, FieldValue):
+                start_value = FieldValue(name = start_value.name, required = True, is_begin_message = start_value.is_begin_message,
+                                         is_end_message = start_value.is_end_message)
+            else:
+                start_value = GroupValue(name = start_value.name, required = True, required_group = start_value.required_group)
+            fields_in_group.data[start_key] = start_value
         if isinstance(start_value, FieldValue):
             start_group_field_field_value = start_value
         elif isinstance(start_value, GroupValue):
@@ -226,17 +329,12 @@ class DefinitionHelper:
         for field_element in fields_in_group.values():
             fields_in_group_by_number_by_number[field_parsed[field_element.name].number] = field_element
 
-        sorted_dictionary = sorted(fields_in_group_by_number_by_number.items(), key=lambda x: str(x[0]))
-        root_node = TreeDefinition()
-        for field in sorted_dictionary:
-            DefinitionHelper.generate_tree_definition(str(field[0]), root_node, field[1])
-
         result_group_definition = GroupDefinition(
                 name = message_group.name,
                 number_element_field = number_element_field_field_value,
                 start_group_field = start_group_field_field_value,
                 fields = fields_in_group_by_number_by_number,
-                fields_by_tree= root_node,
+                fields_by_tree = TagTree.from_fields(fields_in_group_by_number_by_number),
         )
         return result_group_definition
 
@@ -274,8 +372,8 @@ class DefinitionHelper:
         return group_dict
 
     @staticmethod
-    def generate_schema_definition_from_schema_parser(schema_parser: Schema) -> SchemaDefinition:
-        fields_def = DefinitionHelper.generate_fields_definition(schema_parser.fields)
+    def generate_schema_definition_from_schema_parser(schema_parser: Schema, decimal_scales: Mapping[str, int] = {}) -> SchemaDefinition:
+        fields_def = DefinitionHelper.generate_fields_definition(schema_parser.fields, decimal_scales)
         component_def = DefinitionHelper.generate_component_definition(schema_parser.components, schema_parser.fields)
         groups_def = DefinitionHelper.generate_group_definition(schema_parser.components, schema_parser.message, schema_parser.fields, component_def)
         header_def = DefinitionHelper.generate_header(schema_parser.header, schema_parser.fields, component_def)
@@ -291,34 +389,3 @@ class DefinitionHelper:
             fix_major_version = schema_parser.fix_major_version,
             package = schema_parser.package,
             version = schema_parser.version )
-
-    @staticmethod
-    def node_value(value: Union[FieldValue, GroupValue], depth: int) -> TreeDefinition:
-        result_node = TreeDefinition()
-        result_node.tree_ids = None
-        result_node.depth = depth
-        result_node.value = value
-        return result_node
-
-    @staticmethod
-    def node_eq(value: Union[FieldValue, GroupValue], depth: int) -> TreeDefinition:
-        result_node = TreeDefinition()
-        result_node.depth = depth
-        result_node.add_sub_node('=', DefinitionHelper.node_value(value, depth+1))
-        return result_node
-
-    @staticmethod
-    def generate_tree_definition(field_id: str, current_node: TreeDefinition, value: Union[FieldValue, GroupValue]):
-        if len(field_id) == 1:
-            if current_node.find(field_id):
-                raise Exception(f'Internal Error: already defined value')
-            current_node.add_sub_node(field_id, DefinitionHelper.node_eq(value, current_node.depth+1))
-        else:
-            current_value = field_id[0]
-            if current_node.find(current_value):
-                new_node = current_node.tree_ids[current_value]
-            else:
-                new_node = TreeDefinition()
-                new_node.depth = current_node.depth+1
-                current_node.add_sub_node(current_value, new_node)
-            DefinitionHelper.generate_tree_definition(field_id[1:], new_node, value)
@@ -0,0 +1,151 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import math
+import random
+from typing import Dict, List, Optional
+
+""" tag dispatch structures the generators can emit for a message or a group """
+DISPATCH_STRATEGIES = ['trie', 'jump_table', 'binary_search', 'perfect_hash']
+
+""" the jump table is indexed by the tag number, above this size it does not fit in L1 anymore """
+JUMP_TABLE_MAX_ENTRIES = 2048
+
+""" the bytes of lookup data a tag set can use before it competes for L1 with the message itself,
+    a table of that size is expected to miss L1 on every lookup """
+L1_BUDGET_BYTES = 4096
+CACHE_MISS_COST = 4.0
+
+""" estimated cycles: parsing one digit of the tag, one step of the trie (a hard to predict branch),
+    one step of the branchless binary search and the multiply/shift/compare of the perfect hash """
+PARSE_DIGIT_COST = 1.0
+TRIE_DIGIT_COST = 2.5
+BINARY_SEARCH_STEP_COST = 1.0
+PERFECT_HASH_COST = 3.0
+
+""" the perfect hash table is searched from the next power of two up to this factor of growth """
+PERFECT_HASH_MAX_GROWTH = 8
+PERFECT_HASH_ATTEMPTS = 2000
+PERFECT_HASH_SEED = 0x5F3759DF
+
+""" a binary search checks at most this many hot tags of the profile before searching """
+HOT_TAGS_MAX = 8
+
+def tag_shares(tags: List[int], weights: Optional[Dict[int, float]]) -> List[float]:
+    ''' share of each tag in the tags read by the dispatch, uniform without profile '''
+    total = 0.0 if weights == None else sum(weights.get(tag, 0.0) for tag in tags)
+    if total == 0.0:
+        return [1.0 / len(tags)] * len(tags)
+    return [weights.get(tag, 0.0) / total for tag in tags]
+
+def average_digits(tags: List[int], shares: List[float]) -> float:
+    return sum(len(str(tag)) * share for tag, share in zip(tags, shares))
+
+def choose_hot_tags(tags: List[int], shares: List[float]) -> List[int]:
+    ''' the prefix of the hottest tags to compare before the binary search, the one of lowest expected cost '''
+    by_share = sorted(zip(tags, shares), key=lambda x: -x[1])
+    search_cost = 1.0 + math.log2(len(tags)) * BINARY_SEARCH_STEP_COST
+    best_cost = search_cost
+    best_length = 0
+    hit_cost = 0.0
+    hit_share = 0.0
+    for length in range(1, min(HOT_TAGS_MAX, len(tags)) + 1):
+        tag_share = by_share[length - 1][1]
+        hit_cost += tag_share * length
+        hit_share += tag_share
+        cost = hit_cost + (1.0 - hit_share) * (length + search_cost)
+        if cost < best_cost:
+            best_cost = cost
+            best_length = length
+    return [tag for tag, _ in by_share[:best_length]]
+
+def find_perfect_hash(tags: List[int], key_bits: int = 32) -> Optional[dict]:
+    ''' multiplicative hash, slot = (tag * multiplier mod 2^key_bits) >> shift, without collision.
+        The search is seeded, the same tags always give the same table. '''
+    bits = max(1, math.ceil(math.log2(len(tags))))
+    max_bits = bits + int(math.log2(PERFECT_HASH_MAX_GROWTH))
+    mask = (1 << key_bits) - 1
+    generator = random.Random(PERFECT_HASH_SEED)
+    while bits <= max_bits:
+        for _ in range(PERFECT_HASH_ATTEMPTS):
+            multiplier = generator.getrandbits(key_bits) | 1
+            slots = set()
+            for tag in tags:
+                slot = ((tag * multiplier) & mask) >> (key_bits - bits)
+                if slot in slots:
+                    break
+                slots.add(slot)
+            else:
+                return {'multiplier': multiplier, 'bits': bits, 'shift': key_bits - bits, 'size': 1 << bits}
+        bits += 1
+    return None
+
+def estimate_costs(tags: List[int], shares: List[float], perfect_hash: Optional[dict], hot_tags: List[int]) -> Dict[str, float]:
+    ''' estimated cycles to go from the first digit of a tag to the index of its field, weighted by the share of each tag '''
+    digits = average_digits(tags, shares)
+    parse_cost = digits * PARSE_DIGIT_COST
+    search_cost = 1.0 + math.log2(len(tags)) * BINARY_SEARCH_STEP_COST
+    share_by_tag = dict(zip(tags, shares))
+    hot_cost = sum(share_by_tag[tag] * (position + 1) for position, tag in enumerate(hot_tags))
+    cold_share = 1.0 - sum(share_by_tag[tag] for tag in hot_tags)
+    costs = {
+        'trie': digits * TRIE_DIGIT_COST,
+        'binary_search': parse_cost + hot_cost + cold_share * (len(hot_tags) + search_cost),
+    }
+    jump_table_entries = max(tags) + 1
+    if jump_table_entries <= JUMP_TABLE_MAX_ENTRIES:
+        # int16 entries
+        costs['jump_table'] = parse_cost + 1.0 + CACHE_MISS_COST * jump_table_entries * 2 / L1_BUDGET_BYTES
+    if perfect_hash != None:
+        # uint32 key and int16 index per slot
+        costs['perfect_hash'] = parse_cost + PERFECT_HASH_COST + CACHE_MISS_COST * perfect_hash['size'] * 6 / L1_BUDGET_BYTES
+    return costs
+
+def make_dispatch(tags: List[int], strategy: str = 'auto', weights: Optional[Dict[int, float]] = None) -> dict:
+    ''' dispatch of the tags of a message or a group, the field index is the position of the tag in the list.
+        With strategy 'auto', or when the requested structure is not possible for the tags, the cheapest
+        structure of the cost model is used. The weights of a tag profile, occurrences per message by tag,
+        weight the cost model and order the hot tags first. '''
+    if strategy != 'auto' and strategy not in DISPATCH_STRATEGIES:
+        raise Exception(f'unknown dispatch strategy "{strategy}", the possible are auto, {", ".join(DISPATCH_STRATEGIES)}')
+    if len(tags) == 0:
+        raise Exception(f'Internal Error: dispatch of an empty tag set')
+
+    shares = tag_shares(tags, weights)
+    hot_tags = choose_hot_tags(tags, shares) if weights != None else []
+    perfect_hash = find_perfect_hash(tags)
+    costs = estimate_costs(tags, shares, perfect_hash, hot_tags)
+    requested = strategy
+    if strategy not in costs:
+        # auto, or a structure the tag set does not allow (a jump table above the custom tags, a perfect
+        # hash not found), the cheapest one of the cost model is used
+        strategy = min(costs, key=lambda name: (costs[name], DISPATCH_STRATEGIES.index(name)))
+
+    dispatch = {
+        'strategy': strategy,
+        'requested': requested,
+        'cost': costs[strategy],
+        'field_count': len(tags),
+        'profiled': weights != None,
+    }
+    if strategy == 'jump_table':
+        table = [-1] * (max(tags) + 1)
+        for index, tag in enumerate(tags):
+            table[tag] = index
+        dispatch['table'] = table
+    elif strategy == 'binary_search':
+        sorted_tags = sorted(tags)
+        dispatch['sorted_tags'] = sorted_tags
+        dispatch['sorted_indexes'] = [tags.index(tag) for tag in sorted_tags]
+        dispatch['hot_tags'] = [{'tag': tag, 'index': tags.index(tag)} for tag in hot_tags]
+    elif strategy == 'perfect_hash':
+        keys = [0] * perfect_hash['size']
+        values = [-1] * perfect_hash['size']
+        for index, tag in enumerate(tags):
+            slot = ((tag * perfect_hash['multiplier']) & 0xFFFFFFFF) >> perfect_hash['shift']
+            keys[slot] = tag
+            values[slot] = index
+        dispatch.update(perfect_hash)
+        dispatch['keys'] = keys
+        dispatch['values'] = values
+    return dispatch
@@ -0,0 +1,38 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from typing import List
+
+""" enum decoders the generators can emit: a table indexed by the byte of a CHAR value, or a switch on the
+    value packed with its length in one integer """
+ENUM_DECODERS = ['lookup_table', 'packed_switch']
+
+""" the longest value packed in the 56 low bits of the key, the length goes in the high byte """
+PACKED_VALUE_MAX_LENGTH = 7
+
+""" the code of the lookup table for a byte that is not a value """
+LOOKUP_TABLE_INVALID = 0xFF
+
+def pack_value(value: str) -> int:
+    ''' the bytes in little endian order and the length in the high byte, a value and its prefixes never collide '''
+    encoded = value.encode('latin-1')
+    if len(encoded) > PACKED_VALUE_MAX_LENGTH:
+        raise Exception(f'Internal Error: value "{value}" longer than {PACKED_VALUE_MAX_LENGTH} bytes can not be packed')
+    return int.from_bytes(encoded, 'little') | (len(encoded) << 56)
+
+def make_enum_tables(values: List[str]) -> dict:
+    ''' the decoder of the values of an enum, each value is decoded to its position in values (its code) and
+        encoded back with the table of the values '''
+    if len(values) == 0:
+        raise Exception('Internal Error: enum without values')
+    if len(set(values)) != len(values):
+        raise Exception('Internal Error: enum with repeated values')
+    if all(len(value.encode('latin-1')) == 1 for value in values) and len(values) < LOOKUP_TABLE_INVALID:
+        table = [LOOKUP_TABLE_INVALID] * 256
+        for code, value in enumerate(values):
+            table[value.encode('latin-1')[0]] = code
+        return {'decoder': 'lookup_table', 'table': table}
+    packed = [{'key': pack_value(value), 'code': code} for code, value in enumerate(values) if len(value.encode('latin-1')) <= PACKED_VALUE_MAX_LENGTH]
+    # the longer values are compared after the switch missed, FIX enums rarely have one
+    long_values = [{'value': value, 'code': code} for code, value in enumerate(values) if len(value.encode('latin-1')) > PACKED_VALUE_MAX_LENGTH]
+    return {'decoder': 'packed_switch', 'keys': sorted(packed, key=lambda key: key['key']), 'long_values': long_values}
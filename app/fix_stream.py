@@ -0,0 +1,267 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+from app.definition import SchemaDefinition
+
+""" the bytes of the buffer at creation, it doubles when a message does not fit """
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+""" the free bytes asked for a read, the buffer is compacted when there are less after the data """
+MIN_READ_SIZE = 4096
+
+""" the longest message accepted, a BodyLength above it is a framing error """
+DEFAULT_MAX_MESSAGE_SIZE = 1 << 20
+
+class FramingError(Exception):
+    ''' the stream does not hold a message where one is expected, offset is the position in the stream '''
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(f'{message} at offset {offset}')
+        self.offset = offset
+
+class FixFramer:
+    ''' Cuts a stream of FIX messages framed by the BeginString, BodyLength and CheckSum fields of the schema.
+
+        The bytes are received in one bytearray reused for the whole stream: the reads write after the data, a
+        message is copied out once when complete and only its end is moved. The data left (the start of the next
+        message) is moved to the front of the buffer when there is no room for a read anymore, so each byte is moved
+        at most once per buffer filled. '''
+
+    def __init__(self, schema: SchemaDefinition, buffer_size: int = DEFAULT_BUFFER_SIZE, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> None:
+        header_tags = {value.name: tag for tag, value in schema.header.fields.items()}
+        trailer_tags = {value.name: tag for tag, value in schema.trailer.fields.items()}
+        for name, tags in [('BeginString', header_tags), ('BodyLength', header_tags), ('CheckSum', trailer_tags)]:
+            if name not in tags:
+                raise Exception(f'the {name} field is not defined in the schema header or trailer, the messages cannot be framed')
+        self.begin_prefix = b'%d=' % header_tags['BeginString']
+        self.length_prefix = b'%d=' % header_tags['BodyLength']
+        self.checksum_prefix = b'%d=' % trailer_tags['CheckSum']
+        # the checksum prefix, 3 digits and SOH
+        self.trailer_size = len(self.checksum_prefix) + 4
+        self.max_message_size = max_message_size
+        self.buffer = bytearray(buffer_size)
+        # the data is buffer[start:end], offset is the position of buffer[0] in the stream
+        self.start = 0
+        self.end = 0
+        self.offset = 0
+
+    def writable(self, size: int = MIN_READ_SIZE) -> memoryview:
+        ''' the free bytes after the data, at least size of them. The buffer is compacted or replaced by a bigger
+            one here only, the view returned keeps the buffer from being resized '''
+        if len(self.buffer) - self.end < size:
+            data_size = self.end - self.start
+            if len(self.buffer) - data_size < size:
+                buffer = bytearray(max(len(self.buffer) * 2, data_size + size))
+                buffer[0:data_size] = self.buffer[self.start:self.end]
+                self.buffer = buffer
+            else:
+                self.buffer[0:data_size] = self.buffer[self.start:self.end]
+            self.offset += self.start
+            self.start, self.end = 0, data_size
+        return memoryview(self.buffer)[self.end:]
+
+    def written(self, size: int) -> None:
+        ''' size bytes were written in the view of writable '''
+        self.end += size
+
+    def feed(self, data: bytes) -> None:
+        self.writable(len(data))[0:len(data)] = data
+        self.end += len(data)
+
+    def next_message(self) -> Optional[bytes]:
+        ''' the next complete message, None when more bytes are needed. Raises FramingError when the data does not
+            start with BeginString and BodyLength or the CheckSum is not where BodyLength tells '''
+        buffer, start, end = self.buffer, self.start, self.end
+        begin_end = buffer.find(b'\x01', start, min(end, start + 64))
+        if begin_end == -1 or not buffer.startswith(self.begin_prefix, start, begin_end):
+            return self.incomplete_header(start, begin_end)
+        length_start = begin_end + 1 + len(self.length_prefix)
+        length_end = buffer.find(b'\x01', length_start, min(end, length_start + 8))
+        if length_end == -1 or not buffer.startswith(self.length_prefix, begin_end + 1, length_start):
+            return self.incomplete_header(start, begin_end)
+        length = buffer[length_start:length_end]
+        if not length.isdigit():
+            raise FramingError('BodyLength not a number', self.offset + length_start)
+        length = int(length)
+        if length > self.max_message_size:
+            raise FramingError('BodyLength above the maximum', self.offset + length_start)
+        message_end = length_end + 1 + length + self.trailer_size
+        if message_end > end:
+            return None
+        trailer = message_end - self.trailer_size
+        if not buffer.startswith(self.checksum_prefix, trailer) or buffer[message_end - 1] != 1:
+            raise FramingError('no CheckSum at the end of BodyLength', self.offset + trailer)
+        self.start = message_end
+        return bytes(memoryview(buffer)[start:message_end])
+
+    def incomplete_header(self, start: int, begin_end: int) -> None:
+        ''' None when the data is the start of BeginString and BodyLength, raises FramingError otherwise '''
+        buffer, end = self.buffer, self.end
+        if not self.begin_prefix.startswith(buffer[start:min(end, start + len(self.begin_prefix))]):
+            raise FramingError('no BeginString', self.offset + start)
+        if begin_end == -1:
+            if end - start >= 64:
+                raise FramingError('BeginString too long', self.offset + start)
+            return None
+        length_start = begin_end + 1 + len(self.length_prefix)
+        if not self.length_prefix.startswith(buffer[begin_end + 1:min(end, length_start)]):
+            raise FramingError('no BodyLength after BeginString', self.offset + begin_end + 1)
+        if end - length_start >= 8:
+            raise FramingError('BodyLength too long', self.offset + length_start)
+        return None
+
+class FixStreamReader:
+    ''' The decoded messages of an asyncio.StreamReader, decode is the decoder of a message (decode_message of the
+        package of the Python generator) or None for the bytes of the message. The reader is only read when no
+        message is left in the buffer, the StreamReader pauses the transport when the consumer is slower than the
+        peer. '''
+
+    def __init__(self, reader: asyncio.StreamReader, schema: SchemaDefinition, decode: Optional[Callable[[bytes], Any]] = None,
+                 read_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.reader = reader
+        self.framer = FixFramer(schema)
+        self.decode = decode
+        self.read_size = read_size
+
+    async def read_message(self) -> Any:
+        ''' the next message, None at the end of the stream. Raises FramingError on a malformed message and on the end
+            of the stream in the middle of a message '''
+        while True:
+            message = self.framer.next_message()
+            if message != None:
+                return self.decode(message) if self.decode != None else message
+            data = await self.reader.read(self.read_size)
+            if len(data) == 0:
+                if self.framer.start != self.framer.end:
+                    raise FramingError('end of stream in a message', self.framer.offset + self.framer.start)
+                return None
+            self.framer.feed(data)
+
+    async def read_messages(self) -> List[Any]:
+        ''' the messages of the bytes received, at least one, an empty list at the end of the stream '''
+        messages = []
+        while True:
+            message = self.framer.next_message()
+            while message != None:
+                messages.append(self.decode(message) if self.decode != None else message)
+                message = self.framer.next_message()
+            if len(messages) != 0:
+                return messages
+            data = await self.reader.read(self.read_size)
+            if len(data) == 0:
+                if self.framer.start != self.framer.end:
+                    raise FramingError('end of stream in a message', self.framer.offset + self.framer.start)
+                return messages
+            self.framer.feed(data)
+
+    def __aiter__(self) -> FixStreamReader:
+        return self
+
+    async def __anext__(self) -> Any:
+        message = await self.read_message()
+        if message == None:
+            raise StopAsyncIteration
+        return message
+
+class FixProtocol(asyncio.BufferedProtocol):
+    ''' An asyncio protocol receiving the bytes of the socket straight in the buffer of its framer. The messages
+        are decoded when received and queued for read_message, the reading of the transport is paused when
+        high_water messages are queued and resumed when the queue is down to low_water. '''
+
+    def __init__(self, schema: SchemaDefinition, decode: Optional[Callable[[bytes], Any]] = None, high_water: int = 1024, low_water: Optional[int] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.framer = FixFramer(schema, buffer_size)
+        self.decode = decode
+        self.high_water = high_water
+        self.low_water = low_water if low_water != None else high_water // 4
+        self.messages: Deque[Any] = deque()
+        self.transport: Optional[asyncio.Transport] = None
+        self.reading_paused = False
+        # the error ending the stream, None at the end of a well formed stream
+        self.error: Optional[Exception] = None
+        self.closed = False
+        self.waiter: Optional[asyncio.Future] = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.framer.writable(max(sizehint, MIN_READ_SIZE))
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.framer.written(nbytes)
+        try:
+            while True:
+                message = self.framer.next_message()
+                if message == None:
+                    break
+                self.messages.append(self.decode(message) if self.decode != None else message)
+        except Exception as error:
+            self.error = error
+            self.transport.close()
+        if len(self.messages) >= self.high_water and not self.reading_paused:
+            self.reading_paused = True
+            self.transport.pause_reading()
+        self.wake_up()
+
+    def eof_received(self) -> bool:
+        if self.framer.start != self.framer.end and self.error == None:
+            self.error = FramingError('end of stream in a message', self.framer.offset + self.framer.start)
+        return False
+
+    def connection_lost(self, error: Optional[Exception]) -> None:
+        if error != None and self.error == None:
+            self.error = error
+        self.closed = True
+        self.wake_up()
+
+    def wake_up(self) -> None:
+        if self.waiter != None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    async def wait_messages(self) -> bool:
+        ''' waits for a message to read, False at the end of the stream. Raises the FramingError or the connection
+            error that ended the stream after the messages received before it are read '''
+        while len(self.messages) == 0:
+            if self.error != None:
+                raise self.error
+            if self.closed:
+                return False
+            self.waiter = asyncio.get_running_loop().create_future()
+            await self.waiter
+            self.waiter = None
+        return True
+
+    def resume_reading(self) -> None:
+        if self.reading_paused and len(self.messages) <= self.low_water and not self.closed:
+            self.reading_paused = False
+            self.transport.resume_reading()
+
+    async def read_message(self) -> Any:
+        ''' the next message, None at the end of the stream '''
+        if not await self.wait_messages():
+            return None
+        message = self.messages.popleft()
+        self.resume_reading()
+        return message
+
+    async def read_messages(self) -> List[Any]:
+        ''' the messages received and not read yet, at least one, an empty list at the end of the stream '''
+        if not await self.wait_messages():
+            return []
+        messages = list(self.messages)
+        self.messages.clear()
+        self.resume_reading()
+        return messages
+
+    def __aiter__(self) -> FixProtocol:
+        return self
+
+    async def __anext__(self) -> Any:
+        message = await self.read_message()
+        if message == None:
+            raise StopAsyncIteration
+        return message
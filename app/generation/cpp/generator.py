@@ -2,14 +2,53 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from app.generator import GeneratorBase
+from app.output_writer import OutputWriter
 
 from jinja2 import Environment, FileSystemLoader
+from typing import Dict
 import pathlib
 import os
 
+""" C++ type returned by the accessor of a field and the conversion of its value, the other types are std::string_view.
+    The decimal fields are int64 scaled by the scale of the field """
+CPP_VALUE_TYPES = {
+    'INT': ('std::int64_t', 'detail::to_int'),
+    'LENGTH': ('std::int64_t', 'detail::to_int'),
+    'SEQNUM': ('std::int64_t', 'detail::to_int'),
+    'NUMINGROUP': ('std::int64_t', 'detail::to_int'),
+    'DAYOFMONTH': ('std::int64_t', 'detail::to_int'),
+    'TAGNUM': ('std::int64_t', 'detail::to_int'),
+    'FLOAT': ('double', 'detail::to_double'),
+    'PRICEOFFSET': ('double', 'detail::to_double'),
+    'CHAR': ('char', 'detail::to_char'),
+    'BOOLEAN': ('bool', 'detail::to_bool'),
+    'UTCTIMESTAMP': ('std::int64_t', 'detail::to_timestamp'),
+    'LOCALMKTDATE': ('std::int64_t', 'detail::to_timestamp'),
+}
+
+""" C++ type of the value appended by an encoder by kind of field, see ENCODER_KINDS """
+CPP_ENCODER_TYPES = {
+    'int': 'std::int64_t',
+    'decimal': 'Decimal',
+    'scaled': 'std::int64_t',
+    'char': 'char',
+    'bool': 'bool',
+    'timestamp': 'Timestamp',
+    'date': 'std::int64_t',
+    'string': 'std::string_view',
+    'data': 'std::string_view',
+    'group': 'std::size_t',
+}
+
+""" names of fields that would collide with a keyword of C++ """
+CPP_KEYWORDS = {'bool', 'case', 'char', 'class', 'const', 'default', 'delete', 'double', 'float', 'int', 'long', 'new',
+                'operator', 'private', 'protected', 'public', 'register', 'return', 'short', 'signed', 'switch', 'template',
+                'union', 'unsigned', 'volatile'}
+
 class Generator(GeneratorBase):
     def __init__(self, path: str) -> None:
         self.path = path
+        self.writer = OutputWriter(path)
         self.env = Environment(
             loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
             autoescape = False,
@@ -17,6 +56,84 @@ class Generator(GeneratorBase):
             lstrip_blocks = True,
             keep_trailing_newline = True
         )
+        self.env.filters['columns'] = GeneratorBase.format_columns
 
     def _generate_impl(self, schema: dict) -> None:
-        return None
\ No newline at end of file
+        package_path = schema['package']
+        enums = {field['name']: GeneratorBase.make_enum_definition(field) for field in schema['fields'] if GeneratorBase.has_enum(field)}
+        fields = {field['name']: field for field in schema['fields']}
+        views = {
+            'enums': list(enums.values()),
+            'groups': [Generator.make_view_definition(group, fields, enums) for group in GeneratorBase.groups_in_dependency_order(schema['groups'])],
+            'messages': [Generator.make_view_definition(message, fields, enums) for message in schema['messages']],
+            'msg_types': GeneratorBase.make_msg_type_dispatch(schema['messages']),
+            'framing': GeneratorBase.make_framing_definition(schema['header'], schema['trailer']),
+        }
+        self._generate_file(os.path.join(package_path, 'runtime.h'), 'runtime.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'fields.h'), 'field.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'groups.h'), 'group.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'messages.h'), 'messages.tmpl', schema, views)
+        if views['framing'] != None:
+            views['encoders'] = Generator.make_encoders_definition(schema, fields, views['framing'])
+            self._generate_file(os.path.join(package_path, 'framer.h'), 'framer.tmpl', schema, views)
+            self._generate_file(os.path.join(package_path, 'encoder.h'), 'encoder.tmpl', schema, views)
+
+    def _generate_file(self, relative_path: str, template_name: str, schema: dict, views: dict) -> None:
+        template = self.env.get_template(template_name)
+        self.writer.write(relative_path, template.render(schema = schema, views = views))
+
+    @staticmethod
+    def accessor_name(name: str) -> str:
+        accessor = GeneratorBase.snake_case(name)
+        return accessor + '_' if accessor in CPP_KEYWORDS else accessor
+
+    @staticmethod
+    def make_encoders_definition(schema: dict, fields: Dict[str, dict], framing: dict) -> dict:
+        encoders = GeneratorBase.make_encoders_definition(schema, fields, framing)
+        session_header = [encoders['session_header']] if encoders['session_header'] != None else []
+        for encoder in encoders['groups'] + encoders['messages'] + session_header:
+            for field in encoder['fields']:
+                field['accessor'] = Generator.accessor_name(field['name'])
+                field['cpp_type'] = field['name'] if field['kind'] == 'enum' else CPP_ENCODER_TYPES[field['kind']]
+        return encoders
+
+    @staticmethod
+    def make_view_definition(definition: dict, fields: Dict[str, dict], enums: Dict[str, dict]) -> dict:
+        ''' the fields of a message or a group entry by dispatch index, a group field also owns a slot for its region '''
+        view_fields = []
+        group_slots = 0
+        for index, field in enumerate(definition['fields_by_order']):
+            field_type = fields[field['name']]['type']
+            # a MULTIPLEVALUESTRING is a list of values, each of them decodes to the enum
+            if field['name'] in enums and field_type != 'MULTIPLEVALUESTRING':
+                cpp_type, converter = f'std::optional<{field["name"]}>', f'parse_enum<{field["name"]}>'
+            elif fields[field['name']]['primitive_type'] == 'decimal':
+                cpp_type, converter = 'std::int64_t', f'detail::to_scaled<{fields[field["name"]]["scale"]}>'
+            else:
+                cpp_type, converter = CPP_VALUE_TYPES.get(field_type, ('std::string_view', None))
+            view_field = {
+                'index': index,
+                'word': index // 64,
+                'bit': index % 64,
+                'tag': field['id'],
+                'prefix': GeneratorBase.tag_prefix(field['id']),
+                'name': field['name'],
+                'accessor': Generator.accessor_name(field['name']),
+                'cpp_type': cpp_type,
+                'converter': converter,
+                'group': None,
+            }
+            if field['token'] == 'group':
+                view_field['group'] = field['name']
+                view_field['slot'] = group_slots
+                group_slots += 1
+            view_fields.append(view_field)
+        return {
+            'name': definition['name'],
+            'type': definition.get('type'),
+            'fields': view_fields,
+            'group_fields': [field for field in view_fields if field['group'] != None],
+            'group_slots': group_slots,
+            'required_masks': GeneratorBase.presence_masks(definition['fields_by_order']),
+            'data_fields': definition['dispatch']['data_fields'],
+        }
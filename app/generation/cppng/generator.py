@@ -2,6 +2,7 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from app.generator import GeneratorBase
+from app.output_writer import OutputWriter
 
 from jinja2 import Environment, FileSystemLoader
 import pathlib
@@ -10,6 +11,7 @@ import os
 class Generator(GeneratorBase):
     def __init__(self, path: str) -> None:
         self.path = path
+        self.writer = OutputWriter(path)
         self.env = Environment(
             loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
             autoescape = False,
@@ -19,4 +21,11 @@ class Generator(GeneratorBase):
         )
 
     def _generate_impl(self, schema: dict) -> None:
-        return None
\ No newline at end of file
+        package_path = schema['package']
+        self._generate_file(os.path.join(package_path, 'fields.h'), 'field.tmpl', schema)
+        self._generate_file(os.path.join(package_path, 'groups.h'), 'group.tmpl', schema)
+        self._generate_file(os.path.join(package_path, 'messages.h'), 'messages.tmpl', schema)
+
+    def _generate_file(self, relative_path: str, template_name: str, schema: dict) -> None:
+        template = self.env.get_template(template_name)
+        self.writer.write(relative_path, template.render(schema = schema))
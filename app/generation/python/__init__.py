@@ -0,0 +1,4 @@
+# Copyright (C) 2025 R Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from .generator import Generator
@@ -0,0 +1,158 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from app.generator import GeneratorBase
+from app.output_writer import OutputWriter
+
+from jinja2 import Environment, FileSystemLoader
+from typing import Dict
+import keyword
+import pathlib
+import os
+
+""" conversion of the value of a field by its accessor, the values of the other types are returned as bytes. The
+    decimal fields are int scaled by the scale of the field """
+PYTHON_VALUE_CONVERTERS = {
+    'INT': 'runtime.to_int',
+    'LENGTH': 'runtime.to_int',
+    'SEQNUM': 'runtime.to_int',
+    'NUMINGROUP': 'runtime.to_int',
+    'DAYOFMONTH': 'runtime.to_int',
+    'TAGNUM': 'runtime.to_int',
+    'FLOAT': 'runtime.to_float',
+    'PRICEOFFSET': 'runtime.to_float',
+    'CHAR': 'runtime.to_char',
+    'BOOLEAN': 'runtime.to_bool',
+    'UTCTIMESTAMP': 'runtime.to_timestamp',
+    'LOCALMKTDATE': 'runtime.to_timestamp',
+}
+
+""" Python type of the value returned by an accessor, by converter """
+PYTHON_VALUE_TYPES = {
+    'runtime.to_int': 'int',
+    'runtime.to_float': 'float',
+    'runtime.to_char': 'bytes',
+    'runtime.to_bool': 'bool',
+    'runtime.to_timestamp': 'int',
+}
+
+""" Python type of the value appended by an encoder by kind of field, see ENCODER_KINDS """
+PYTHON_ENCODER_TYPES = {
+    'int': 'int',
+    'decimal': 'runtime.Decimal',
+    'scaled': 'int',
+    'char': 'bytes',
+    'bool': 'bool',
+    'timestamp': 'int',
+    'date': 'int',
+    'string': 'bytes',
+    'data': 'bytes',
+    'group': 'int',
+}
+
+class Generator(GeneratorBase):
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.writer = OutputWriter(path)
+        self.env = Environment(
+            loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
+            autoescape = False,
+            trim_blocks = True,
+            lstrip_blocks = True,
+            keep_trailing_newline = True
+        )
+        self.env.filters['columns'] = GeneratorBase.format_columns
+        self.env.filters['constant'] = Generator.constant_name
+
+    def _generate_impl(self, schema: dict) -> None:
+        package_path = schema['package']
+        enums = {field['name']: Generator.make_python_enum_definition(field) for field in schema['fields'] if GeneratorBase.has_enum(field)}
+        fields = {field['name']: field for field in schema['fields']}
+        views = {
+            'enums': list(enums.values()),
+            'groups': [Generator.make_view_definition(group, fields, enums) for group in GeneratorBase.groups_in_dependency_order(schema['groups'])],
+            'messages': [Generator.make_view_definition(message, fields, enums) for message in schema['messages']],
+            'framing': GeneratorBase.make_framing_definition(schema['header'], schema['trailer']),
+        }
+        self._generate_file(os.path.join(package_path, '__init__.py'), 'init.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'runtime.py'), 'runtime.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'fields.py'), 'field.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'groups.py'), 'group.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'messages.py'), 'messages.tmpl', schema, views)
+        if views['framing'] != None:
+            views['encoders'] = Generator.make_encoders_definition(schema, fields, views['framing'])
+            self._generate_file(os.path.join(package_path, 'encoder.py'), 'encoder.tmpl', schema, views)
+
+    def _generate_file(self, relative_path: str, template_name: str, schema: dict, views: dict) -> None:
+        template = self.env.get_template(template_name)
+        self.writer.write(relative_path, template.render(schema = schema, views = views))
+
+    @staticmethod
+    def accessor_name(name: str) -> str:
+        accessor = GeneratorBase.snake_case(name)
+        return accessor + '_' if keyword.iskeyword(accessor) else accessor
+
+    @staticmethod
+    def constant_name(name: str) -> str:
+        ''' NoPartyIDs to NO_PARTY_IDS, the name of the module constants of a field, a group or a message '''
+        return GeneratorBase.snake_case(name).upper()
+
+    @staticmethod
+    def enum_variant_name(variant: str) -> str:
+        ''' a variant named after a keyword of Python (None, True) gets a _ '''
+        return variant + '_' if keyword.iskeyword(variant) else variant
+
+    @staticmethod
+    def make_python_enum_definition(field: dict) -> dict:
+        enum = GeneratorBase.make_enum_definition(field)
+        for variant in enum['variants']:
+            variant['name'] = Generator.enum_variant_name(variant['name'])
+        return enum
+
+    @staticmethod
+    def make_encoders_definition(schema: dict, fields: Dict[str, dict], framing: dict) -> dict:
+        encoders = GeneratorBase.make_encoders_definition(schema, fields, framing)
+        for encoder in encoders['groups'] + encoders['messages']:
+            for field in encoder['fields']:
+                field['accessor'] = Generator.accessor_name(field['name'])
+                field['python_type'] = f'fields.{field["name"]}' if field['kind'] == 'enum' else PYTHON_ENCODER_TYPES[field['kind']]
+        return encoders
+
+    @staticmethod
+    def make_view_definition(definition: dict, fields: Dict[str, dict], enums: Dict[str, dict]) -> dict:
+        ''' the fields of a message or a group entry by index in its list of values. The decoders look the plain
+            fields up by the bytes of their tag, the group and DATA fields are checked after a miss '''
+        view_fields = []
+        data_of = {pair['data']: pair['length'] for pair in definition['dispatch']['data_fields']}
+        for index, field in enumerate(definition['fields_by_order']):
+            field_type = fields[field['name']]['type']
+            # a MULTIPLEVALUESTRING is a list of values, each of them decodes to the enum
+            if field['name'] in enums and field_type != 'MULTIPLEVALUESTRING':
+                python_type, converter = f'fields.{field["name"]}', f'fields.{field["name"]}.from_bytes'
+            elif fields[field['name']]['primitive_type'] == 'decimal':
+                python_type, converter = 'int', 'runtime.to_scaled'
+            else:
+                converter = PYTHON_VALUE_CONVERTERS.get(field_type)
+                python_type = PYTHON_VALUE_TYPES.get(converter, 'bytes')
+            view_fields.append({
+                'index': index,
+                'tag': field['id'],
+                'name': field['name'],
+                'accessor': Generator.accessor_name(field['name']),
+                'python_type': python_type,
+                'converter': converter,
+                'scale': fields[field['name']]['scale'],
+                'group': field['name'] if field['token'] == 'group' else None,
+                'length': data_of.get(index),
+                'required': field['required'] in [True, 'True'],
+            })
+        return {
+            'name': definition['name'],
+            'type': definition.get('type'),
+            'fields': view_fields,
+            'plain_fields': [field for field in view_fields if field['group'] == None and field['length'] == None],
+            'group_fields': [field for field in view_fields if field['group'] != None],
+            'data_fields': [field for field in view_fields if field['length'] != None],
+            'required_fields': [field for field in view_fields if field['required']],
+            'uses_enums': any(field['python_type'].startswith('fields.') for field in view_fields),
+        }
@@ -2,14 +2,53 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from app.generator import GeneratorBase
+from app.output_writer import OutputWriter
 
 from jinja2 import Environment, FileSystemLoader
+from typing import Dict
 import pathlib
 import os
 
+""" Rust type returned by the accessor of a field and the conversion of its value, the other types are &[u8]. The
+    decimal fields are i64 scaled by the scale of the field """
+RUST_VALUE_TYPES = {
+    'INT': ('i64', 'runtime::to_int'),
+    'LENGTH': ('i64', 'runtime::to_int'),
+    'SEQNUM': ('i64', 'runtime::to_int'),
+    'NUMINGROUP': ('i64', 'runtime::to_int'),
+    'DAYOFMONTH': ('i64', 'runtime::to_int'),
+    'TAGNUM': ('i64', 'runtime::to_int'),
+    'FLOAT': ('f64', 'runtime::to_float'),
+    'PRICEOFFSET': ('f64', 'runtime::to_float'),
+    'CHAR': ('u8', 'runtime::to_char'),
+    'BOOLEAN': ('bool', 'runtime::to_bool'),
+    'UTCTIMESTAMP': ('i64', 'runtime::to_timestamp'),
+    'LOCALMKTDATE': ('i64', 'runtime::to_timestamp'),
+}
+
+""" Rust type of the value appended by an encoder by kind of field, see ENCODER_KINDS """
+RUST_ENCODER_TYPES = {
+    'int': 'i64',
+    'decimal': 'Decimal',
+    'scaled': 'i64',
+    'char': 'u8',
+    'bool': 'bool',
+    'timestamp': 'Timestamp',
+    'date': 'i64',
+    'string': '&[u8]',
+    'data': '&[u8]',
+    'group': 'usize',
+}
+
+""" names of fields that would collide with a keyword of Rust """
+RUST_KEYWORDS = {'as', 'box', 'break', 'const', 'continue', 'crate', 'else', 'enum', 'extern', 'false', 'fn', 'for', 'if',
+                 'impl', 'in', 'let', 'loop', 'match', 'mod', 'move', 'mut', 'override', 'priv', 'pub', 'ref', 'return',
+                 'self', 'static', 'struct', 'super', 'trait', 'true', 'type', 'unsafe', 'use', 'where', 'while'}
+
 class Generator(GeneratorBase):
     def __init__(self, path: str) -> None:
         self.path = path
+        self.writer = OutputWriter(path)
         self.env = Environment(
             loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
             autoescape = False,
@@ -17,6 +56,88 @@ class Generator(GeneratorBase):
             lstrip_blocks = True,
             keep_trailing_newline = True
         )
+        self.env.filters['columns'] = GeneratorBase.format_columns
 
     def _generate_impl(self, schema: dict) -> None:
-        return None
\ No newline at end of file
+        package_path = schema['package']
+        enums = {field['name']: GeneratorBase.make_enum_definition(field) for field in schema['fields'] if GeneratorBase.has_enum(field)}
+        fields = {field['name']: field for field in schema['fields']}
+        views = {
+            'enums': list(enums.values()),
+            'groups': [Generator.make_view_definition(group, fields, enums) for group in GeneratorBase.groups_in_dependency_order(schema['groups'])],
+            'messages': [Generator.make_view_definition(message, fields, enums) for message in schema['messages']],
+            'msg_types': GeneratorBase.make_msg_type_dispatch(schema['messages']),
+            'framing': GeneratorBase.make_framing_definition(schema['header'], schema['trailer']),
+        }
+        self._generate_file(os.path.join(package_path, 'mod.rs'), 'mod.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'runtime.rs'), 'runtime.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'fields.rs'), 'field.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'groups.rs'), 'group.tmpl', schema, views)
+        self._generate_file(os.path.join(package_path, 'messages.rs'), 'messages.tmpl', schema, views)
+        if views['framing'] != None:
+            views['encoders'] = Generator.make_encoders_definition(schema, fields, views['framing'])
+            self._generate_file(os.path.join(package_path, 'framer.rs'), 'framer.tmpl', schema, views)
+            self._generate_file(os.path.join(package_path, 'encoder.rs'), 'encoder.tmpl', schema, views)
+
+    def _generate_file(self, relative_path: str, template_name: str, schema: dict, views: dict) -> None:
+        template = self.env.get_template(template_name)
+        self.writer.write(relative_path, template.render(schema = schema, views = views))
+
+    @staticmethod
+    def accessor_name(name: str) -> str:
+        accessor = GeneratorBase.snake_case(name)
+        return accessor + '_' if accessor in RUST_KEYWORDS else accessor
+
+    @staticmethod
+    def make_encoders_definition(schema: dict, fields: Dict[str, dict], framing: dict) -> dict:
+        encoders = GeneratorBase.make_encoders_definition(schema, fields, framing)
+        session_header = [encoders['session_header']] if encoders['session_header'] != None else []
+        for encoder in encoders['groups'] + encoders['messages'] + session_header:
+            for field in encoder['fields']:
+                field['accessor'] = Generator.accessor_name(field['name'])
+                field['rust_type'] = f'fields::{field["name"]}' if field['kind'] == 'enum' else RUST_ENCODER_TYPES[field['kind']]
+        return encoders
+
+    @staticmethod
+    def make_view_definition(definition: dict, fields: Dict[str, dict], enums: Dict[str, dict]) -> dict:
+        ''' the fields of a message or a group entry by dispatch index, a group field also owns a slot for its region '''
+        view_fields = []
+        group_slots = 0
+        uses_enums = False
+        for index, field in enumerate(definition['fields_by_order']):
+            field_type = fields[field['name']]['type']
+            # a MULTIPLEVALUESTRING is a list of values, each of them decodes to the enum
+            if field['name'] in enums and field_type != 'MULTIPLEVALUESTRING':
+                uses_enums = True
+                rust_type, converter = f'fields::{field["name"]}', f'fields::{field["name"]}::from_bytes'
+            elif fields[field['name']]['primitive_type'] == 'decimal':
+                rust_type, converter = 'i64', f'runtime::to_scaled::<{fields[field["name"]]["scale"]}>'
+            else:
+                rust_type, converter = RUST_VALUE_TYPES.get(field_type, ("&'a [u8]", None))
+            view_field = {
+                'index': index,
+                'word': index // 64,
+                'bit': index % 64,
+                'tag': field['id'],
+                'prefix': GeneratorBase.tag_prefix(field['id']),
+                'name': field['name'],
+                'accessor': Generator.accessor_name(field['name']),
+                'rust_type': rust_type,
+                'converter': converter,
+                'group': None,
+            }
+            if field['token'] == 'group':
+                view_field['group'] = field['name']
+                view_field['slot'] = group_slots
+                group_slots += 1
+            view_fields.append(view_field)
+        return {
+            'name': definition['name'],
+            'type': definition.get('type'),
+            'fields': view_fields,
+            'group_fields': [field for field in view_fields if field['group'] != None],
+            'group_slots': group_slots,
+            'required_masks': GeneratorBase.presence_masks(definition['fields_by_order']),
+            'data_fields': definition['dispatch']['data_fields'],
+            'uses_enums': uses_enums,
+        }
@@ -2,7 +2,56 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from app.definition import *
+from app.dispatch import *
+from app.enum_tables import *
+from app.tag_profile import TagProfile
 from abc import ABC, abstractmethod
+import re
+from dataclasses import dataclass, field
+from typing import Tuple
+
+""" the values of these types keep their natural type, no enum is generated """
+NO_ENUM_TYPES = {'BOOLEAN', 'NUMINGROUP'}
+
+""" how the encoders append a value by type of field, the values of the other types are appended as given """
+ENCODER_KINDS = {
+    'INT': 'int',
+    'LENGTH': 'int',
+    'SEQNUM': 'int',
+    'DAYOFMONTH': 'int',
+    'TAGNUM': 'int',
+    'PRICE': 'scaled',
+    'QTY': 'scaled',
+    'AMT': 'scaled',
+    'PERCENTAGE': 'scaled',
+    'FLOAT': 'decimal',
+    'PRICEOFFSET': 'decimal',
+    'CHAR': 'char',
+    'BOOLEAN': 'bool',
+    'UTCTIMESTAMP': 'timestamp',
+    'LOCALMKTDATE': 'date',
+}
+
+""" the tag of MsgType, the first field of the body written by the encoders """
+MSG_TYPE_TAG = 35
+
+""" the header fields changing with each message of a session, written in fixed width slots of the session headers """
+MSG_SEQ_NUM_TAG = 34
+SENDING_TIME_TAG = 52
+
+@dataclass(frozen=True)
+class GeneratorOptions:
+    # tag dispatch of the messages and groups: auto (cost model), trie, jump_table, binary_search or perfect_hash
+    dispatch: str = field(default='auto')
+    # tag histograms of captured traffic, the hot tags of a message are dispatched first. A profile can be
+    # changed, it is left out of the hash of the options and identified by its digest in cache_key
+    tag_profile: Optional[TagProfile] = field(default=None, hash=False)
+
+    def cache_key(self) -> tuple:
+        key = (f'dispatch={self.dispatch}',)
+        if self.tag_profile != None:
+            key += (f'tag_profile={self.tag_profile.digest()}',)
+        return key
 
 class GeneratorBase(ABC):
 
@@ -10,9 +59,19 @@ class GeneratorBase(ABC):
     def _generate_impl(self, schema: dict) -> None:
         pass
 
-    def generate(self, schema_definition: SchemaDefinition) -> None:
+    def generate(self, schema_definition: SchemaDefinition, options: GeneratorOptions = GeneratorOptions()) -> None:
+        self._generate_impl(GeneratorBase.make_ir(schema_definition, options))
+
+    def generate_from_ir(self, ir: dict) -> None:
+        self._generate_impl(ir)
+
+    @staticmethod
+    def make_ir(schema_definition: SchemaDefinition, options: GeneratorOptions = GeneratorOptions()) -> dict:
         ir = {}
+        # without override the package is named after the fix version, fix44
         ir['package'] = schema_definition.package
+        if not ir['package']:
+            ir['package'] = f'fix{schema_definition.fix_major_version}{schema_definition.fix_minor_version}'
         ir['version'] = schema_definition.version
         ir['fix_version_major'] = str(schema_definition.fix_major_version)
         ir['fix_version_minor'] = str(schema_definition.fix_minor_version)
@@ -25,7 +84,7 @@ class GeneratorBase(ABC):
         # group definition
         ir['groups'] = []
         for group_definition in schema_definition.groups.values():
-            ir['groups'].append(GeneratorBase.make_group_definition(group_definition, schema_definition.fields))
+            ir['groups'].append(GeneratorBase.make_group_definition(group_definition, schema_definition.fields, options))
 
         # header definition
         ir['header'] = []
@@ -40,9 +99,9 @@ class GeneratorBase(ABC):
         # messages definition
         ir['messages'] = []
         for message_definition in schema_definition.messages.values():
-            ir['messages'].append(GeneratorBase.make_message_definition(message_definition, schema_definition.fields))
+            ir['messages'].append(GeneratorBase.make_message_definition(message_definition, schema_definition.fields, options))
 
-        self._generate_impl(ir)
+        return ir
 
     @staticmethod
     def make_field_definition(field_definition: FieldDefinition) -> dict:
@@ -65,7 +124,9 @@ class GeneratorBase(ABC):
             'number': field_definition.number,
             'type': field_definition.type,
             'primitive_type': field_definition.primitive_type,
-            'values': values_dict
+            'values': values_dict,
+            'length_field': field_definition.length_field,
+            'scale': field_definition.scale,
         }
 
     @staticmethod
@@ -78,7 +139,7 @@ class GeneratorBase(ABC):
     @staticmethod
     def generate_fields_list_by_parsed_order(fields_definition_dict: Dict[int, Union[FieldValue, GroupValue]], fields_definition: Dict[str, FieldDefinition]):
         fields_list  = []
-        for field in fields_definition_dict:
+        for field in fields_definition_dict.items():
             if isinstance(field[1], GroupValue):
                 fields_list.append(GeneratorBase.make_group_definition_in_group(field[1], field[0], fields_definition))
             elif isinstance(field[1], FieldValue):
@@ -97,7 +158,7 @@ class GeneratorBase(ABC):
         return fields_list
 
     @staticmethod
-    def make_group_definition(group_definition: GroupDefinition, fields_definition: Dict[str, FieldDefinition] ) -> dict:
+    def make_group_definition(group_definition: GroupDefinition, fields_definition: Dict[str, FieldDefinition], options: GeneratorOptions = GeneratorOptions()) -> dict:
         number_of_elements_field = fields_definition[group_definition.number_element_field.name]
         if number_of_elements_field == None:
             raise Exception(f'Internal Error: field "{number_of_elements_field.name}" not defined')
@@ -114,6 +175,8 @@ class GeneratorBase(ABC):
             'start_group_field_id': str(start_group_field.number),
             'fields_by_id': GeneratorBase.generate_fields_list_by_id(group_definition.fields, fields_definition),
             'fields_by_order': GeneratorBase.generate_fields_list_by_parsed_order(group_definition.fields, fields_definition),
+            # a group is shared by the message types, its profile is the one of the whole traffic
+            'dispatch': GeneratorBase.make_dispatch_definition(group_definition.fields, group_definition.fields_by_tree, options, None, fields_definition),
         }
 
     @staticmethod
@@ -157,11 +220,269 @@ class GeneratorBase(ABC):
         }
 
     @staticmethod
-    def make_message_definition(message_definition: MessageDefinition, fields_definition: Dict[str, FieldDefinition]) -> dict:
+    def make_message_definition(message_definition: MessageDefinition, fields_definition: Dict[str, FieldDefinition], options: GeneratorOptions = GeneratorOptions()) -> dict:
         return {
             'token': 'message',
             'name': message_definition.name,
             'type': message_definition.msg_type,
             'fields_by_id': GeneratorBase.generate_fields_list_by_id(message_definition.fields, fields_definition),
             'fields_by_order': GeneratorBase.generate_fields_list_by_parsed_order(message_definition.fields, fields_definition),
+            'dispatch': GeneratorBase.make_dispatch_definition(message_definition.fields, message_definition.fields_by_tree, options, message_definition.msg_type, fields_definition),
+        }
+
+    @staticmethod
+    def make_dispatch_definition(fields_definition_dict: Dict[int, Union[FieldValue, GroupValue]], fields_by_tree: TagTree, options: GeneratorOptions, msg_type: str | None, fields_definition: Dict[str, FieldDefinition] = {}) -> dict:
+        ''' the field index used by every dispatch is the position of the field in fields_by_order '''
+        weights = None
+        if options.tag_profile != None:
+            weights = options.tag_profile.tag_weights(msg_type)
+            if len(weights) == 0 and msg_type != None:
+                # message type absent of the captured traffic
+                weights = options.tag_profile.tag_weights(None)
+        dispatch = make_dispatch(list(fields_definition_dict), options.dispatch, weights)
+        if dispatch['strategy'] == 'trie':
+            index_by_name = {value.name: index for index, value in enumerate(fields_definition_dict.values())}
+            tag_by_name = {value.name: tag for tag, value in fields_definition_dict.items()}
+            if weights == None:
+                # without profile the required fields are expected in every message
+                weights = {tag: 1.0 if GeneratorBase.is_required(value) else 0.5 for tag, value in fields_definition_dict.items()}
+            dispatch['tree'] = GeneratorBase.make_tree_definition(fields_by_tree, 0, index_by_name, tag_by_name, weights)['children']
+        dispatch['data_fields'] = GeneratorBase.make_data_field_pairs(fields_definition_dict, fields_definition)
+        return dispatch
+
+    @staticmethod
+    def make_data_field_pairs(fields_definition_dict: Dict[int, Union[FieldValue, GroupValue]], fields_definition: Dict[str, FieldDefinition]) -> List[dict]:
+        ''' the DATA fields of a message or a group by field index, with the index of the LENGTH field giving their size '''
+        index_by_name = {value.name: index for index, value in enumerate(fields_definition_dict.values())}
+        pairs = []
+        for index, value in enumerate(fields_definition_dict.values()):
+            definition = fields_definition.get(value.name)
+            if isinstance(value, GroupValue) or definition == None or definition.type != 'DATA':
+                continue
+            if definition.length_field not in index_by_name:
+                raise Exception(f'Internal Error: the DATA field "{value.name}" is used without its LENGTH field "{definition.length_field}"')
+            pairs.append({'length': index_by_name[definition.length_field], 'data': index})
+        return pairs
+
+    @staticmethod
+    def is_required(value: Union[FieldValue, GroupValue]) -> bool:
+        return value.required_group if isinstance(value, GroupValue) else value.required
+
+    @staticmethod
+    def make_tree_definition(fields_by_tree: TagTree, node: int, index_by_name: Dict[str, int], tag_by_name: Dict[str, int], weights: Dict[int, float]) -> dict:
+        ''' the children of a node are ordered by the weight of the tags below them, hot branches first '''
+        value = fields_by_tree.values[node]
+        children = [GeneratorBase.make_tree_definition(fields_by_tree, child, index_by_name, tag_by_name, weights) for child in fields_by_tree.children(node)]
+        children.sort(key=lambda child: -child['weight'])
+        return {
+            'label': fields_by_tree.label(node),
+            'index': None if value == None else index_by_name[value.name],
+            'weight': weights.get(tag_by_name[value.name], 0.0) if value != None else sum(child['weight'] for child in children),
+            'children': children,
         }
+
+    @staticmethod
+    def snake_case(name: str) -> str:
+        ''' ClOrdID to cl_ord_id, SecurityIDSource to security_id_source, NoPartyIDs to no_party_ids '''
+        name = re.sub(r'([A-Z]{2,})s(?![a-z])', lambda match: match.group(1).capitalize() + 's', name)
+        name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', name)
+        return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+    @staticmethod
+    def variant_name(name: str) -> str:
+        ''' ALL_ORDERS_FOR_A_TRADING_SESSION to AllOrdersForATradingSession, BusinessMessageAck is kept '''
+        variant = ''.join(part.capitalize() if part.isupper() else part[0].upper() + part[1:] for part in name.split('_') if part != '')
+        return 'V' + variant if variant == '' or not variant[0].isalpha() else variant
+
+    @staticmethod
+    def has_enum(field: dict) -> bool:
+        return len(field['values']) != 0 and field['type'] not in NO_ENUM_TYPES
+
+    @staticmethod
+    def make_enum_definition(field: dict) -> dict:
+        ''' the variants of a field with values, numbered in the order of the dictionary, and their decoder '''
+        variants = []
+        names = set()
+        literals = set()
+        for value in field['values']:
+            # a value listed twice keeps its first name
+            if value['value'] in literals:
+                continue
+            literals.add(value['value'])
+            name = GeneratorBase.variant_name(value['name'])
+            while name in names:
+                name += '_'
+            names.add(name)
+            variants.append({
+                'name': name,
+                'value': value['value'],
+                'literal': value['value'].replace('\\', '\\\\').replace('"', '\\"'),
+                'code': len(variants),
+            })
+        return {
+            'name': field['name'],
+            'number': field['number'],
+            'type': field['type'],
+            'variants': variants,
+            'tables': make_enum_tables([variant['value'] for variant in variants]),
+        }
+
+    @staticmethod
+    def make_msg_type_dispatch(messages: List[dict]) -> dict:
+        ''' the kind of a message, its position in messages, from its MsgType: a perfect hash of the packed MsgType,
+            or the packed switch of the enums when a MsgType can not be packed or no multiplier is found '''
+        types = [message['type'] for message in messages]
+        kinds = [{'name': message['name'], 'type': message['type'], 'kind': kind} for kind, message in enumerate(messages)]
+        packable = all(len(msg_type.encode('latin-1')) <= PACKED_VALUE_MAX_LENGTH for msg_type in types)
+        perfect_hash = find_perfect_hash([pack_value(msg_type) for msg_type in types], 64) if packable else None
+        if perfect_hash == None:
+            return {'strategy': 'packed_switch', 'messages': kinds, 'tables': make_enum_tables(types)}
+        # an empty slot has the key 0 of the empty MsgType and the kind after the last message, unknown
+        keys = [0] * perfect_hash['size']
+        values = [len(messages)] * perfect_hash['size']
+        for kind, msg_type in enumerate(types):
+            slot = ((pack_value(msg_type) * perfect_hash['multiplier']) & 0xFFFFFFFFFFFFFFFF) >> perfect_hash['shift']
+            keys[slot] = pack_value(msg_type)
+            values[slot] = kind
+        return dict(perfect_hash, strategy='perfect_hash', messages=kinds, keys=keys, values=values)
+
+    @staticmethod
+    def make_framing_definition(header: List[dict], trailer: List[dict]) -> Optional[dict]:
+        ''' the tags delimiting a message on the wire: BeginString and BodyLength start the header and CheckSum ends
+            the trailer, as marked by get_message_definition. None without header or trailer '''
+        if len(header) == 0 or len(trailer) == 0 or len(trailer[0]['fields_by_order']) == 0:
+            return None
+        header_fields = header[0]['fields_by_order']
+        if len(header_fields) < 2 or header_fields[0]['token'] != 'field' or header_fields[1]['token'] != 'field':
+            raise Exception('Internal Error: the header does not start with the BeginString and BodyLength fields')
+        return {
+            'begin_string': header_fields[0]['id'],
+            'body_length': header_fields[1]['id'],
+            'checksum': trailer[0]['fields_by_order'][-1]['id'],
+        }
+
+    @staticmethod
+    def tag_prefix(tag: int) -> Tuple[int, int]:
+        ''' the bytes of "tag=" read as a little endian integer and their count, the key of the fast path.
+            A tag of more than 7 digits gets a key no text matches '''
+        encoded = f'{tag}='.encode('latin-1')
+        if len(encoded) > 8:
+            return 0xFFFFFFFFFFFFFFFF, 8
+        return int.from_bytes(encoded, 'little'), len(encoded)
+
+    @staticmethod
+    def encoded_prefix(tag: int) -> dict:
+        ''' "tag=" as the little endian integer the encoders store in one write, its length and the sum of its bytes
+            for the CheckSum '''
+        encoded = f'{tag}='.encode('latin-1')
+        if len(encoded) > 8:
+            raise Exception(f'Internal Error: the tag {tag} is too long for the encoders')
+        return {'bytes': int.from_bytes(encoded, 'little'), 'length': len(encoded), 'sum': sum(encoded)}
+
+    @staticmethod
+    def make_encoder_definition(definition: dict, fields: Dict[str, dict], framing: dict) -> dict:
+        ''' the fields an encoder of a message or a group entry appends, in the order of the dictionary. The framing
+            fields and MsgType are written by the encoder itself, a DATA field is appended with its LENGTH field '''
+        skipped = {framing['begin_string'], framing['body_length'], framing['checksum'], MSG_TYPE_TAG}
+        by_order = definition['fields_by_order']
+        by_name = {field['name']: field for field in by_order}
+        length_of = {field['name']: by_name[fields[field['name']]['length_field']] for field in by_order if fields[field['name']]['length_field'] in by_name}
+        lengths = {length['name'] for length in length_of.values()}
+        encoder_fields = []
+        for field in by_order:
+            if field['id'] in skipped or field['name'] in lengths:
+                continue
+            field_type = fields[field['name']]['type']
+            encoder_field = {'name': field['name'], 'tag': field['id'], 'prefix': GeneratorBase.encoded_prefix(field['id']), 'group': None}
+            if field['token'] == 'group':
+                encoder_field['kind'] = 'group'
+                encoder_field['group'] = field['name']
+            elif field['name'] in length_of:
+                encoder_field['kind'] = 'data'
+                length = length_of[field['name']]
+                encoder_field['length'] = {'name': length['name'], 'tag': length['id'], 'prefix': GeneratorBase.encoded_prefix(length['id'])}
+            elif GeneratorBase.has_enum(fields[field['name']]) and field_type != 'MULTIPLEVALUESTRING':
+                encoder_field['kind'] = 'enum'
+            else:
+                encoder_field['kind'] = ENCODER_KINDS.get(field_type, 'string')
+                if encoder_field['kind'] == 'scaled':
+                    encoder_field['scale'] = fields[field['name']]['scale']
+            encoder_fields.append(encoder_field)
+        return {'name': definition['name'], 'type': definition.get('type'), 'fields': encoder_fields}
+
+    @staticmethod
+    def make_encoders_definition(schema: dict, fields: Dict[str, dict], framing: dict) -> dict:
+        ''' the encoders of the group entries, nested groups first, and of the messages with the "tag=" constants of
+            their fields '''
+        groups = [GeneratorBase.make_encoder_definition(group, fields, framing) for group in GeneratorBase.groups_in_dependency_order(schema['groups'])]
+        messages = [GeneratorBase.make_encoder_definition(message, fields, framing) for message in schema['messages']]
+        prefixes = {}
+        for encoder in groups + messages:
+            for field in encoder['fields']:
+                prefixes[field['name']] = {'name': field['name'], 'tag': field['tag'], 'prefix': field['prefix']}
+                if field['kind'] == 'data':
+                    prefixes[field['length']['name']] = field['length']
+        session_header = GeneratorBase.make_session_header_definition(schema['header'], fields, framing)
+        if session_header != None:
+            for field in session_header['fields']:
+                prefixes[field['name']] = {'name': field['name'], 'tag': field['tag'], 'prefix': field['prefix']}
+        return {
+            'tag_prefixes': sorted(prefixes.values(), key=lambda field: field['tag']),
+            'session_header': session_header,
+            'groups': groups,
+            'messages': messages,
+            'uses_enums': any(field['kind'] == 'enum' for encoder in groups + messages + ([session_header] if session_header else []) for field in encoder['fields']),
+            'msg_type_prefix': GeneratorBase.encoded_prefix(MSG_TYPE_TAG),
+            'checksum_prefix': GeneratorBase.encoded_prefix(framing['checksum']),
+        }
+
+    @staticmethod
+    def make_session_header_definition(header: List[dict], fields: Dict[str, dict], framing: dict) -> Optional[dict]:
+        ''' the header fields a session renders once: MsgSeqNum and SendingTime get fixed width slots patched for each
+            message, the others are static. None when the header has no MsgSeqNum or SendingTime '''
+        if len(header) == 0:
+            return None
+        tags = {field['id'] for field in header[0]['fields_by_order']}
+        if MSG_SEQ_NUM_TAG not in tags or SENDING_TIME_TAG not in tags:
+            return None
+        definition = GeneratorBase.make_encoder_definition(dict(header[0], name='SessionHeader'), fields, framing)
+        definition['fields'] = [field for field in definition['fields'] if field['tag'] not in (MSG_SEQ_NUM_TAG, SENDING_TIME_TAG)]
+        definition['msg_seq_num_prefix'] = GeneratorBase.encoded_prefix(MSG_SEQ_NUM_TAG)
+        definition['sending_time_prefix'] = GeneratorBase.encoded_prefix(SENDING_TIME_TAG)
+        return definition
+
+    @staticmethod
+    def presence_masks(fields_by_order: List[dict]) -> List[int]:
+        ''' a bit per field by dispatch index in 64 bit words, set for the required fields '''
+        masks = [0] * ((len(fields_by_order) + 63) // 64)
+        for index, field in enumerate(fields_by_order):
+            # the required flag of a group is kept as a string
+            if field['required'] in [True, 'True']:
+                masks[index // 64] |= 1 << (index % 64)
+        return masks
+
+    @staticmethod
+    def groups_in_dependency_order(groups: List[dict]) -> List[dict]:
+        ''' the groups with the nested groups before the groups using them '''
+        by_name = {group['name']: group for group in groups}
+        ordered = []
+        visited = set()
+        def visit(group: dict) -> None:
+            if group['name'] in visited:
+                return
+            visited.add(group['name'])
+            for field in group['fields_by_order']:
+                if field['token'] == 'group':
+                    visit(by_name[field['name']])
+            ordered.append(group)
+        for group in groups:
+            visit(group)
+        return ordered
+
+    @staticmethod
+    def format_columns(values: list, per_line: int = 16, indent: int = 8) -> str:
+        ''' comma separated values wrapped in lines, for the tables of the templates '''
+        lines = []
+        for start in range(0, len(values), per_line):
+            lines.append(' ' * indent + ', '.join(str(value) for value in values[start:start + per_line]))
+        return ',\n'.join(lines)
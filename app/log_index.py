@@ -0,0 +1,345 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import datetime
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.definition import SchemaDefinition
+from app.definition_helper import DefinitionHelper
+from app.stream_parser import StreamParser
+
+""" bump it when the layout of the index file changes """
+LOG_INDEX_VERSION = 1
+
+LOG_INDEX_MAGIC = b'FIXIDX'
+
+""" the configurable tags of an index, ClOrdID or OrderID for instance """
+MAX_KEY_FIELDS = 2
+
+""" the header of an index file: magic, version and the number of key tags, followed by the key tags """
+HEADER_FORMAT = struct.Struct('<6sHI')
+KEY_FORMAT = struct.Struct('<I')
+
+""" a record of a message: offset and length in the log, MsgSeqNum, SendingTime, MsgType, then a hash of the value
+    of each key tag """
+RECORD_PREFIX = '<QIIq8s'
+
+""" the SendingTime of a message without a valid one, the MsgSeqNum and the key hashes of an absent field are 0 """
+NULL_TIME = -(1 << 63)
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+""" the multiplier of the decimals of second of a UTCTIMESTAMP, by length of the value """
+FRACTION_MULTIPLIERS = {17: 0, 21: 1000000, 24: 1000, 27: 1}
+
+""" the messages appended to the index at once """
+APPEND_BATCH = 4096
+
+@dataclass(frozen=True)
+class IndexEntry:
+    ''' a message of the log found by the index, its bytes are log[offset:offset + length] '''
+    offset: int
+    length: int
+    msg_seq_num: int
+    sending_time: int
+    msg_type: str
+
+class LogIndex:
+    ''' Index of the messages of a FIX log, kept in a sidecar file next to the log.
+
+        The messages are framed by BeginString, BodyLength and CheckSum, the text between them (timestamps of the
+        log lines, truncated messages) is skipped. A record of fixed size per message holds its offset, length,
+        MsgSeqNum, SendingTime, MsgType and a hash of the values of the key fields. update() appends the messages
+        written to the log since the last update. A query maps the index file and filters its records as a NumPy
+        structured array, the log is only read at the offsets of the matching messages. '''
+
+    def __init__(self, log_path: str, schema: SchemaDefinition, key_fields: Optional[List[str]] = None, index_path: Optional[str] = None) -> None:
+        key_fields = key_fields if key_fields != None else []
+        if len(key_fields) > MAX_KEY_FIELDS:
+            raise Exception(f'an index has at most {MAX_KEY_FIELDS} key fields, got {", ".join(key_fields)}')
+        self.log_path = log_path
+        self.index_path = index_path if index_path != None else log_path + '.idx'
+        self.key_fields = list(key_fields)
+        self.key_tags = [LogIndex.field_tag(schema, name) for name in key_fields]
+        for name in key_fields:
+            if schema.fields[name].type in ['DATA', 'XMLDATA']:
+                raise Exception(f'the key field {name} is a DATA field')
+        self.begin_tag = LogIndex.field_tag(schema, 'BeginString')
+        self.length_tag = LogIndex.field_tag(schema, 'BodyLength')
+        self.checksum_tag = LogIndex.field_tag(schema, 'CheckSum')
+        self.record = struct.Struct(RECORD_PREFIX + 'Q' * len(key_fields))
+        # the layout of the records for the queries, the fields of a structured dtype are packed like the struct
+        self.record_dtype = np.dtype([('offset', '<u8'), ('length', '<u4'), ('msg_seq_num', '<u4'), ('sending_time', '<i8'), ('msg_type', 'S8')]
+                                     + [(f'key{index}', '<u8') for index in range(len(key_fields))])
+        self.begin_marker = b'%d=FIX' % self.begin_tag
+        self.length_marker = b'\x01%d=' % self.length_tag
+        self.checksum_marker = b'%d=' % self.checksum_tag
+        # the tags searched in a message, the header fields then the key fields
+        self.value_markers = [b'\x01%d=' % LogIndex.field_tag(schema, name) for name in ['MsgType', 'MsgSeqNum', 'SendingTime']]
+        self.value_markers += [b'\x01%d=' % tag for tag in self.key_tags]
+        # the value of a DATA field may hold SOH and text looking like a field, the messages with a LENGTH field
+        # announcing a DATA field are split field by field
+        self.data_fields = {str(field.number).encode(): str(schema.fields[field.length_field].number).encode()
+                            for field in schema.fields.values() if field.length_field != None and field.length_field in schema.fields}
+        self.data_markers = [b'\x01%s=' % length_tag for length_tag in set(self.data_fields.values())]
+
+    @staticmethod
+    def field_tag(schema: SchemaDefinition, name: str) -> int:
+        field = schema.fields.get(name)
+        if field == None or field.number == None:
+            raise Exception(f'the field {name} is not defined in the schema')
+        return field.number
+
+    @staticmethod
+    def schema_from_file(path: str) -> SchemaDefinition:
+        return DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file(path).get_schema(None))
+
+    @staticmethod
+    def parse_timestamp(value: bytes) -> int:
+        ''' the nanoseconds since the epoch of a UTCTIMESTAMP, YYYYMMDD-HH:MM:SS with 0, 3, 6 or 9 decimals of second,
+            NULL_TIME when the value does not follow the layout or is out of the range of int64 nanoseconds '''
+        length = len(value)
+        if length not in FRACTION_MULTIPLIERS or value[8:9] != b'-' or value[11:12] != b':' or value[14:15] != b':':
+            return NULL_TIME
+        digits = value[0:8] + value[9:11] + value[12:14] + value[15:17]
+        if not digits.isdigit() or (length > 17 and (value[17:18] != b'.' or not value[18:].isdigit())):
+            return NULL_TIME
+        year, month, day = int(digits[0:4]), int(digits[4:6]), int(digits[6:8])
+        hour, minute, second = int(digits[8:10]), int(digits[10:12]), int(digits[12:14])
+        # 60 is a leap second
+        if not 1678 <= year <= 2261 or hour > 23 or minute > 59 or second > 60:
+            return NULL_TIME
+        try:
+            days = datetime.date(year, month, day).toordinal() - EPOCH_ORDINAL
+        except ValueError:
+            return NULL_TIME
+        fraction = int(value[18:]) * FRACTION_MULTIPLIERS[length] if length > 17 else 0
+        return ((days * 86400 + hour * 3600 + minute * 60 + second) * 1000000000) + fraction
+
+    @staticmethod
+    def key_hash(value: bytes) -> int:
+        ''' the hash of the value of a key field, 0 is the absent value '''
+        return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'little') or 1
+
+    def find_message(self, data, position: int, end: int) -> Tuple[int, int, int]:
+        ''' the next complete message from position: its start, the start of the fields after BodyLength and its end,
+            a start of -1 when there is none. A message still being written is left to the next update '''
+        while True:
+            start = data.find(self.begin_marker, position, end)
+            if start == -1:
+                return -1, 0, 0
+            length_start = data.find(self.length_marker, start, min(start + 64, end))
+            if length_start != -1:
+                length_start += len(self.length_marker)
+                body_start = data.find(b'\x01', length_start, min(length_start + 16, end)) + 1
+                if body_start != 0 and data[length_start:body_start - 1].isdigit():
+                    message_end = body_start + int(data[length_start:body_start - 1]) + len(self.checksum_marker) + 4
+                    trailer = message_end - len(self.checksum_marker) - 4
+                    if message_end <= end and data[trailer:trailer + len(self.checksum_marker)] == self.checksum_marker and data[message_end - 1] == 1:
+                        return start, body_start, message_end
+            position = start + 1
+
+    def message_values(self, data, body_start: int, body_end: int) -> List[Optional[bytes]]:
+        ''' the values of MsgType, MsgSeqNum, SendingTime and the key fields, the first occurrence of each tag '''
+        if any(data.find(marker, body_start - 1, body_end) != -1 for marker in self.data_markers):
+            return self.split_values(data, body_start, body_end)
+        values = []
+        for marker in self.value_markers:
+            value_start = data.find(marker, body_start - 1, body_end)
+            if value_start == -1:
+                values.append(None)
+            else:
+                value_start += len(marker)
+                values.append(data[value_start:data.find(b'\x01', value_start, body_end)])
+        return values
+
+    def split_values(self, data, body_start: int, body_end: int) -> List[Optional[bytes]]:
+        ''' message_values field by field, the value of a DATA field is skipped by the LENGTH field before it '''
+        tags = {marker[1:-1]: index for index, marker in enumerate(self.value_markers)}
+        values: List[Optional[bytes]] = [None] * len(self.value_markers)
+        previous_tag, previous_value = None, None
+        position = body_start
+        while position < body_end:
+            equals = data.find(b'=', position, body_end)
+            if equals == -1:
+                break
+            tag = data[position:equals]
+            length_tag = self.data_fields.get(tag)
+            if length_tag != None and previous_tag == length_tag and previous_value.isdigit():
+                value_end = equals + 1 + int(previous_value)
+            else:
+                value_end = data.find(b'\x01', equals + 1, body_end)
+                if value_end == -1:
+                    value_end = body_end
+            value = data[equals + 1:value_end]
+            index = tags.get(tag)
+            if index != None and values[index] == None:
+                values[index] = value
+            previous_tag, previous_value = tag, value
+            position = value_end + 1
+        return values
+
+    def make_record(self, start: int, end: int, values: List[Optional[bytes]]) -> bytes:
+        msg_type, msg_seq_num, sending_time = values[0:3]
+        return self.record.pack(
+            start,
+            end - start,
+            int(msg_seq_num) if msg_seq_num != None and msg_seq_num.isdigit() and len(msg_seq_num) < 10 else 0,
+            LogIndex.parse_timestamp(sending_time) if sending_time != None else NULL_TIME,
+            msg_type[0:8] if msg_type != None else b'',
+            *[LogIndex.key_hash(value) if value != None else 0 for value in values[3:]])
+
+    def header(self) -> bytes:
+        return HEADER_FORMAT.pack(LOG_INDEX_MAGIC, LOG_INDEX_VERSION, len(self.key_tags)) + b''.join(KEY_FORMAT.pack(tag) for tag in self.key_tags)
+
+    def update(self) -> int:
+        ''' appends the records of the messages written to the log since the last update, the index is built again
+            when it does not exist, has other key fields or the log is shorter than the indexed messages.
+            Returns the number of messages appended '''
+        header = self.header()
+        resume = None
+        try:
+            with open(self.index_path, 'r+b') as index_file:
+                if index_file.read(len(header)) == header:
+                    # a record cut by a crash during an update is dropped, the update goes on after the last record
+                    records_size = os.fstat(index_file.fileno()).st_size - len(header)
+                    records_size -= records_size % self.record.size
+                    index_file.truncate(len(header) + records_size)
+                    resume = 0
+                    if records_size != 0:
+                        index_file.seek(len(header) + records_size - self.record.size)
+                        offset, length = self.record.unpack(index_file.read(self.record.size))[0:2]
+                        resume = offset + length
+        except FileNotFoundError:
+            pass
+        log_size = os.path.getsize(self.log_path)
+        if resume == None or log_size < resume:
+            resume = 0
+            with open(self.index_path, 'wb') as index_file:
+                index_file.write(header)
+        if log_size == resume:
+            return 0
+
+        appended = 0
+        with open(self.log_path, 'rb') as log_file, open(self.index_path, 'ab') as index_file:
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                batch = []
+                position = resume
+                while True:
+                    start, body_start, end = self.find_message(data, position, len(data))
+                    if start == -1:
+                        break
+                    batch.append(self.make_record(start, end, self.message_values(data, body_start, end)))
+                    position = end
+                    if len(batch) == APPEND_BATCH:
+                        index_file.write(b''.join(batch))
+                        appended += len(batch)
+                        batch = []
+                index_file.write(b''.join(batch))
+                appended += len(batch)
+        return appended
+
+    def select(self, data, msg_type: Optional[str], msg_seq_num: Optional[int], since: Optional[int], until: Optional[int], hashes: List[Tuple[int, int]]) -> np.ndarray:
+        ''' the records of the mapped index file matching the criteria, a record cut by a crash during an update is
+            dropped. Raises when the file is not an index of this layout and key fields '''
+        header = self.header()
+        if data[0:len(header)] != header:
+            raise Exception(f'{self.index_path} is not an index of {self.log_path} with the key fields {self.key_fields}, update it')
+        records = np.frombuffer(data, self.record_dtype, (len(data) - len(header)) // self.record_dtype.itemsize, len(header))
+        matching = np.ones(len(records), dtype=bool)
+        if msg_type != None:
+            # the MsgType of a record is cut to 8 bytes, a longer one matches none
+            packed_type = msg_type.encode('latin-1')
+            matching &= (records['msg_type'] == packed_type) if len(packed_type) <= 8 else False
+        if msg_seq_num != None:
+            matching &= records['msg_seq_num'] == msg_seq_num
+        if since != None or until != None:
+            sending_time = records['sending_time']
+            matching &= sending_time != NULL_TIME
+            if since != None:
+                matching &= sending_time >= since
+            if until != None:
+                matching &= sending_time < until
+        for index, key_hash in hashes:
+            matching &= records[f'key{index}'] == np.uint64(key_hash)
+        # a copy, the mapping of the file can be closed
+        return records[matching]
+
+    def find(self, msg_type: Optional[str] = None, msg_seq_num: Optional[int] = None, since: Optional[int] = None, until: Optional[int] = None,
+             keys: Optional[Dict[str, bytes]] = None) -> List[IndexEntry]:
+        ''' the messages matching every given criteria in the order of the log: the MsgType, the MsgSeqNum, the
+            SendingTime in [since, until) in nanoseconds since the epoch and the values of key fields by name '''
+        keys = keys if keys != None else {}
+        for name in keys:
+            if name not in self.key_fields:
+                raise Exception(f'{name} is not a key field of the index, the key fields are {self.key_fields}')
+        hashes = [(index, LogIndex.key_hash(keys[name])) for index, name in enumerate(self.key_fields) if name in keys]
+        if not os.path.exists(self.index_path) or os.path.getsize(self.index_path) == 0:
+            raise Exception(f'{self.index_path} is not an index of {self.log_path} with the key fields {self.key_fields}, update it')
+        with open(self.index_path, 'rb') as index_file, mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            selected = self.select(data, msg_type, msg_seq_num, since, until, hashes)
+        matches = [IndexEntry(offset, length, entry_seq_num, sending_time, entry_type.decode('latin-1')) for offset, length, entry_seq_num, sending_time, entry_type
+                   in zip(selected['offset'].tolist(), selected['length'].tolist(), selected['msg_seq_num'].tolist(), selected['sending_time'].tolist(), selected['msg_type'].tolist())]
+        if len(hashes) == 0 or len(matches) == 0:
+            return matches
+        # the hashes of two values may be the same, the values of the matching messages are checked
+        with open(self.log_path, 'rb') as log_file:
+            checked = []
+            for match in matches:
+                log_file.seek(match.offset)
+                message = log_file.read(match.length)
+                body_start = message.find(b'\x01', message.find(self.length_marker) + 1) + 1
+                values = self.message_values(message, body_start, len(message))
+                if all(values[3 + index] == keys[self.key_fields[index]] for index, _ in hashes):
+                    checked.append(match)
+            return checked
+
+    def read(self, entries: List[IndexEntry]) -> Iterator[bytes]:
+        ''' the bytes of the messages of entries, read at their offset in the log '''
+        with open(self.log_path, 'rb') as log_file:
+            for entry in entries:
+                log_file.seek(entry.offset)
+                yield log_file.read(entry.length)
+
+def main() -> None:
+    parser = ArgumentParser(prog='fix-converter-index', description='indexes a FIX log in a sidecar file and prints the messages matching a query')
+    parser.add_argument('log', help='FIX log file, the text between the messages is skipped')
+    parser.add_argument('--schema', help='path to xml schema', required=True)
+    parser.add_argument('--key', help=f'a field indexed by value, at most {MAX_KEY_FIELDS}', action='append', default=[])
+    parser.add_argument('--index', help='path of the index, the log path followed by .idx by default', default=None)
+    parser.add_argument('--msg-type', help='MsgType of the messages printed', default=None)
+    parser.add_argument('--seq-num', help='MsgSeqNum of the messages printed', default=None, type=int)
+    parser.add_argument('--since', help='first SendingTime of the messages printed, YYYYMMDD-HH:MM:SS', default=None)
+    parser.add_argument('--until', help='SendingTime after the messages printed, YYYYMMDD-HH:MM:SS', default=None)
+    parser.add_argument('--value', help='NAME=VALUE of a key field of the messages printed', action='append', default=[])
+
+    args = parser.parse_args()
+
+    try:
+        index = LogIndex(args.log, LogIndex.schema_from_file(args.schema), args.key, args.index)
+        appended = index.update()
+        if args.msg_type == None and args.seq_num == None and args.since == None and args.until == None and len(args.value) == 0:
+            print(f'{index.index_path}: {appended} messages appended')
+            return
+        times = []
+        for value in [args.since, args.until]:
+            times.append(LogIndex.parse_timestamp(value.encode()) if value != None else None)
+            if times[-1] == NULL_TIME:
+                raise Exception(f'{value} is not a timestamp YYYYMMDD-HH:MM:SS')
+        keys = dict(value.split('=', 1) for value in args.value)
+        entries = index.find(args.msg_type, args.seq_num, times[0], times[1], {name: value.encode('latin-1') for name, value in keys.items()})
+        for message in index.read(entries):
+            print(message.replace(b'\x01', b'|').decode('latin-1'))
+    except Exception as e:
+        sys.exit(f'error: {e}')
+
+if __name__ == '__main__':
+    main()
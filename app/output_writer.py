@@ -0,0 +1,51 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+from typing import List
+
+class OutputWriter:
+    ''' Writes the generated files under a destination directory.
+        A file is only replaced when its bytes differ, so the mtime of the unchanged files is kept
+        and make, ninja or cargo only rebuild what really changed. The replacement is atomic. '''
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+
+    def write(self, relative_path: str, content: str) -> bool:
+        file_path = os.path.join(self.path, relative_path)
+        data = content.encode('utf-8')
+        try:
+            with open(file_path, 'rb') as existing_file:
+                if existing_file.read() == data:
+                    self.unchanged.append(relative_path)
+                    return False
+            mode = os.stat(file_path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~OutputWriter.current_umask()
+
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                temp_file.write(data)
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self.written.append(relative_path)
+        return True
+
+    def summary(self) -> str:
+        return f'{len(self.written)} files written, {len(self.unchanged)} unchanged'
+
+    @staticmethod
+    def current_umask() -> int:
+        umask = os.umask(0)
+        os.umask(umask)
+        return umask
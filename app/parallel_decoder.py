@@ -0,0 +1,64 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.columnar import ColumnarDecoder
+
+""" the bytes of log decoded by a task, a worker gets several tasks to balance the chunks of different content """
+DEFAULT_CHUNK_BYTES = 32 << 20
+
+class ParallelDecoder:
+    ''' Decoding of a FIX log file with a ColumnarDecoder in several processes.
+
+        The log is cut in chunks of chunk_bytes. Each worker maps the log file once, a task is only the position
+        and the stop of a chunk: the worker frames the messages from the first 8=FIX after the position and decodes
+        the ones starting before the stop. The 8=FIX found at a cut may be inside a message (a DATA payload), the
+        chunks are checked to follow each other, the first message of a chunk has to be the one after the last
+        message of the previous chunk, and a chunk that does not is decoded again from there. The rows are the ones
+        of ColumnarDecoder.decode of the whole log, in the same order. '''
+
+    # the decoder and the log of a worker process, set by start_worker
+    worker: Optional[Tuple[ColumnarDecoder, mmap.mmap]] = None
+
+    def __init__(self, decoder: ColumnarDecoder, workers: Optional[int] = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> None:
+        self.decoder = decoder
+        self.workers = workers if workers != None else os.cpu_count()
+        self.chunk_bytes = chunk_bytes
+
+    @staticmethod
+    def start_worker(decoder: ColumnarDecoder, path: str) -> None:
+        with open(path, 'rb') as log_file:
+            ParallelDecoder.worker = (decoder, mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def decode_chunk(position: int, stop: int) -> Tuple[Dict[str, np.ndarray], int, int]:
+        ''' the rows of the messages starting between position and stop, the start of the first message framed
+            from position and the start of the first message at or after stop, -1 when there is none '''
+        decoder, data = ParallelDecoder.worker
+        starts, ends, next_start = ColumnarDecoder.frame_messages(data, position, stop)
+        first = int(starts[0]) if len(starts) != 0 else next_start
+        return decoder.decode_messages(data, starts, ends) if len(decoder.columns) != 0 else {}, first, next_start
+
+    def decode(self, path: str) -> Dict[str, np.ndarray]:
+        ''' the rows of the messages of the log file by MsgType, in the order of the messages '''
+        size = os.path.getsize(path)
+        if size == 0 or len(self.decoder.columns) == 0:
+            return {}
+        cuts = list(range(0, size, self.chunk_bytes)) + [size]
+        with ProcessPoolExecutor(self.workers, initializer=ParallelDecoder.start_worker, initargs=(self.decoder, path)) as executor:
+            chunks = list(executor.map(ParallelDecoder.decode_chunk, cuts[:-1], cuts[1:]))
+            for index in range(1, len(chunks)):
+                expected = chunks[index - 1][2]
+                if chunks[index][1] != expected:
+                    # the cut was inside a message, the chunk starts after the message
+                    chunks[index] = executor.submit(ParallelDecoder.decode_chunk, expected if expected != -1 else size, cuts[index + 1]).result()
+        parts: Dict[str, List[np.ndarray]] = {msg_type: [] for msg_type in self.decoder.columns}
+        for tables, _, _ in chunks:
+            for msg_type, rows in tables.items():
+                parts[msg_type].append(rows)
+        return {msg_type: np.concatenate(rows) for msg_type, rows in parts.items() if len(rows) != 0}
@@ -0,0 +1,299 @@
+# Copyright (C) 2025 R. Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import os
+import xml.parsers.expat
+from typing import Optional, Dict, List, Any
+from app.schema import *
+from app.xml_helper import *
+from app.helpers import *
+
+XINCLUDE_NAMESPACE = 'http://www.w3.org/2001/XInclude'
+
+""" size of the chunks fed to expat """
+READ_CHUNK_SIZE = 64 * 1024
+
+""" name used in the error messages for every container definition """
+CONTAINER_DEFINITION_NAME = {
+    'group': 'group',
+    'component': 'component',
+    'message': 'message',
+    'header': 'Header',
+    'trailer': 'Trailer',
+}
+
+class _SkipFrame:
+    ''' element whose sub tree is not part of the schema '''
+    pass
+
+SKIP_FRAME = _SkipFrame()
+
+class _SectionFrame:
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+
+class _FieldFrame:
+    def __init__(self, attributes: Dict[str, str]) -> None:
+        self.attributes = attributes
+        self.value_by_description = UniqueKeysDict()
+
+class _ContainerFrame:
+    def __init__(self, kind: str, attributes: Dict[str, str], check_components: bool) -> None:
+        self.kind = kind
+        self.attributes = attributes
+        self.check_components = check_components
+        self.fields = UniqueKeysDict()
+
+class StreamParser:
+    ''' Builds the Schema in one pass over the xml, without keeping a DOM alive.
+        The produced Schema is the same as the one returned by Parser.get_schema. '''
+
+    def __init__(self) -> None:
+        self.included_files: List[str] = []
+        self._path: List[str] = []
+        self._frames: List[Any] = []
+        self._active_includes: List[str] = []
+        self._root_attributes: Optional[Dict[str, str]] = None
+        self._fix_attributes: Optional[Dict[str, str]] = None
+        self._fields = UniqueKeysDict()
+        self._components = UniqueKeysDict()
+        self._messages = UniqueKeysDict()
+        self._header: Optional[Header] = None
+        self._trailer: Optional[Trailer] = None
+        self._field_references: List[str] = []
+        self._component_references: List[str] = []
+
+    @staticmethod
+    def from_file(path: str) -> StreamParser:
+        parser = StreamParser()
+        parser.parse_file(path)
+        return parser
+
+    @staticmethod
+    def from_string(string_xml: str) -> StreamParser:
+        parser = StreamParser()
+        parser.parse_string(string_xml)
+        return parser
+
+    def parse_file(self, path: str) -> None:
+        expat_parser = self._make_expat_parser(path)
+        with open(path, 'rb') as xml_file:
+            while True:
+                chunk = xml_file.read(READ_CHUNK_SIZE)
+                if len(chunk) == 0:
+                    break
+                expat_parser.Parse(chunk, False)
+        expat_parser.Parse(b'', True)
+
+    def parse_string(self, string_xml: str) -> None:
+        expat_parser = self._make_expat_parser(None)
+        expat_parser.Parse(string_xml, True)
+
+    def _make_expat_parser(self, base_url: str | None):
+        expat_parser = xml.parsers.expat.ParserCreate(namespace_separator='}')
+        expat_parser.StartElementHandler = lambda name, attributes: self._start_element(name, attributes, base_url)
+        expat_parser.EndElementHandler = self._end_element
+        return expat_parser
+
+    # <xi:include href="fields.xml"/>
+    def _include(self, attributes: Dict[str, str], base_url: str | None) -> None:
+        href = attr_from_dict(attributes, 'include', 'href')
+        if base_url:
+            href = os.path.join(os.path.dirname(base_url), href)
+        parse_str = attributes.get('parse', 'xml')
+        if parse_str == 'text':
+            # text content is not part of the schema
+            return
+        if parse_str != 'xml':
+            raise Exception(f'Malformed XML: unknown parse type in xi:include tag "{parse_str}"')
+        if href in self._active_includes:
+            raise Exception(f'Malformed XML: recursive include of "{href}"')
+        self._active_includes.append(href)
+        self.included_files.append(href)
+        self.parse_file(href)
+        self._active_includes.pop()
+
+    def _start_element(self, name: str, attributes: Dict[str, str], base_url: str | None) -> None:
+        namespace, _, tag = name.rpartition('}')
+        depth = len(self._path)
+        parent = self._frames[-1] if depth != 0 else None
+
+        if parent is SKIP_FRAME:
+            frame = SKIP_FRAME
+        elif namespace == XINCLUDE_NAMESPACE:
+            if tag != 'include':
+                raise Exception(f'Malformed XML: xi:{tag} tag must be child of xi:include')
+            # the included root element takes the place of the include element
+            self._include(attributes, base_url)
+            frame = SKIP_FRAME
+        elif depth == 0:
+            if tag == 'fix':
+                self._root_attributes = attributes
+            frame = _SectionFrame(tag)
+        elif depth == 1:
+            frame = self._start_top_level(tag, attributes)
+        elif isinstance(parent, _SectionFrame):
+            frame = self._start_section_element(parent, tag, attributes)
+        elif isinstance(parent, _FieldFrame):
+            if tag == 'value':
+                # <value enum="L" description="LESSEE"/>
+                member_value = Field_Value(
+                    enum = attr_from_dict(attributes, tag, 'enum'),
+                    description = attr_from_dict(attributes, tag, 'description'),
+                )
+                parent.value_by_description[member_value.description] = member_value
+            frame = SKIP_FRAME
+        elif isinstance(parent, _ContainerFrame):
+            frame = self._start_container_element(parent, tag, attributes)
+        else:
+            frame = SKIP_FRAME
+
+        self._path.append(tag)
+        self._frames.append(frame)
+
+    def _start_top_level(self, tag: str, attributes: Dict[str, str]) -> Any:
+        if tag == 'fix':
+            self._fix_attributes = attributes
+            return SKIP_FRAME
+        if tag == 'fields' or tag == 'components' or tag == 'messages':
+            return _SectionFrame(tag)
+        if tag == 'header' or tag == 'trailer':
+            return _ContainerFrame(tag, attributes, True)
+        return SKIP_FRAME
+
+    def _start_section_element(self, section: _SectionFrame, tag: str, attributes: Dict[str, str]) -> Any:
+        if section.tag == 'fields' and tag == 'field':
+            return _FieldFrame(attributes)
+        if section.tag == 'components' and tag == 'component':
+            return _ContainerFrame(tag, attributes, False)
+        if section.tag == 'messages' and tag == 'message':
+            return _ContainerFrame(tag, attributes, True)
+        return SKIP_FRAME
+
+    def _start_container_element(self, container: _ContainerFrame, tag: str, attributes: Dict[str, str]) -> Any:
+        if tag == 'group':
+            return _ContainerFrame(tag, attributes, container.check_components)
+        elif tag == 'field':
+            #    <field name="CheckSum" required="Y"/>
+            message_field = MessageField(
+                name = attr_from_dict(attributes, tag, 'name'),
+                required = attr_from_dict(attributes, tag, 'required', "N") == "Y",
+            )
+            self._field_references.append(message_field.name)
+            container.fields[message_field.name] = message_field
+        elif tag == 'component':
+            # <component name="Parties" required="Y" />
+            message_component = MessageComponent(
+                name = attr_from_dict(attributes, tag, 'name'),
+                required = attr_from_dict(attributes, tag, 'required', "N") == "Y",
+            )
+            if container.check_components:
+                self._component_references.append(message_component.name)
+            container.fields[message_component.name] = message_component
+        else:
+            raise Exception(f'Malformed XML: unsupported tag "{tag}" in the {CONTAINER_DEFINITION_NAME[container.kind]} definition')
+        return SKIP_FRAME
+
+    def _end_element(self, name: str) -> None:
+        tag = self._path.pop()
+        frame = self._frames.pop()
+        if isinstance(frame, _FieldFrame):
+            self._end_field(tag, frame)
+        elif isinstance(frame, _ContainerFrame):
+            self._end_container(tag, frame)
+
+    #   <field number="9706" name="FeeBilling" type="CHAR">
+    #      <value enum="B" description="CBOE_MEMBER"/>
+    #   </field>
+    def _end_field(self, tag: str, frame: _FieldFrame) -> None:
+        name_str = attr_from_dict(frame.attributes, tag, 'name')
+        field_type_str = attr_from_dict(frame.attributes, tag, 'type')
+        number_int = attr_from_dict(frame.attributes, tag, 'number', None, int)
+        if number_int == None:
+            raise Exception(f'Malformed XML: The field "{name_str}" has no number "{number_int}"')
+        self._fields[name_str] = Field(
+            name = name_str,
+            number = number_int,
+            field_type = field_type_str,
+            value_by_description = frame.value_by_description,
+        )
+
+    def _end_container(self, tag: str, frame: _ContainerFrame) -> None:
+        if frame.kind == 'group':
+            message_group = MessageGroup(
+                name = attr_from_dict(frame.attributes, tag, 'name'),
+                required = attr_from_dict(frame.attributes, tag, 'required', "N") == "Y",
+                field_by_name = frame.fields,
+            )
+            self._frames[-1].fields[message_group.name] = message_group
+        elif frame.kind == 'component':
+            component = Component(
+                name = attr_from_dict(frame.attributes, tag, 'name'),
+                field_group_by_name = frame.fields,
+            )
+            self._components[component.name] = component
+        elif frame.kind == 'message':
+            message = Message(
+                name = attr_from_dict(frame.attributes, tag, 'name'),
+                msg_type = attr_from_dict(frame.attributes, tag, 'msgtype'),
+                msg_category = attr_from_dict(frame.attributes, tag, 'msgcat', ""),
+                fields = frame.fields,
+            )
+            self._messages[message.name] = message
+        elif frame.kind == 'header':
+            self._header = Header(fields = frame.fields)
+        elif frame.kind == 'trailer':
+            self._trailer = Trailer(fields = frame.fields)
+
+    def get_fields(self) -> Dict[str, Field]:
+        return self._fields
+
+    def get_components(self) -> Dict[str, Component]:
+        return self._components
+
+    def get_messages(self) -> Dict[str, Message]:
+        return self._messages
+
+    def get_schema(self, package: str | None) -> Schema:
+        major_version_int = 0
+        minor_version_int = 0
+        if self._root_attributes != None:
+            major_version_int = attr_from_dict(self._root_attributes, 'fix', 'major', None, int)
+            minor_version_int = attr_from_dict(self._root_attributes, 'fix', 'minor', None, int)
+            cpyrght_str = attr_from_dict(self._root_attributes, 'fix', 'copyright', "")
+            vrsn_str = attr_from_dict(self._root_attributes, 'fix', 'version', "")
+        elif self._fix_attributes != None:
+            major_version_int = attr_from_dict(self._fix_attributes, 'fix', 'major', None, int)
+            minor_version_int = attr_from_dict(self._fix_attributes, 'fix', 'minor', None, int)
+            cpyrght_str = attr_from_dict(self._fix_attributes, 'fix', 'copyright')
+            vrsn_str = attr_from_dict(self._fix_attributes, 'fix', 'version')
+
+        if major_version_int == 0 or minor_version_int == 0:
+            raise Exception(f'Malformed XML: major or minor version is not present')
+
+        # the references can be declared before the definitions, so they are checked at the end
+        for field_name in self._field_references:
+            if field_name not in self._fields:
+                raise Exception(f'Malformed XML: the field "{field_name}" is not present in the field dictionary')
+        for component_name in self._component_references:
+            if component_name not in self._components:
+                raise Exception(f'Malformed XML: undefined component "{component_name}"')
+
+        if self._header == None:
+            raise Exception(f'Malformed XML: header is not present')
+        if self._trailer == None:
+            raise Exception(f'Malformed XML: trailer is not present')
+
+        return Schema(
+            fix_major_version = major_version_int,
+            fix_minor_version = minor_version_int,
+            copyright = cpyrght_str,
+            package = package,
+            version = vrsn_str,
+            fields = self._fields,
+            components = self._components,
+            message = self._messages,
+            header = self._header,
+            trailer = self._trailer,
+        )
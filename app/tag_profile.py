@@ -0,0 +1,149 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import hashlib
+import json
+import sys
+from argparse import ArgumentParser
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+""" bump it when the layout of the profile file changes """
+TAG_PROFILE_VERSION = 1
+
+""" the FIX field delimiter, the logs written for humans use '|' instead """
+SOH = '\x01'
+
+class TagProfile:
+    ''' Histogram of the tags seen per message type, collected from FIX logs.
+
+        The generators use it to put the hot tags first in the dispatch of a message, the counts
+        are divided by the number of messages of the type, a tag present in every message weights 1. '''
+
+    def __init__(self) -> None:
+        self.message_counts: Counter = Counter()
+        self.tag_counts: Dict[str, Counter] = {}
+
+    @staticmethod
+    def split_message(line: str) -> Optional[list]:
+        ''' the fields of the message in a log line, the text before 8= (timestamps, session ids) is skipped '''
+        start = line.find('8=FIX')
+        if start == -1:
+            return None
+        message = line[start:].rstrip('\r\n')
+        delimiter = SOH if SOH in message else '|'
+        return [field for field in message.split(delimiter) if len(field) != 0]
+
+    def add_message(self, fields: list) -> None:
+        tags = []
+        msg_type = None
+        for field in fields:
+            tag, separator, value = field.partition('=')
+            if separator == '' or not tag.isdigit():
+                # truncated line, the rest of the message is not counted
+                break
+            tags.append(int(tag))
+            if tag == '35' and msg_type == None:
+                msg_type = value
+        if msg_type == None:
+            return
+        self.message_counts[msg_type] += 1
+        self.tag_counts.setdefault(msg_type, Counter()).update(tags)
+
+    def add_log(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            fields = TagProfile.split_message(line)
+            if fields != None:
+                self.add_message(fields)
+
+    @staticmethod
+    def from_log_files(paths: Iterable[str]) -> TagProfile:
+        profile = TagProfile()
+        for path in paths:
+            with open(path, 'r', encoding='latin-1') as log_file:
+                profile.add_log(log_file)
+        return profile
+
+    def merge(self, other: TagProfile) -> None:
+        self.message_counts.update(other.message_counts)
+        for msg_type, counts in other.tag_counts.items():
+            self.tag_counts.setdefault(msg_type, Counter()).update(counts)
+
+    def tag_weights(self, msg_type: str | None = None) -> Dict[int, float]:
+        ''' average occurrences of each tag per message of msg_type, of every message when None '''
+        if msg_type == None:
+            message_count = sum(self.message_counts.values())
+            counts = Counter()
+            for type_counts in self.tag_counts.values():
+                counts.update(type_counts)
+        else:
+            message_count = self.message_counts.get(msg_type, 0)
+            counts = self.tag_counts.get(msg_type, Counter())
+        if message_count == 0:
+            return {}
+        return {tag: count / message_count for tag, count in counts.items()}
+
+    def to_json(self) -> dict:
+        return {
+            'version': TAG_PROFILE_VERSION,
+            'messages': {
+                msg_type: {
+                    'count': self.message_counts[msg_type],
+                    'tags': {str(tag): count for tag, count in sorted(self.tag_counts[msg_type].items())},
+                }
+                for msg_type in sorted(self.message_counts)
+            },
+        }
+
+    @staticmethod
+    def from_json(data: dict) -> TagProfile:
+        if data.get('version') != TAG_PROFILE_VERSION:
+            raise Exception(f'unsupported tag profile version "{data.get("version")}", expected {TAG_PROFILE_VERSION}')
+        profile = TagProfile()
+        for msg_type, message in data['messages'].items():
+            profile.message_counts[msg_type] = message['count']
+            profile.tag_counts[msg_type] = Counter({int(tag): count for tag, count in message['tags'].items()})
+        return profile
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as profile_file:
+            json.dump(self.to_json(), profile_file, indent=1)
+            profile_file.write('\n')
+
+    @staticmethod
+    def load(path: str) -> TagProfile:
+        with open(path, 'r') as profile_file:
+            return TagProfile.from_json(json.load(profile_file))
+
+    def digest(self) -> str:
+        ''' identifies the profile in the cache key of the generator IR '''
+        return hashlib.sha256(json.dumps(self.to_json(), sort_keys=True).encode()).hexdigest()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TagProfile) and self.to_json() == other.to_json()
+
+def main() -> None:
+    parser = ArgumentParser(prog='fix-converter-profile', description='collects the tag histograms of FIX logs, input of --tag-profile')
+    parser.add_argument('logs', help='FIX log files, one message per line, SOH or | delimited', nargs='+')
+    parser.add_argument('--output', help='path of the profile to write', required=True)
+    parser.add_argument('--merge', help='add the counts of the logs to the existing profile', action='store_true')
+
+    args = parser.parse_args()
+
+    try:
+        profile = TagProfile.from_log_files(args.logs)
+        if args.merge:
+            try:
+                existing = TagProfile.load(args.output)
+                existing.merge(profile)
+                profile = existing
+            except FileNotFoundError:
+                pass
+        profile.save(args.output)
+        print(f'{args.output}: {sum(profile.message_counts.values())} messages, {len(profile.message_counts)} message types')
+    except Exception as e:
+        sys.exit(f'error: {e}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+import unittest
+from app.cache import *
+from app.definition_helper import *
+from app.generator import GeneratorBase
+from app.stream_parser import *
+
+class Testing_Cache(unittest.TestCase):
+
+    MAIN_XML = '\
+<fix xmlns:xi="http://www.w3.org/2001/XInclude" major="4" minor="4">\
+  <header>\
+    <field name="BeginString" required="Y"/>\
+    <field name="MsgType" required="Y"/>\
+  </header>\
+  <trailer><field name="CheckSum" required="Y"/></trailer>\
+  <messages>\
+    <message name="Heartbeat" msgtype="0">\
+      <field name="TestReqID"/>\
+    </message>\
+  </messages>\
+  <xi:include href="fields.xml"/>\
+</fix>\
+'
+
+    FIELDS_XML = '\
+<fields>\
+  <field number="8" name="BeginString" type="STRING"/>\
+  <field number="35" name="MsgType" type="STRING"/>\
+  <field number="10" name="CheckSum" type="STRING"/>\
+  <field number="112" name="TestReqID" type="STRING"/>\
+</fields>\
+'
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.main_path = os.path.join(self.directory.name, "main.xml")
+        self.fields_path = os.path.join(self.directory.name, "fields.xml")
+        self.cache_path = os.path.join(self.directory.name, "cache")
+        with open(self.main_path, "w") as main_file:
+            main_file.write(self.MAIN_XML)
+        with open(self.fields_path, "w") as fields_file:
+            fields_file.write(self.FIELDS_XML)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def store_schema(self, cache: SchemaCache, key: str):
+        stream_parser = StreamParser.from_file(self.main_path)
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(stream_parser.get_schema("TestPackage"))
+        cache.store(key, [self.main_path] + stream_parser.included_files, schema_definition, GeneratorBase.make_ir(schema_definition))
+        return schema_definition
+
+    def test_StoreAndLoad(self):
+        cache = SchemaCache(self.cache_path)
+        key = cache.make_key(self.main_path, "TestPackage")
+        self.assertEqual(cache.load(key), None)
+
+        schema_definition = self.store_schema(cache, key)
+        entry = cache.load(key)
+        self.assertNotEqual(entry, None)
+        self.assertEqual(entry.get_schema_definition().messages["Heartbeat"].msg_type, "0")
+        self.assertEqual(entry.get_ir(), GeneratorBase.make_ir(schema_definition))
+        self.assertEqual(len(entry.dependencies), 2)
+
+    def test_KeyDependsOnPackageAndOptions(self):
+        cache = SchemaCache(self.cache_path)
+        key = cache.make_key(self.main_path, "TestPackage")
+        self.assertEqual(key, cache.make_key(self.main_path, "TestPackage"))
+        self.assertNotEqual(key, cache.make_key(self.main_path, "OtherPackage"))
+        self.assertNotEqual(key, cache.make_key(self.main_path, "TestPackage", ("option",)))
+
+    def test_IncludedFragmentChanged(self):
+        cache = SchemaCache(self.cache_path)
+        key = cache.make_key(self.main_path, "TestPackage")
+        self.store_schema(cache, key)
+        with open(self.fields_path, "w") as fields_file:
+            fields_file.write(self.FIELDS_XML.replace('"TestReqID" type="STRING"', '"TestReqID" type="INT"'))
+        self.assertEqual(cache.make_key(self.main_path, "TestPackage"), key)
+        self.assertEqual(cache.load(key), None)
+
+    def test_CorruptedEntry(self):
+        cache = SchemaCache(self.cache_path)
+        key = cache.make_key(self.main_path, "TestPackage")
+        self.store_schema(cache, key)
+        with open(os.path.join(self.cache_path, key + CACHE_ENTRY_SUFFIX), "wb") as entry_file:
+            entry_file.write(b"not a pickle")
+        self.assertEqual(cache.load(key), None)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_path, key + CACHE_ENTRY_SUFFIX)))
+
+    def test_Eviction(self):
+        cache = SchemaCache(self.cache_path)
+        keys = [cache.make_key(self.main_path, f"Package{index}") for index in range(3)]
+        for index, key in enumerate(keys):
+            self.store_schema(cache, key)
+            entry_path = os.path.join(self.cache_path, key + CACHE_ENTRY_SUFFIX)
+            os.utime(entry_path, (index, index))
+        entry_size = os.path.getsize(os.path.join(self.cache_path, keys[0] + CACHE_ENTRY_SUFFIX))
+
+        cache.max_size = entry_size * 2
+        cache.evict()
+        self.assertEqual(cache.load(keys[0]), None)
+        self.assertNotEqual(cache.load(keys[1]), None)
+        self.assertNotEqual(cache.load(keys[2]), None)
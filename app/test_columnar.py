@@ -0,0 +1,112 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import unittest
+from app.definition_helper import *
+from app.stream_parser import *
+from app import test_rust_generator
+
+try:
+    import numpy as np
+    from app.columnar import *
+except ImportError:
+    np = None
+
+@unittest.skipUnless(np, 'numpy not available')
+class Testing_Columnar(unittest.TestCase):
+
+    @staticmethod
+    def frame(body: str) -> bytes:
+        ''' the message with BeginString, BodyLength and CheckSum, the fields separated by | '''
+        encoded = body.replace('|', '\x01').encode('latin-1')
+        head = b'8=FIX.4.4\x019=%d\x01' % len(encoded)
+        return head + encoded + b'10=%03d\x01' % ((sum(head) + sum(encoded)) % 256)
+
+    @staticmethod
+    def schema(path: str):
+        return DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file(path).get_schema(None))
+
+    def test_Messages(self):
+        orders = [
+            self.frame('35=D|34=7|49=SENDER|52=20250102-10:00:00.123|56=TARGET|453=2|448=TRADER1|447=D|452=12|448=FIRM2|447=H|452=1|'
+                       '55=BOND|11=ORDER-1|38=1500|40=2|44=101.25|54=1|'),
+            self.frame('35=D|34=8|49=SENDER|52=20250102-10:00:01|56=TARGET|55=BOND|11=ORDER-2|38=-2|40=9|44=1.123456789|54=2|9999=custom|'),
+        ]
+        heartbeat = self.frame('35=0|34=9|49=SENDER|52=20250102-10:00:02.000|56=TARGET|')
+        # the lines of a log, a timestamp before each message and a truncated message
+        log = (b'2025-01-02 10:00:00 a=b IN ' + orders[0] + b'\n' + heartbeat + b'\n' + b'8=FIX.4.4\x019=500\x0135=D\x01\n'
+               + b'OUT ' + orders[1] + b'\n')
+        decoder = ColumnarDecoder(self.schema('resources/FIXLF44_Cash.xml'))
+        tables = decoder.decode(log)
+        self.assertEqual(sorted(tables), ['0', 'D'])
+        rows = tables['D']
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows['message_offset'].tolist(), [log.find(orders[0]), log.find(orders[1])])
+        self.assertEqual(rows['message_length'].tolist(), [len(order) for order in orders])
+        self.assertEqual(rows['MsgSeqNum'].tolist(), [7, 8])
+        self.assertEqual(rows['OrderQty'].tolist(), [15000000, -20000])
+        # 9 decimals for a PRICE of 8 is not a value
+        self.assertEqual(rows['Price'].tolist(), [10125000000, INT64_NULL])
+        self.assertEqual(rows['SendingTime'].astype(np.int64).tolist(), [1735812000123000000, 1735812001000000000])
+        self.assertEqual(rows['NoPartyIDs'].tolist(), [2, INT64_NULL])
+        side = decoder.column('D', 'Side')
+        self.assertEqual([side.categories[code - 1] for code in rows['Side']], [b'1', b'2'])
+        # 9 is not a value of OrdType
+        self.assertEqual([decoder.column('D', 'OrdType').categories[rows['OrdType'][0] - 1], rows['OrdType'][1]], [b'2', 0])
+        self.assertEqual([ColumnarDecoder.slice_value(log, value) for value in rows['ClOrdID']], [b'ORDER-1', b'ORDER-2'])
+        self.assertEqual(np.isnat(rows['OrigSendingTime']).tolist(), [True, True])
+        self.assertEqual(tables['0']['MsgSeqNum'].tolist(), [9])
+
+        # the messages cut in chunks of one message
+        chunked = ColumnarDecoder(self.schema('resources/FIXLF44_Cash.xml'), chunk_size=1).decode(log)
+        self.assertEqual(chunked['D'].tobytes(), rows.tobytes())
+
+        limited = ColumnarDecoder(self.schema('resources/FIXLF44_Cash.xml'), msg_types=['D'], fields=['MsgSeqNum', 'Price']).decode(log)
+        self.assertEqual(list(limited), ['D'])
+        self.assertEqual(limited['D'].dtype.names, ('message_offset', 'message_length', 'MsgSeqNum', 'Price'))
+        self.assertEqual(limited['D']['Price'].tolist(), rows['Price'].tolist())
+
+        # the CURRENCY fields are strings, the columns follow the FIX type of the field
+        report = self.frame('35=8|34=10|49=SENDER|52=20250102-10:00:03|56=TARGET|37=O-1|17=E-1|150=F|39=2|55=BOND|54=1|15=EUR|31=101.25|32=1500|14=1500|151=0|6=101.25|')
+        rows = decoder.decode(report)['8']
+        self.assertEqual(decoder.column('8', 'Currency').kind, 'slice')
+        self.assertEqual([ColumnarDecoder.slice_value(report, value) for value in rows['Currency']], [b'EUR'])
+        self.assertEqual(rows['LastPx'].tolist(), [10125000000])
+
+    def test_Values(self):
+        region = np.frombuffer(b'101.25|-0.05|.5|5.|1.2.3|-|12x|92233720368.54775807|92233720369|0.000000001|0.0000000010|', dtype=np.uint8)
+        ends = np.flatnonzero(region == ord('|'))
+        starts = np.concatenate([[0], ends[:-1] + 1])
+        values, valid = ColumnarDecoder.parse_scaled(region, starts, ends - starts, 8)
+        self.assertEqual(np.where(valid, values, 0).tolist(), [10125000000, -5000000, 50000000, 500000000, 0, 0, 0, 2 ** 63 - 1, 0, 0, 0])
+        values, valid = ColumnarDecoder.parse_scaled(region, starts, ends - starts, 9)
+        self.assertEqual(np.where(valid, values, 0).tolist()[-2:], [1, 1])
+
+        # the int64 range of the generated decoders, the values longer than MAX_DIGITS digits, a sign and a point are null
+        for scale, value, expected in test_rust_generator.Testing_RustGenerator.PARSED_SCALED:
+            region = np.frombuffer(f'{value}|'.encode(), dtype=np.uint8)
+            values, valid = ColumnarDecoder.parse_scaled(region, np.array([0]), np.array([len(value)]), scale)
+            self.assertEqual(int(values[0]) if valid[0] else None, expected if len(value) <= MAX_DIGITS + 2 else None, value)
+        region = np.frombuffer(b'9223372036854775807|9223372036854775808|', dtype=np.uint8)
+        values, valid = ColumnarDecoder.parse_unsigned(region, np.array([0, 20]), np.array([19, 19]))
+        self.assertEqual((values[0], valid.tolist()), (2 ** 63 - 1, [True, False]))
+
+        region = np.frombuffer(b'20240229-23:59:60.999|19691231-23:59:59.999999999|20250102|20250230-10:00:00|20250102-10:00:00.12|', dtype=np.uint8)
+        ends = np.flatnonzero(region == ord('|'))
+        starts = np.concatenate([[0], ends[:-1] + 1])
+        values, valid = ColumnarDecoder.parse_timestamp(region, starts, ends - starts)
+        self.assertEqual(np.where(valid, values, 0).tolist(), [1709251200999000000, -1, 1735776000000000000, 0, 0])
+
+    def test_DataFields(self):
+        # the payload holds SOH and text looking like a message
+        payload = '<x>|10=000|8=FIX.4.4|9=5|</x>'
+        logon = self.frame(f'35=A|34=1|49=S|52=20250102-10:00:00|56=T|98=0|95={len(payload)}|96={payload}|108=30|')
+        log = logon + self.frame('35=A|34=2|49=S|52=20250102-10:00:01|56=T|98=0|108=60|')
+        rows = ColumnarDecoder(self.schema('resources/FIX44_Data.xml')).decode(log)['A']
+        self.assertEqual(rows['MsgSeqNum'].tolist(), [1, 2])
+        self.assertEqual(rows['HeartBtInt'].tolist(), [30, 60])
+        self.assertEqual(ColumnarDecoder.slice_value(log, rows['RawData'][0]), payload.replace('|', '\x01').encode())
+        self.assertIsNone(ColumnarDecoder.slice_value(log, rows['RawData'][1]))
+
+if __name__ == '__main__':
+    unittest.main()
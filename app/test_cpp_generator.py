@@ -0,0 +1,634 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from typing import List
+from app.definition_helper import *
+from app.generation.cpp import Generator
+from app.generator import GeneratorBase, GeneratorOptions
+from app.stream_parser import *
+
+class Testing_CppGenerator(unittest.TestCase):
+
+    NEW_ORDER_SINGLE = '8=FIX.4.4|9=100|35=D|34=7|49=SENDER|56=TARGET|52=20250102-10:00:00.123|453=2|448=TRADER1|447=D|452=12|448=FIRM2|447=D|452=1|55=BOND|48=DE0001|22=4|9999=custom|11=ORDER-000001|38=1500|40=2|44=101.25|54=1|10=123|'
+
+    VIEW_DRIVER = r'''
+#include <cstdio>
+#include <algorithm>
+#include <cstddef>
+#include <new>
+#include <string>
+#include <vector>
+#include "fix44/messages.h"
+
+static std::size_t allocations = 0;
+
+// the allocations come from a static arena never freed, operator delete does not free a pointer returned by
+// operator new
+alignas(std::max_align_t) static unsigned char arena[1 << 20];
+static std::size_t arena_used = 0;
+
+void* operator new(std::size_t size)
+{
+    ++allocations;
+    const std::size_t aligned = (size + alignof(std::max_align_t) - 1) / alignof(std::max_align_t) * alignof(std::max_align_t);
+    if (aligned > sizeof(arena) - arena_used) {
+        throw std::bad_alloc();
+    }
+    void* result = arena + arena_used;
+    arena_used += aligned;
+    return result;
+}
+
+void* operator new[](std::size_t size) { return operator new(size); }
+void operator delete(void*) noexcept {}
+void operator delete(void*, std::size_t) noexcept {}
+void operator delete[](void*) noexcept {}
+void operator delete[](void*, std::size_t) noexcept {}
+
+int main()
+{
+    std::vector<char> buffer;
+    for (const char* character = "@MESSAGE@"; *character != 0; ++character) {
+        buffer.push_back(*character == '|' ? '\001' : *character);
+    }
+    const std::vector<char> original = buffer;
+    const std::size_t before = allocations;
+
+    fix44::NewOrderSingleView view;
+    const bool decoded = view.decode(buffer.data(), buffer.data() + buffer.size());
+    std::printf("decoded %d %d\n", decoded, view.size() == buffer.size());
+    std::printf("cl_ord_id %.*s\n", static_cast<int>(view.cl_ord_id().size()), view.cl_ord_id().data());
+    std::printf("msg_seq_num %lld\n", static_cast<long long>(view.msg_seq_num()));
+    const std::string_view side = fix44::enum_value(*view.side());
+    std::printf("order_qty %lld price %lld side %.*s %d %d\n", static_cast<long long>(view.order_qty()), static_cast<long long>(view.price()), static_cast<int>(side.size()), side.data(),
+                view.side() == fix44::Side::Buy, view.ord_type() == fix44::OrdType::Limit);
+    std::printf("has_price %d has_stop_px %d\n", view.has_price(), view.has_stop_px());
+    std::printf("parties %zu\n", view.no_party_ids().size());
+    for (const fix44::NoPartyIDsEntry& party : view.no_party_ids()) {
+        const std::string_view role = fix44::enum_value(party.party_role().value_or(fix44::PartyRole::ExecutingFirm));
+        std::printf("party %.*s %.*s %d\n", static_cast<int>(party.party_id().size()), party.party_id().data(), static_cast<int>(role.size()), role.data(),
+                    party.party_role() == fix44::PartyRole::ExecutingTrader);
+    }
+    std::printf("symbol %.*s\n", static_cast<int>(view.symbol().size()), view.symbol().data());
+    std::printf("required %d %u\n", view.has_required_fields(), view.missing_required_tag());
+    std::printf("allocations %zu\n", allocations - before);
+
+    fix44::Materialized<fix44::NewOrderSingleView> kept = view.materialize();
+    std::fill(buffer.begin(), buffer.end(), 'X');
+    fix44::Materialized<fix44::NewOrderSingleView> copy = kept;
+    std::printf("materialized %.*s %zu\n", static_cast<int>(copy->cl_ord_id().size()), copy->cl_ord_id().data(), copy->no_party_ids().size());
+    for (const fix44::NoPartyIDsEntry& party : kept->no_party_ids()) {
+        std::printf("party %.*s\n", static_cast<int>(party.party_id().size()), party.party_id().data());
+    }
+
+    std::printf("enums %d %d %d %d %d\n", fix44::parse_enum<fix44::MsgType>("UCZ") == fix44::MsgType::UserPartyEntitlementsUpdateReport, fix44::parse_enum<fix44::MsgType>("UC").has_value(),
+                fix44::parse_enum<fix44::ExecType>("F") == fix44::ExecType::Trade, fix44::parse_enum<fix44::ExecType>("X").has_value(),
+                fix44::enum_value(fix44::BeginString::Version44) == "FIX.4.4");
+
+    std::printf("kinds %d %d %d %d %d\n", fix44::message_kind("D") == fix44::MessageKind::NewOrderSingle, fix44::message_kind("UCL") != fix44::MessageKind::Unknown,
+                fix44::message_kind("UC") == fix44::MessageKind::Unknown, fix44::message_kind("") == fix44::MessageKind::Unknown,
+                fix44::message_kind("UCLUCLUCL") == fix44::MessageKind::Unknown);
+    const bool visited = fix44::visit_message(original.data(), original.data() + original.size(), [](const auto& message) {
+        std::printf("visited %.*s %zu\n", static_cast<int>(message.msg_type_value.size()), message.msg_type_value.data(), message.field_count);
+    });
+    std::printf("visit %d\n", visited);
+
+    const std::string partial = "35=D\00134=7\001453=1\001448=TRADER1\001";
+    view.decode(partial.data(), partial.data() + partial.size());
+    std::printf("partial %d %u %d", view.has_required_fields(), view.missing_required_tag(), view.has_msg_seq_num());
+    for (const fix44::NoPartyIDsEntry& party : view.no_party_ids()) {
+        std::printf(" %d %u", party.has_required_fields(), party.missing_required_tag());
+    }
+    std::printf("\n");
+
+    fix44::FastPathStats stats;
+    fix44::CounterpartyStats counterparties;
+    view.decode(original.data(), original.data() + original.size(), stats);
+    counterparties.record(view.sender_comp_id(), stats);
+    stats = fix44::FastPathStats();
+    view.decode(original.data(), original.data() + original.size(), stats);
+    counterparties.record(view.sender_comp_id(), stats);
+    const fix44::FastPathStats& sender = counterparties.by_counterparty().at("SENDER");
+    std::printf("fast path %llu %llu %zu %llu %llu\n", static_cast<unsigned long long>(stats.hits), static_cast<unsigned long long>(stats.misses),
+        counterparties.by_counterparty().size(), static_cast<unsigned long long>(sender.messages), static_cast<unsigned long long>(sender.hits));
+
+    const std::string malformed = "35=D\00134=7\0013x=1\001";
+    const bool malformed_decoded = view.decode(malformed.data(), malformed.data() + malformed.size());
+    std::printf("malformed %d %zu\n", malformed_decoded, view.error_offset());
+    return 0;
+}
+'''
+
+    FRAMER_DRIVER = r'''
+#include <cstdio>
+#include <cstring>
+#include <string>
+#include "fix44/framer.h"
+
+int main()
+{
+    std::string stream;
+    for (const char* character = "@STREAM@"; *character != 0; ++character) {
+        stream.push_back(*character == '|' ? '\001' : *character);
+    }
+
+    fix44::Framer framer;
+    const char* cursor = stream.data();
+    std::printf("contiguous");
+    while (framer.feed(cursor, stream.data() + stream.size()) == fix44::FrameStatus::Complete) {
+        std::printf(" %u", framer.length());
+    }
+    std::printf(" %zu\n", static_cast<std::size_t>(cursor - stream.data()));
+
+    // received 7 bytes at a time in a ring smaller than the stream, the messages wrap around its end
+    char storage[256];
+    fix44::RingBuffer ring(storage, sizeof(storage));
+    fix44::Framer resumed;
+    std::size_t received = 0;
+    std::string framed;
+    int wrapped = 0;
+    while (received < stream.size()) {
+        const std::size_t count = std::min<std::size_t>({ring.writable(), std::size_t{7}, stream.size() - received});
+        std::memcpy(ring.write_begin(), stream.data() + received, count);
+        ring.commit(count);
+        received += count;
+        fix44::Frame frame;
+        while (ring.next_frame(resumed, frame) == fix44::FrameStatus::Complete) {
+            framed.append(ring.first_part(frame)).append(ring.second_part(frame));
+            wrapped += ring.second_part(frame).empty() ? 0 : 1;
+            ring.release(frame);
+        }
+    }
+    std::printf("ring %d %d\n", framed == stream, wrapped);
+
+    std::string corrupted = stream;
+    corrupted[30] = static_cast<char>(corrupted[30] + 1);
+    cursor = corrupted.data();
+    fix44::Framer checked;
+    const fix44::FrameStatus status = checked.feed(cursor, corrupted.data() + corrupted.size());
+    std::printf("corrupted %d %zu\n", static_cast<int>(status), static_cast<std::size_t>(cursor - corrupted.data()));
+
+    const std::string bad_length = "8=FIX.4.4\0019=1x";
+    cursor = bad_length.data();
+    fix44::Framer length_checked;
+    const fix44::FrameStatus length_status = length_checked.feed(cursor, bad_length.data() + bad_length.size());
+    std::printf("bad length %d %zu\n", static_cast<int>(length_status), static_cast<std::size_t>(cursor - bad_length.data()));
+    return 0;
+}
+'''
+
+    @staticmethod
+    def frame(body: str) -> str:
+        ''' the message with BeginString, BodyLength and CheckSum, the fields separated by | '''
+        head = f'8=FIX.4.4|9={len(body)}|'
+        checksum = sum((head + body).replace('|', '\x01').encode('latin-1')) % 256
+        return f'{head}{body}10={checksum:03}|'
+
+    @staticmethod
+    def compile_and_run(schema_path: str, driver: str, options: GeneratorOptions = GeneratorOptions()) -> List[str]:
+        ''' the lines printed by the driver compiled with the package generated from the schema '''
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file(schema_path).get_schema(None))
+        with tempfile.TemporaryDirectory() as directory:
+            Generator(directory).generate(schema_definition, options)
+            with open(os.path.join(directory, 'main.cpp'), 'w') as driver_file:
+                driver_file.write(driver)
+            executable = os.path.join(directory, 'main')
+            subprocess.run(['g++', '-std=c++17', '-O1', '-Wall', '-Werror', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+            return subprocess.run([executable], check=True, capture_output=True, text=True).stdout.splitlines()
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_Framer(self):
+        messages = [self.frame(f'35=D|34={sequence}|49=SENDER|56=TARGET|11=ORDER-{sequence:06}|55=BOND|' + 'x' * (sequence * 13) + '|') for sequence in range(1, 9)]
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.FRAMER_DRIVER.replace('@STREAM@', ''.join(messages)))
+        self.assertEqual(output, [
+            'contiguous ' + ' '.join(str(len(message)) for message in messages) + f' {len("".join(messages))}',
+            'ring 1 4',
+            'corrupted 2 ' + str(len(messages[0]) - 1),
+            'bad length 2 13',
+        ])
+
+    ENCODER_DRIVER = r'''
+#include <cstdio>
+#include <string>
+#include "fix44/encoder.h"
+#include "fix44/framer.h"
+#include "fix44/messages.h"
+
+static void print(const char* label, std::string_view bytes)
+{
+    std::printf("%s ", label);
+    for (char character : bytes) {
+        std::putchar(character == fix44::SOH ? '|' : character);
+    }
+    std::printf("\n");
+}
+
+int main()
+{
+    char buffer[512];
+    fix44::NewOrderSingleEncoder order(buffer, sizeof(buffer), "FIX.4.4");
+    for (int sequence = 1; sequence <= 2; ++sequence) {
+        order.start().msg_seq_num(sequence).sender_comp_id("SENDER").sending_time(fix44::Timestamp{1735812000000000000, 3}).target_comp_id("TARGET");
+        order.no_party_ids(2)
+            .party_id("P1").party_id_source(fix44::PartyIDSource::ShortCodeIdentifier).party_role(fix44::PartyRole::ClientId)
+            .party_id("P2").party_id_source(fix44::PartyIDSource::ShortCodeIdentifier).party_role(fix44::PartyRole::ExecutingFirm);
+        order.symbol("BOND").cl_ord_id("ORDER-1").order_qty(15000000).ord_type(fix44::OrdType::Limit)
+            .price(-1012500000).side(fix44::Side::Sell).trade_at_close_opt_in(true);
+    }
+    const std::string_view message = order.finish();
+    print("message", message);
+
+    fix44::Framer framer;
+    const char* cursor = message.data();
+    const fix44::FrameStatus status = framer.feed(cursor, message.data() + message.size());
+    fix44::NewOrderSingleView view;
+    const bool decoded = view.decode(message.data(), message.data() + message.size());
+    std::printf("framed %d %u decoded %d %d %lld %zu\n", static_cast<int>(status), framer.length(), decoded, view.has_required_fields(), static_cast<long long>(view.price()),
+                view.no_party_ids().size());
+
+    char digits[48];
+    for (const fix44::Decimal value : {fix44::Decimal{-5, 3}, fix44::Decimal{123, 2}, fix44::Decimal{42, 0}, fix44::Decimal{100, 2}, fix44::Decimal{INT64_MIN, 18}}) {
+        print("decimal", std::string_view(digits, static_cast<std::size_t>(fix44::detail::write_decimal(digits, value) - digits)));
+    }
+    print("int", std::string_view(digits, static_cast<std::size_t>(fix44::detail::write_int(digits, INT64_MIN) - digits)));
+
+    char small[64];
+    fix44::HeartbeatEncoder heartbeat(small, sizeof(small), "FIX.4.4");
+    heartbeat.start().msg_seq_num(1).sender_comp_id("SENDER").target_comp_id("TARGET");
+    const std::size_t heartbeat_length = heartbeat.finish().size();
+    heartbeat.start().msg_seq_num(2).sender_comp_id("A_SENDER_FAR_TOO_LONG_FOR_THE_BUFFER").target_comp_id("TARGET");
+    std::printf("small %zu %zu %d\n", heartbeat_length, heartbeat.finish().size(), heartbeat.overflow());
+    return 0;
+}
+'''
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_Encoder(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.ENCODER_DRIVER)
+        message = self.frame('35=D|34=2|49=SENDER|52=20250102-10:00:00.000|56=TARGET|453=2|448=P1|447=P|452=3|448=P2|447=P|452=1|'
+                             '55=BOND|11=ORDER-1|38=1500|40=2|44=-10.125|54=2|30625=Y|')
+        self.assertEqual(output, [
+            f'message {message}',
+            f'framed 0 {len(message)} decoded 1 0 -1012500000 2',
+            'decimal -0.005',
+            'decimal 1.23',
+            'decimal 42',
+            'decimal 1.00',
+            'decimal -9.223372036854775808',
+            'int -9223372036854775808',
+            f'small {len(self.frame("35=0|34=1|49=SENDER|56=TARGET|"))} 0 1',
+        ])
+
+    SESSION_HEADER_DRIVER = r'''
+#include <cstdio>
+#include <string>
+#include "fix44/encoder.h"
+#include "fix44/messages.h"
+
+static void print(const char* label, std::string_view bytes)
+{
+    std::printf("%s ", label);
+    for (char character : bytes) {
+        std::putchar(character == fix44::SOH ? '|' : character);
+    }
+    std::printf("\n");
+}
+
+int main()
+{
+    fix44::SessionHeader header;
+    header.sender_comp_id("SENDER").target_comp_id("TARGET");
+    print("template", header.bytes());
+
+    char buffer[512];
+    fix44::NewOrderSingleEncoder order(buffer, sizeof(buffer), "FIX.4.4");
+    std::string_view message;
+    for (std::uint64_t sequence = 7; sequence <= 8; ++sequence) {
+        order.start(header, sequence, "20250102-10:00:00.00" + std::to_string(sequence)).symbol("BOND").cl_ord_id("ORDER-1").side(fix44::Side::Buy);
+        message = order.finish();
+        print("order", message);
+    }
+    fix44::NewOrderSingleView view;
+    const bool decoded = view.decode(message.data(), message.data() + message.size());
+    std::printf("decoded %d %lld\n", decoded, static_cast<long long>(view.msg_seq_num()));
+
+    char heartbeat_buffer[256];
+    fix44::HeartbeatEncoder heartbeat(heartbeat_buffer, sizeof(heartbeat_buffer), "FIX.4.4");
+    heartbeat.start(header, 9, "20250102-10:00:01.000");
+    print("heartbeat", heartbeat.finish());
+
+    header.poss_dup_flag(true);
+    order.start(header, 10, "20250102-10:00:02.000").symbol("BOND");
+    print("modified", order.finish());
+    order.start().msg_seq_num(11).symbol("BOND");
+    print("plain", order.finish());
+
+    order.start(header, 1000000000, "20250102-10:00:03.000");
+    const std::size_t sequence_length = order.finish().size();
+    order.start(header, 12, "20250102-10:00:03");
+    const std::size_t time_length = order.finish().size();
+    std::printf("slots %zu %zu %d\n", sequence_length, time_length, order.overflow());
+    return 0;
+}
+'''
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_SessionHeader(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.SESSION_HEADER_DRIVER)
+        self.assertEqual(output, [
+            'template 34=000000000|52=000000000000000000000|49=SENDER|56=TARGET|',
+            'order ' + self.frame('35=D|34=000000007|52=20250102-10:00:00.007|49=SENDER|56=TARGET|55=BOND|11=ORDER-1|54=1|'),
+            'order ' + self.frame('35=D|34=000000008|52=20250102-10:00:00.008|49=SENDER|56=TARGET|55=BOND|11=ORDER-1|54=1|'),
+            'decoded 1 8',
+            'heartbeat ' + self.frame('35=0|34=000000009|52=20250102-10:00:01.000|49=SENDER|56=TARGET|'),
+            'modified ' + self.frame('35=D|34=000000010|52=20250102-10:00:02.000|49=SENDER|56=TARGET|43=Y|55=BOND|'),
+            'plain ' + self.frame('35=D|34=11|55=BOND|'),
+            'slots 0 0 1',
+        ])
+
+    TIMESTAMP_DRIVER = r'''
+#include <cstdio>
+#include <string>
+#include "fix44/encoder.h"
+
+int main()
+{
+    for (const char* value : {"20250102-10:00:00", "20250102-10:00:00.123", "20250102-10:00:00.123456", "20250102-10:00:00.123456789",
+                              "20240229-23:59:60.999", "19691231-23:59:59.999", "16780101-00:00:00", "22611231-23:59:59.999999999", "20250102",
+                              "20250230-10:00:00", "20250102-24:00:00", "20250102 10:00:00", "20250102-10:00:00.12", "2025010x-10:00:00"}) {
+        std::printf("parsed %s %lld\n", value, static_cast<long long>(fix44::detail::to_timestamp(value)));
+    }
+
+    fix44::detail::TimestampCache cache;
+    char text[32];
+    for (const fix44::Timestamp value : {fix44::Timestamp{1735812000123456789, 3}, fix44::Timestamp{1735812000123456789, 6}, fix44::Timestamp{1735812000123456789, 9},
+                                         fix44::Timestamp{1735812000987000000, 0}, fix44::Timestamp{1735812001000000000, 3}, fix44::Timestamp{-1, 9},
+                                         fix44::Timestamp{1709251199999000000, 3}}) {
+        const std::string_view formatted(text, static_cast<std::size_t>(fix44::detail::write_timestamp(text, value, cache) - text));
+        std::printf("formatted %.*s %d\n", static_cast<int>(formatted.size()), formatted.data(), fix44::detail::to_timestamp(formatted) == value.nanoseconds);
+    }
+    fix44::detail::write_date(text, -1);
+    std::printf("date %.8s\n", text);
+    return 0;
+}
+'''
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_Timestamp(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.TIMESTAMP_DRIVER)
+        self.assertEqual(output, [f'parsed {value} {nanoseconds}' for value, nanoseconds in self.PARSED_TIMESTAMPS] + [
+            f'formatted {value} {int(exact)}' for value, exact in self.FORMATTED_TIMESTAMPS] + ['date 19691231'])
+
+    # the values parsed by the generated decoders and the nanoseconds since the epoch, 0 for a malformed value
+    PARSED_TIMESTAMPS = [
+        ('20250102-10:00:00', 1735812000000000000),
+        ('20250102-10:00:00.123', 1735812000123000000),
+        ('20250102-10:00:00.123456', 1735812000123456000),
+        ('20250102-10:00:00.123456789', 1735812000123456789),
+        ('20240229-23:59:60.999', 1709251200999000000),
+        ('19691231-23:59:59.999', -1000000),
+        ('16780101-00:00:00', -9214560000000000000),
+        ('22611231-23:59:59.999999999', 9214646399999999999),
+        ('20250102', 1735776000000000000),
+        ('20250230-10:00:00', 0),
+        ('20250102-24:00:00', 0),
+        ('20250102 10:00:00', 0),
+        ('20250102-10:00:00.12', 0),
+        ('2025010x-10:00:00', 0),
+    ]
+
+    # the values written by the generated encoders, true when they parse back to the same nanoseconds
+    FORMATTED_TIMESTAMPS = [
+        ('20250102-10:00:00.123', False),
+        ('20250102-10:00:00.123456', False),
+        ('20250102-10:00:00.123456789', True),
+        ('20250102-10:00:00', False),
+        ('20250102-10:00:01.000', True),
+        ('19691231-23:59:59.999999999', True),
+        ('20240229-23:59:59.999', True),
+    ]
+
+    SCALED_DRIVER = r'''
+#include <cstdio>
+#include <string>
+#include <utility>
+#include "fix44/encoder.h"
+
+template <unsigned Scale>
+static void parse(const char* value)
+{
+    std::printf("parsed %u %s %lld\n", Scale, value, static_cast<long long>(fix44::detail::to_scaled<Scale>(value)));
+}
+
+int main()
+{
+@PARSE@
+    char text[32];
+    for (const auto& [value, scale] : {@FORMAT@}) {
+        std::printf("formatted %lld %u %s\n", static_cast<long long>(value), scale,
+                    std::string(text, static_cast<std::size_t>(fix44::detail::write_scaled(text, value, scale) - text)).c_str());
+    }
+    return 0;
+}
+'''
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_Scaled(self):
+        parse = '\n'.join(f'    parse<{scale}>("{value}");' for scale, value, _ in self.PARSED_SCALED)
+        format = ', '.join(f'std::pair<std::int64_t, unsigned>{{{value if value != -2 ** 63 else "INT64_MIN"}, {scale}}}' for value, scale, _ in self.FORMATTED_SCALED)
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.SCALED_DRIVER.replace('@PARSE@', parse).replace('@FORMAT@', format))
+        self.assertEqual(output, [f'parsed {scale} {value} {scaled or 0}' for scale, value, scaled in self.PARSED_SCALED] + [
+            f'formatted {value} {scale} {text}' for value, scale, text in self.FORMATTED_SCALED])
+
+    # scale, value, the int64 parsed by the generated decoders or None for a malformed or out of range value
+    PARSED_SCALED = [
+        (8, '92233720368.54775807', 2 ** 63 - 1),
+        (8, '-92233720368.54775808', -2 ** 63),
+        (8, '92233720368.54775808', None),
+        (8, '-92233720368.54775809', None),
+        (8, '92233720369', None),
+        (0, '9223372036854775807', 2 ** 63 - 1),
+        (0, '-9223372036854775808', -2 ** 63),
+        (0, '9223372036854775808', None),
+        (0, '12.000', 12),
+        (0, '12.5', None),
+        (18, '9.223372036854775807', 2 ** 63 - 1),
+        (18, '-9.223372036854775808', -2 ** 63),
+        (18, '10', None),
+        (2, '101.25', 10125),
+        (2, '101.250000', 10125),
+        (2, '101.251', None),
+        (2, '-0.05', -5),
+        (2, '.5', 50),
+        (2, '5.', 500),
+        (2, '000000000000000000000001.5', 150),
+        (4, '12345678901234567890', None),
+        (2, '1.2.3', None),
+        (2, '', None),
+        (2, '-', None),
+        (2, '.', None),
+        (2, '1e5', None),
+        (2, '+1', None),
+    ]
+
+    # value, scale, the text written by the generated encoders
+    FORMATTED_SCALED = [
+        (2 ** 63 - 1, 8, '92233720368.54775807'),
+        (-2 ** 63, 8, '-92233720368.54775808'),
+        (-2 ** 63, 0, '-9223372036854775808'),
+        (2 ** 63 - 1, 18, '9.223372036854775807'),
+        (-5, 2, '-0.05'),
+        (10125000000, 8, '101.25'),
+        (0, 8, '0'),
+        (100, 2, '1'),
+        (-1012500000, 8, '-10.125'),
+    ]
+
+    DATA_DRIVER = r'''
+#include <cstdio>
+#include <string>
+#include "fix44/messages.h"
+
+static std::string stream(const char* text)
+{
+    std::string result;
+    for (const char* character = text; *character != 0; ++character) {
+        result.push_back(*character == '|' ? '\001' : *character);
+    }
+    return result;
+}
+
+struct Handler
+{
+    int fields = 0;
+    std::string_view raw_data;
+
+    template <int Index>
+    void on_field(std::string_view value)
+    {
+        ++fields;
+        if (Index == 10) {
+            raw_data = value;
+        }
+    }
+
+    void on_unknown_field(std::string_view, std::string_view) { ++fields; }
+};
+
+int main()
+{
+    const std::string logon = stream("@LOGON@");
+    fix44::LogonView view;
+    const bool decoded = view.decode(logon.data(), logon.data() + logon.size());
+    std::printf("logon %d %zu %lld %lld\n", decoded, view.raw_data().size(), static_cast<long long>(view.heart_bt_int()), static_cast<long long>(view.signature_length()));
+    std::printf("payload %d\n", view.raw_data() == stream("@PAYLOAD@"));
+
+    Handler handler;
+    const char* cursor = logon.data();
+    const bool handled = fix44::dispatch::Logon::decode(cursor, logon.data() + logon.size(), handler);
+    std::printf("handler %d %d %d\n", handled, handler.fields, handler.raw_data == view.raw_data());
+
+    const std::string news = stream("@NEWS@");
+    fix44::NewsView news_view;
+    std::printf("news %d", news_view.decode(news.data(), news.data() + news.size()));
+    for (const fix44::NoLinesOfTextEntry& line : news_view.no_lines_of_text()) {
+        std::printf(" %.*s:%zu", static_cast<int>(line.text().size()), line.text().data(), line.encoded_text().size());
+    }
+    std::printf(" %.*s\n", static_cast<int>(news_view.signature().size()), news_view.signature().data());
+
+    const std::string short_length = stream("35=A|98=0|95=3|96=ab|cd|108=30|");
+    const bool short_decoded = view.decode(short_length.data(), short_length.data() + short_length.size());
+    std::printf("short length %d %zu\n", short_decoded, view.error_offset());
+    const std::string missing_length = stream("35=A|98=0|96=ab|108=30|");
+    const bool missing_decoded = view.decode(missing_length.data(), missing_length.data() + missing_length.size());
+    std::printf("missing length %d %zu\n", missing_decoded, view.error_offset());
+    return 0;
+}
+'''
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_DataFields(self):
+        # the payloads hold SOH and text looking like the next field
+        payload = '<x>|10=000|</x>'
+        logon = f'8=FIX.4.4|9=0|35=A|34=1|49=S|52=20250102-10:00:00|56=T|98=0|95={len(payload)}|96={payload}|108=30|93=3|89=S|G|10=000|'
+        lines = ['58=first|354=5|355=58=x||', '58=second|', '58=third|354=1|355=||']
+        news = f'35=B|148=headline|33=3|{"".join(lines)}93=4|89=sign|'
+        driver = self.DATA_DRIVER.replace('@LOGON@', logon).replace('@PAYLOAD@', payload).replace('@NEWS@', news)
+        for dispatch in ['auto', 'trie']:
+            output = self.compile_and_run('resources/FIX44_Data.xml', driver, GeneratorOptions(dispatch=dispatch))
+            self.assertEqual(output, [
+                f'logon 1 {len(payload)} 30 3',
+                'payload 1',
+                'handler 1 14 1',
+                'news 1 first:5 second:0 third:1 sign',
+                'short length 0 15',
+                'missing length 0 10',
+            ], dispatch)
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_MessageView(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.VIEW_DRIVER.replace('@MESSAGE@', self.NEW_ORDER_SINGLE))
+        self.assertEqual(output, [
+            'decoded 1 1',
+            'cl_ord_id ORDER-000001',
+            'msg_seq_num 7',
+            'order_qty 15000000 price 10125000000 side 1 1 1',
+            'has_price 1 has_stop_px 0',
+            'parties 2',
+            'party TRADER1 12 1',
+            'party FIRM2 1 0',
+            'symbol BOND',
+            'required 0 454',
+            'allocations 0',
+            'materialized ORDER-000001 2',
+            'party TRADER1',
+            'party FIRM2',
+            'enums 1 0 1 0 1',
+            'kinds 1 1 1 1 1',
+            'visited D 49',
+            'visit 1',
+            'partial 0 8 1 0 447',
+            'fast path 8 10 1 2 16',
+            'malformed 0 10',
+        ])
+
+    def test_AccessorNames(self):
+        self.assertEqual(Generator.accessor_name('NoPartyIDs'), 'no_party_ids')
+        self.assertEqual(Generator.accessor_name('SecurityIDSource'), 'security_id_source')
+        self.assertEqual(Generator.accessor_name('Default'), 'default_')
+        self.assertEqual([group['name'] for group in GeneratorBase.groups_in_dependency_order([
+            {'name': 'NoOuter', 'fields_by_order': [{'token': 'group', 'name': 'NoInner'}]},
+            {'name': 'NoInner', 'fields_by_order': [{'token': 'field', 'name': 'Field'}]},
+        ])], ['NoInner', 'NoOuter'])
+
+    def test_TagPrefix(self):
+        self.assertEqual(GeneratorBase.tag_prefix(35), (int.from_bytes(b'35=', 'little'), 3))
+        self.assertEqual(GeneratorBase.tag_prefix(1234567), (int.from_bytes(b'1234567=', 'little'), 8))
+        self.assertEqual(GeneratorBase.tag_prefix(12345678), (0xFFFFFFFFFFFFFFFF, 8))
+
+    def test_EncoderDefinition(self):
+        ir = GeneratorBase.make_ir(DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file("resources/FIX44_Data.xml").get_schema(None)))
+        fields = {field['name']: field for field in ir['fields']}
+        framing = GeneratorBase.make_framing_definition(ir['header'], ir['trailer'])
+        logon = GeneratorBase.make_encoder_definition(ir['messages'][0], fields, framing)
+        # the framing fields and MsgType are written by the encoder, a LENGTH field with its DATA field
+        self.assertEqual([(field['name'], field['kind']) for field in logon['fields']], [
+            ('MsgSeqNum', 'int'), ('SenderCompID', 'string'), ('SendingTime', 'timestamp'), ('TargetCompID', 'string'),
+            ('EncryptMethod', 'int'), ('HeartBtInt', 'int'), ('RawData', 'data'), ('Signature', 'data')])
+        self.assertEqual(logon['fields'][6]['length']['name'], 'RawDataLength')
+        self.assertEqual(GeneratorBase.encoded_prefix(35), {'bytes': int.from_bytes(b'35=', 'little'), 'length': 3, 'sum': sum(b'35=')})
+        with self.assertRaises(Exception):
+            GeneratorBase.encoded_prefix(12345678)
+
+    def test_FramingDefinition(self):
+        header = [{'fields_by_order': [{'token': 'field', 'id': 8}, {'token': 'field', 'id': 9}, {'token': 'field', 'id': 35}]}]
+        trailer = [{'fields_by_order': [{'token': 'field', 'id': 93}, {'token': 'field', 'id': 10}]}]
+        self.assertEqual(GeneratorBase.make_framing_definition(header, trailer), {'begin_string': 8, 'body_length': 9, 'checksum': 10})
+        self.assertEqual(GeneratorBase.make_framing_definition([], trailer), None)
+        with self.assertRaises(Exception):
+            GeneratorBase.make_framing_definition([{'fields_by_order': [{'token': 'field', 'id': 8}]}], trailer)
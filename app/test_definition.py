@@ -2,6 +2,8 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from helpers import UniqueKeysDict
+import os
+import tempfile
 import unittest
 from app.definition_helper import *
 from app.schema import *
@@ -33,6 +35,19 @@ class Testing_Definition(unittest.TestCase):
         self.assertEqual(result.primitive_type, 'int')
         self.assertEqual(result.is_enum, False)
         
+    def test_field_def_timestamp(self):
+        for field_type in ["UTCTIMESTAMP", "LOCALMKTDATE"]:
+            field_value = Field(
+                name = "TestName",
+                number = 1234,
+                field_type = field_type,
+                value_by_description = [],
+            )
+
+            result = DefinitionHelper.get_field_def(field_value)
+            self.assertEqual(result.type, field_type)
+            self.assertEqual(result.primitive_type, 'timestamp')
+
     def test_field_def_enum(self):
         value_desc_dict = UniqueKeysDict()
         value_desc_dict["TestEnum1"] = Field_Value(enum = "TestEnum1", description = "TestEnum1Desc")
@@ -589,3 +604,167 @@ class Testing_Definition(unittest.TestCase):
 
         result_component_definition = DefinitionHelper.generate_component_definition(components_dict, fields_dict)
         result_group_definition = DefinitionHelper.generate_group_definition(components_dict, messages_dict, fields_dict, result_component_definition)
+
+    def test_generate_component_definition_any_order(self):
+        xml_ref = '\
+<fix major="4" minor="2">\
+    <components>\
+        <component name="Instrument">\
+            <field name="Symbol" required="Y" />\
+            <component name="SecAltIDGrp" required="Y" />\
+        </component>\
+        <component name="SecAltIDGrp">\
+            <field name="SecurityID" required="N" />\
+            <component name="PartyGrp" required="N" />\
+        </component>\
+        <component name="PartyGrp">\
+            <group name="NoPartyIDs" required="Y">\
+                <field name="PartyID" required="Y" />\
+            </group>\
+        </component>\
+    </components>\
+    <fields>\
+        <field number="55" name="Symbol" type="STRING"/>\
+        <field number="48" name="SecurityID" type="STRING"/>\
+        <field number="453" name="NoPartyIDs" type="NUMINGROUP"/>\
+        <field number="448" name="PartyID" type="STRING"/>\
+    </fields>\
+</fix>\
+'
+        parser_result = Parser.from_string(xml_ref)
+        fields_dict = parser_result.get_fields()
+        components_dict = parser_result.get_components(fields_dict)
+
+        self.assertEqual(DefinitionHelper.sort_components(components_dict), ["PartyGrp", "SecAltIDGrp", "Instrument"])
+
+        result = DefinitionHelper.generate_component_definition(components_dict, fields_dict)
+        self.assertEqual(list(result), ["Instrument", "SecAltIDGrp", "PartyGrp"])
+        self.assertEqual(list(result["Instrument"].fields), ["Symbol", "SecurityID", "NoPartyIDs"])
+        self.assertEqual(result["SecAltIDGrp"].fields["NoPartyIDs"].required_group, False)
+        self.assertEqual(result["Instrument"].fields["NoPartyIDs"].required_group, True)
+
+        # every reference with the same required flag shares the flattened fields
+        reference = MessageComponent(name = "Instrument", required = True)
+        fields_in_component = DefinitionHelper.get_fields_in_component(reference, result)
+        self.assertIs(fields_in_component, DefinitionHelper.get_fields_in_component(reference, result))
+        self.assertEqual(fields_in_component["NoPartyIDs"].required_group, True)
+        with self.assertRaises(TypeError):
+            fields_in_component["Symbol"] = None
+
+    def test_sort_components_cycle(self):
+        xml_ref = '\
+<fix major="4" minor="2">\
+    <components>\
+        <component name="A">\
+            <component name="B" required="Y" />\
+        </component>\
+        <component name="B">\
+            <field name="Symbol" required="Y" />\
+            <component name="C" required="Y" />\
+        </component>\
+        <component name="C">\
+            <component name="A" required="Y" />\
+        </component>\
+    </components>\
+    <fields>\
+        <field number="55" name="Symbol" type="STRING"/>\
+    </fields>\
+</fix>\
+'
+        parser_result = Parser.from_string(xml_ref)
+        fields_dict = parser_result.get_fields()
+        components_dict = parser_result.get_components(fields_dict)
+        with self.assertRaisesRegex(Exception, 'cyclic component definition "A -> B -> C -> A"'):
+            DefinitionHelper.generate_component_definition(components_dict, fields_dict)
+        with self.assertRaisesRegex(Exception, 'undefined component "D" used in "C"'):
+            DefinitionHelper.sort_components(Parser.from_string(xml_ref.replace('name="A" required', 'name="D" required')).get_components(fields_dict))
+
+    def test_tag_tree(self):
+        fields_dict = {
+            8: FieldValue(name = "BeginString"),
+            35: FieldValue(name = "MsgType"),
+            34: FieldValue(name = "MsgSeqNum"),
+            453: GroupValue(name = "NoPartyIDs"),
+            3: FieldValue(name = "Tag3"),
+        }
+        result = TagTree.from_fields(fields_dict)
+
+        self.assertEqual(list(result.tree_ids), ["3", "4", "8"])
+        node_3 = result.tree_ids["3"]
+        self.assertEqual(node_3.depth, 2)
+        self.assertEqual(list(node_3.tree_ids), ["=", "4", "5"])
+        self.assertEqual(node_3.tree_ids["="].value.name, "Tag3")
+        self.assertEqual(node_3.tree_ids["="].tree_ids, None)
+        self.assertEqual(node_3.tree_ids["5"].tree_ids["="].value.name, "MsgType")
+        self.assertEqual(node_3.tree_ids["5"].tree_ids["="].depth, 4)
+        self.assertTrue(result.find("4"))
+        self.assertFalse(result.find("5"))
+        self.assertEqual(result.find_value(453).name, "NoPartyIDs")
+        self.assertEqual(result.find_value(45), None)
+        self.assertEqual(result.find_value(4533), None)
+        # root, 3, =, 4, =, 5, =, 4, 5, 3, =, 8, =
+        self.assertEqual(len(result), 13)
+
+    def test_find_length_field(self):
+        xml_ref = '''<fix major="4" minor="4">
+    <fields>
+        <field number="95" name="RawDataLength" type="LENGTH"/>
+        <field number="96" name="RawData" type="DATA"/>
+        <field number="212" name="XmlDataLen" type="LENGTH"/>
+        <field number="213" name="XmlData" type="DATA"/>
+        <field number="90" name="SecureDataLen" type="LENGTH"/>
+        <field number="91" name="SecureData" type="DATA"/>
+        <field number="5000" name="PayloadSize" type="LENGTH"/>
+        <field number="5001" name="Payload" type="DATA"/>
+    </fields>
+</fix>'''
+        fields_definition = DefinitionHelper.generate_fields_definition(Parser.from_string(xml_ref).get_fields())
+        self.assertEqual(fields_definition["RawData"].length_field, "RawDataLength")
+        self.assertEqual(fields_definition["XmlData"].length_field, "XmlDataLen")
+        self.assertEqual(fields_definition["SecureData"].length_field, "SecureDataLen")
+        # not named after the DATA field, numbered just before it
+        self.assertEqual(fields_definition["Payload"].length_field, "PayloadSize")
+        self.assertEqual(fields_definition["RawDataLength"].length_field, None)
+        with self.assertRaisesRegex(Exception, 'no LENGTH field for the DATA field "RawData"'):
+            DefinitionHelper.generate_fields_definition(Parser.from_string(xml_ref.replace('name="RawDataLength" type="LENGTH"', 'name="RawDataLength" type="INT"')).get_fields())
+
+    def test_decimal_scales(self):
+        xml_ref = '''<fix major="4" minor="4">
+    <fields>
+        <field number="38" name="OrderQty" type="QTY"/>
+        <field number="44" name="Price" type="PRICE"/>
+        <field number="152" name="CashOrderQty" type="QTY"/>
+        <field number="223" name="CouponRate" type="PERCENTAGE"/>
+        <field number="381" name="GrossTradeAmt" type="AMT"/>
+        <field number="211" name="PegOffsetValue" type="FLOAT"/>
+        <field number="55" name="Symbol" type="STRING"/>
+    </fields>
+</fix>'''
+        fields = Parser.from_string(xml_ref).get_fields()
+        fields_definition = DefinitionHelper.generate_fields_definition(fields)
+        self.assertEqual([(name, fields_definition[name].primitive_type, fields_definition[name].scale) for name in fields_definition], [
+            ('OrderQty', 'decimal', 4), ('Price', 'decimal', 8), ('CashOrderQty', 'decimal', 4), ('CouponRate', 'decimal', 6),
+            ('GrossTradeAmt', 'decimal', 4), ('PegOffsetValue', 'float', None), ('Symbol', 'string', None)])
+
+        fields_definition = DefinitionHelper.generate_fields_definition(fields, {'Price': 4, 'OrderQty': 0, 'CouponRate': 18})
+        self.assertEqual([fields_definition[name].scale for name in ['Price', 'OrderQty', 'CashOrderQty', 'CouponRate']], [4, 0, 4, 18])
+
+        with self.assertRaisesRegex(Exception, 'scale of the undefined field "StopPx"'):
+            DefinitionHelper.generate_fields_definition(fields, {'StopPx': 4})
+        with self.assertRaisesRegex(Exception, '"Symbol" is not a decimal field'):
+            DefinitionHelper.generate_fields_definition(fields, {'Symbol': 4})
+        with self.assertRaisesRegex(Exception, 'the scale 19 of "Price" is not between 0 and 18'):
+            DefinitionHelper.generate_fields_definition(fields, {'Price': 19})
+        with self.assertRaisesRegex(Exception, 'the scale -1 of "Price" is not between 0 and 18'):
+            DefinitionHelper.generate_fields_definition(fields, {'Price': -1})
+
+    def test_load_decimal_scales(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'scales.json')
+            with open(path, 'w') as scales_file:
+                scales_file.write('{"Price": 4, "OrderQty": 0}')
+            self.assertEqual(DefinitionHelper.load_decimal_scales(path), {'Price': 4, 'OrderQty': 0})
+            with open(path, 'w') as scales_file:
+                scales_file.write('{"Price": "4"}')
+            with self.assertRaisesRegex(Exception, 'are not an object of integers'):
+                DefinitionHelper.load_decimal_scales(path)
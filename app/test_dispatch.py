@@ -0,0 +1,281 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from app.dispatch import *
+from app.enum_tables import pack_value
+from app.definition_helper import *
+from app.generator import GeneratorBase, GeneratorOptions
+from app.stream_parser import *
+from app.tag_profile import TagProfile
+
+class Testing_Dispatch(unittest.TestCase):
+
+    def test_CostModelChoice(self):
+        # dense small tags, the session messages
+        self.assertEqual(make_dispatch([8, 9, 35, 49, 56, 34, 52, 112, 10])['strategy'], 'jump_table')
+        # sparse custom tags, no jump table
+        dispatch = make_dispatch([8, 9, 35, 9001, 9002, 30379, 20005, 10])
+        self.assertNotEqual(dispatch['strategy'], 'jump_table')
+        self.assertEqual(dispatch['field_count'], 8)
+        self.assertTrue(dispatch['cost'] > 0)
+
+    def test_Override(self):
+        tags = [8, 9, 35, 1128, 10]
+        for strategy in DISPATCH_STRATEGIES:
+            self.assertEqual(make_dispatch(tags, strategy)['strategy'], strategy)
+        with self.assertRaisesRegex(Exception, 'unknown dispatch strategy "hash"'):
+            make_dispatch(tags, 'hash')
+        dispatch = make_dispatch([8, 30379], 'jump_table')
+        self.assertEqual(dispatch['strategy'], make_dispatch([8, 30379])['strategy'])
+        self.assertEqual(dispatch['requested'], 'jump_table')
+        with self.assertRaisesRegex(Exception, 'empty tag set'):
+            make_dispatch([])
+
+    def test_Tables(self):
+        tags = [8, 9, 35, 30379, 10, 448, 447, 452]
+        jump_table = make_dispatch(tags[:3] + tags[4:], 'jump_table')['table']
+        self.assertEqual([jump_table[tag] for tag in tags[:3] + tags[4:]], list(range(7)))
+        self.assertEqual(jump_table.count(-1), len(jump_table) - 7)
+
+        binary_search = make_dispatch(tags, 'binary_search')
+        self.assertEqual(binary_search['sorted_tags'], sorted(tags))
+        self.assertEqual([tags[index] for index in binary_search['sorted_indexes']], sorted(tags))
+
+        perfect_hash = make_dispatch(tags, 'perfect_hash')
+        self.assertEqual(perfect_hash['size'], 1 << perfect_hash['bits'])
+        for index, tag in enumerate(tags):
+            slot = ((tag * perfect_hash['multiplier']) & 0xFFFFFFFF) >> perfect_hash['shift']
+            self.assertEqual(perfect_hash['keys'][slot], tag)
+            self.assertEqual(perfect_hash['values'][slot], index)
+        self.assertEqual(perfect_hash, make_dispatch(tags, 'perfect_hash'))
+
+    def test_MsgTypeDispatch(self):
+        messages = [{'name': name, 'type': msg_type} for name, msg_type in [('Heartbeat', '0'), ('NewOrderSingle', 'D'), ('Quote', 'S'), ('CrossRequest', 'UCL'), ('UserRequest', 'BE')]]
+        dispatch = GeneratorBase.make_msg_type_dispatch(messages)
+        self.assertEqual(dispatch['strategy'], 'perfect_hash')
+        for kind, message in enumerate(messages):
+            key = pack_value(message['type'])
+            slot = ((key * dispatch['multiplier']) & 0xFFFFFFFFFFFFFFFF) >> dispatch['shift']
+            self.assertEqual((dispatch['keys'][slot], dispatch['values'][slot]), (key, kind))
+        self.assertEqual(dispatch['values'].count(len(messages)), dispatch['size'] - len(messages))
+        # a MsgType too long to be packed keeps the switch of the enums
+        dispatch = GeneratorBase.make_msg_type_dispatch(messages + [{'name': 'Custom', 'type': 'UCUSTOM01'}])
+        self.assertEqual(dispatch['strategy'], 'packed_switch')
+        self.assertEqual(dispatch['tables']['long_values'], [{'value': 'UCUSTOM01', 'code': 5}])
+
+    def test_IrTrie(self):
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file("resources/FIXLF44_Cash.xml").get_schema(None))
+        ir = GeneratorBase.make_ir(schema_definition, GeneratorOptions(dispatch='trie'))
+        for message in ir['messages'] + ir['groups']:
+            self.assertEqual(message['dispatch']['strategy'], 'trie')
+            indexes = []
+            nodes = list(message['dispatch']['tree'])
+            while len(nodes) != 0:
+                node = nodes.pop()
+                if node['label'] == '=':
+                    indexes.append(node['index'])
+                nodes.extend(node['children'])
+            self.assertEqual(sorted(indexes), list(range(len(message['fields_by_order']))))
+
+    CPP_DRIVER = '''
+#include <cstdio>
+#include <cstring>
+#include "fix_trie/messages.h"
+#include "fix_jump_table/messages.h"
+#include "fix_binary_search/messages.h"
+#include "fix_perfect_hash/messages.h"
+#include "fix_profiled/messages.h"
+
+template <typename Dispatch>
+void print_indexes(const char* name, const char* input)
+{
+    const char* cursor = input;
+    const char* end = input + std::strlen(input);
+    std::printf("%s", name);
+    while (cursor != end) {
+        const int index = Dispatch::parse_field_index(cursor, end);
+        std::printf(" %d", index);
+        if (index == -2) {
+            break;
+        }
+        while (cursor != end && *cursor++ != '|') {
+        }
+    }
+    std::printf("\\n");
+}
+
+struct PrintHandler
+{
+    template <int Index>
+    void on_field(std::string_view value)
+    {
+        std::printf(" %d:%.*s", Index, static_cast<int>(value.size()), value.data());
+    }
+
+    void on_unknown_field(std::string_view tag, std::string_view value)
+    {
+        std::printf(" %.*s?%.*s", static_cast<int>(tag.size()), tag.data(), static_cast<int>(value.size()), value.data());
+    }
+};
+
+template <typename Dispatch>
+void print_fields(const char* name, const char* input)
+{
+    const char* cursor = input;
+    const char* end = input + std::strlen(input);
+    PrintHandler handler;
+    std::printf("%s", name);
+    const bool decoded = Dispatch::decode(cursor, end, handler);
+    std::printf(" %s %d\\n", decoded ? "true" : "false", static_cast<int>(cursor - input));
+}
+
+int main()
+{
+    const char* fields = "@FIELDS@";
+    print_fields<fix_trie::dispatch::@MESSAGE@>("trie", fields);
+    print_fields<fix_jump_table::dispatch::@MESSAGE@>("jump_table", fields);
+    print_fields<fix_binary_search::dispatch::@MESSAGE@>("binary_search", fields);
+    print_fields<fix_perfect_hash::dispatch::@MESSAGE@>("perfect_hash", fields);
+    print_fields<fix_profiled::dispatch::@MESSAGE@>("profiled", fields);
+
+    const char* input = "@INPUT@";
+    print_indexes<fix_trie::dispatch::@MESSAGE@>("trie", input);
+    print_indexes<fix_jump_table::dispatch::@MESSAGE@>("jump_table", input);
+    print_indexes<fix_binary_search::dispatch::@MESSAGE@>("binary_search", input);
+    print_indexes<fix_perfect_hash::dispatch::@MESSAGE@>("perfect_hash", input);
+    print_indexes<fix_profiled::dispatch::@MESSAGE@>("profiled", input);
+    return 0;
+}
+'''
+
+    @staticmethod
+    def generate_packages(generator) -> dict:
+        ''' one package per strategy and a profiled trie, returns the IR of the last one '''
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file("resources/FIXLF44_Cash.xml").get_schema(None))
+        for strategy in DISPATCH_STRATEGIES:
+            # Heartbeat has the tag 30379, its jump table falls back to the cost model
+            ir = GeneratorBase.make_ir(schema_definition, GeneratorOptions(dispatch=strategy))
+            ir['package'] = f'fix_{strategy}'
+            generator.generate_from_ir(ir)
+        # the trie and the binary search of the groups in the order of a tag profile
+        tag_profile = TagProfile()
+        tag_profile.add_log(['8=FIX.4.4|35=0|49=A|49=A|112=B|10=000|'])
+        ir = GeneratorBase.make_ir(schema_definition, GeneratorOptions(dispatch='trie', tag_profile=tag_profile))
+        ir['package'] = 'fix_profiled'
+        generator.generate_from_ir(ir)
+        return ir
+
+    @staticmethod
+    def make_inputs(ir: dict, message_name: str) -> dict:
+        message = next(message for message in ir['messages'] if message['name'] == message_name)
+        tags = [int(field['id']) for field in message['fields_by_order']]
+        inputs = {}
+        # every known tag, then an unknown tag, a longer one and a malformed one
+        inputs['tags'] = '|'.join(f'{tag}=x' for tag in tags) + '|11=x|' + f'{tags[0]}0=x' + '|=x'
+        inputs['tags_expected'] = ' '.join(str(index) for index in range(len(tags))) + ' -1 -1 -2'
+        # the fused decode delivers the values, then stops on the malformed field
+        fields = ''.join(f'{tag}=v{index}\x01' for index, tag in enumerate(tags)) + f'11=u\x01{tags[0]}0=w\x01'
+        inputs['fields_expected'] = ' '.join(f'{index}:v{index}' for index in range(len(tags))) + f' 11?u {tags[0]}0?w false {len(fields)}'
+        inputs['fields'] = fields + '=x\x01'
+        return inputs
+
+    def expected_output(self, inputs: dict) -> list:
+        strategies = DISPATCH_STRATEGIES + ['profiled']
+        return [f'{strategy} {inputs["fields_expected"]}' for strategy in strategies] + [f'{strategy} {inputs["tags_expected"]}' for strategy in strategies]
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ not available')
+    def test_GeneratedCpp(self):
+        module = __import__('app.generation.cpp', fromlist=['Generator'])
+        with tempfile.TemporaryDirectory() as directory:
+            ir = self.generate_packages(module.Generator(directory))
+            inputs = self.make_inputs(ir, 'Heartbeat')
+            with open(os.path.join(directory, 'main.cpp'), 'w') as driver_file:
+                driver_file.write(self.CPP_DRIVER.replace('@INPUT@', inputs['tags']).replace('@FIELDS@', inputs['fields'].replace('\x01', '\\001')).replace('@MESSAGE@', 'Heartbeat'))
+            executable = os.path.join(directory, 'main')
+            subprocess.run(['g++', '-std=c++17', '-Wall', '-Werror', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+            output = subprocess.run([executable], check=True, capture_output=True, text=True).stdout
+            self.assertEqual(output.splitlines(), self.expected_output(inputs))
+
+    RUST_DRIVER = '''
+mod fix_trie;
+mod fix_jump_table;
+mod fix_binary_search;
+mod fix_perfect_hash;
+mod fix_profiled;
+
+macro_rules! print_fields {
+    ($package:ident, $input:expr) => {{
+        struct PrintHandler {
+            output: String,
+        }
+        impl<'a> $package::runtime::FieldHandler<'a> for PrintHandler {
+            fn on_field(&mut self, index: usize, value: &'a [u8]) {
+                self.output += &format!(" {}:{}", index, String::from_utf8_lossy(value));
+            }
+            fn on_unknown_field(&mut self, tag: &'a [u8], value: &'a [u8]) {
+                self.output += &format!(" {}?{}", String::from_utf8_lossy(tag), String::from_utf8_lossy(value));
+            }
+        }
+        let mut handler = PrintHandler { output: String::new() };
+        let mut cursor = 0usize;
+        let decoded = $package::messages::dispatch::@MESSAGE@::decode($input, &mut cursor, &mut handler);
+        println!("{}{} {} {}", &stringify!($package)[4..], handler.output, decoded, cursor);
+    }};
+}
+
+macro_rules! print_indexes {
+    ($package:ident, $input:expr) => {{
+        let input: &[u8] = $input;
+        let mut output = String::new();
+        let mut cursor = 0usize;
+        while cursor != input.len() {
+            let index = $package::messages::dispatch::@MESSAGE@::parse_field_index(input, &mut cursor);
+            output += &format!(" {}", index);
+            if index == -2 {
+                break;
+            }
+            while cursor != input.len() {
+                cursor += 1;
+                if input[cursor - 1] == b'|' {
+                    break;
+                }
+            }
+        }
+        println!("{}{}", &stringify!($package)[4..], output);
+    }};
+}
+
+fn main() {
+    let fields: &[u8] = b"@FIELDS@";
+    print_fields!(fix_trie, fields);
+    print_fields!(fix_jump_table, fields);
+    print_fields!(fix_binary_search, fields);
+    print_fields!(fix_perfect_hash, fields);
+    print_fields!(fix_profiled, fields);
+
+    let input: &[u8] = b"@INPUT@";
+    print_indexes!(fix_trie, input);
+    print_indexes!(fix_jump_table, input);
+    print_indexes!(fix_binary_search, input);
+    print_indexes!(fix_perfect_hash, input);
+    print_indexes!(fix_profiled, input);
+}
+'''
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_GeneratedRust(self):
+        module = __import__('app.generation.rust', fromlist=['Generator'])
+        with tempfile.TemporaryDirectory() as directory:
+            ir = self.generate_packages(module.Generator(directory))
+            inputs = self.make_inputs(ir, 'Heartbeat')
+            with open(os.path.join(directory, 'main.rs'), 'w') as driver_file:
+                driver_file.write(self.RUST_DRIVER.replace('@INPUT@', inputs['tags']).replace('@FIELDS@', inputs['fields'].replace('\x01', '\\x01')).replace('@MESSAGE@', 'Heartbeat'))
+            executable = os.path.join(directory, 'main')
+            subprocess.run(['rustc', '--edition', '2021', '-D', 'warnings', '-o', executable, os.path.join(directory, 'main.rs')], check=True)
+            output = subprocess.run([executable], check=True, capture_output=True, text=True).stdout
+            self.assertEqual(output.splitlines(), self.expected_output(inputs))
@@ -0,0 +1,37 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import unittest
+from app.enum_tables import *
+from app.generator import GeneratorBase
+
+class Testing_EnumTables(unittest.TestCase):
+
+    def test_LookupTable(self):
+        tables = make_enum_tables(['1', '2', 'A'])
+        self.assertEqual(tables['decoder'], 'lookup_table')
+        self.assertEqual([tables['table'][ord(value)] for value in '12A'], [0, 1, 2])
+        self.assertEqual(tables['table'].count(LOOKUP_TABLE_INVALID), 253)
+
+    def test_PackedSwitch(self):
+        values = ['0', 'A', 'AE', 'UCZ', 'U6', 'FIX.4.4']
+        tables = make_enum_tables(values)
+        self.assertEqual(tables['decoder'], 'packed_switch')
+        self.assertEqual({key['key']: values[key['code']] for key in tables['keys']}, {pack_value(value): value for value in values})
+        self.assertEqual(tables['long_values'], [])
+        # a value and its prefix differ by the length byte
+        self.assertNotEqual(pack_value('A'), pack_value('A\x00'))
+        self.assertEqual(pack_value('AE'), 0x02000000_00004541)
+
+        tables = make_enum_tables(['1', 'LONGER_THAN_SEVEN'])
+        self.assertEqual(tables['long_values'], [{'value': 'LONGER_THAN_SEVEN', 'code': 1}])
+        with self.assertRaisesRegex(Exception, 'repeated values'):
+            make_enum_tables(['1', '1'])
+
+    def test_EnumDefinition(self):
+        role = GeneratorBase.make_enum_definition({'name': 'PartyRole', 'number': 452, 'type': 'INT', 'values': [
+            {'name': 'EXECUTING_FIRM', 'value': '1'}, {'name': 'CLIENT_ID', 'value': '3'}, {'name': 'CLIENT', 'value': '3'}, {'name': 'Client_Id', 'value': '12'}]})
+        self.assertEqual([(variant['name'], variant['code']) for variant in role['variants']], [('ExecutingFirm', 0), ('ClientId', 1), ('ClientId_', 2)])
+        self.assertEqual(role['tables']['decoder'], 'packed_switch')
+        self.assertEqual(GeneratorBase.variant_name('4_EYES'), 'V4Eyes')
+        self.assertEqual(GeneratorBase.variant_name('BusinessMessageAck'), 'BusinessMessageAck')
@@ -0,0 +1,107 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import asyncio
+import importlib
+import sys
+import tempfile
+import unittest
+from app.definition_helper import *
+from app.fix_stream import *
+from app.generation.python import Generator
+from app.generator import GeneratorBase
+from app.stream_parser import *
+from app import test_log_index
+
+class Testing_FixStream(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file('resources/FIXLF44_Cash.xml').get_schema(None))
+        cls.directory = tempfile.TemporaryDirectory()
+        ir = GeneratorBase.make_ir(cls.schema)
+        ir['package'] = 'fix44_stream_cash'
+        Generator(cls.directory.name).generate_from_ir(ir)
+        sys.path.insert(0, cls.directory.name)
+        importlib.invalidate_caches()
+        cls.codec = importlib.import_module('fix44_stream_cash')
+        frame = test_log_index.Testing_LogIndex.frame
+        cls.messages = [frame(f'35=D|34={sequence}|49=SENDER|52=20250102-10:00:00.123|56=TARGET|55=BOND|11=ORDER-{sequence}|38=1500|40=2|44=101.25|54=1|')
+                        for sequence in range(1, 301)]
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(cls.directory.name)
+        cls.directory.cleanup()
+
+    @staticmethod
+    async def serve(data: bytes, piece: int):
+        ''' a loopback server writing data in pieces of piece bytes to each client, then closing the connection '''
+        async def replay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            for position in range(0, len(data), piece):
+                writer.write(data[position:position + piece])
+                await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        server = await asyncio.start_server(replay, '127.0.0.1', 0)
+        return server, server.sockets[0].getsockname()[1]
+
+    def test_Framer(self):
+        framer = FixFramer(self.schema, buffer_size=100)
+        stream = b''.join(self.messages[0:50])
+        # bytes fed one by one, the buffer grows and is compacted
+        received = []
+        for position in range(len(stream)):
+            framer.feed(stream[position:position + 1])
+            message = framer.next_message()
+            if message != None:
+                received.append(message)
+        self.assertEqual(received, self.messages[0:50])
+        self.assertLess(len(framer.buffer), 1024)
+        for malformed, offset in [(b'9=5\x01', 0), (b'8=FIX.4.4\x0135=D\x01', 10), (b'8=FIX.4.4\x019=4\x0135=D\x0110=000\x01', 18), (b'8=FIX.4.4\x019=x\x01', 12)]:
+            framer = FixFramer(self.schema)
+            framer.feed(self.messages[0] + malformed)
+            self.assertEqual(framer.next_message(), self.messages[0])
+            with self.assertRaises(FramingError) as raised:
+                framer.next_message()
+            self.assertEqual(raised.exception.offset, len(self.messages[0]) + offset)
+
+    def test_StreamReader(self):
+        async def run():
+            server, port = await self.serve(b''.join(self.messages), 777)
+            async with server:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                decoded = [message async for message in FixStreamReader(reader, self.schema, self.codec.messages.decode_message, read_size=1000)]
+                writer.close()
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                stream, batches = FixStreamReader(reader, self.schema), []
+                while len(batches) == 0 or len(batches[-1]) != 0:
+                    batches.append(await stream.read_messages())
+                writer.close()
+                return decoded, batches
+        decoded, batches = asyncio.run(run())
+        self.assertEqual(sum(batches, []), self.messages)
+        self.assertEqual([message.msg_seq_num for message in decoded], list(range(1, 301)))
+        self.assertEqual((decoded[-1].cl_ord_id, decoded[-1].price, decoded[-1].side), (b'ORDER-300', 10125000000, self.codec.fields.Side.Buy))
+
+    def test_Protocol(self):
+        async def run():
+            server, port = await self.serve(b''.join(self.messages) + self.messages[0][:20], 5000)
+            async with server:
+                transport, protocol = await asyncio.get_running_loop().create_connection(lambda: FixProtocol(self.schema, high_water=20, buffer_size=MIN_READ_SIZE), '127.0.0.1', port)
+                # the consumer is not reading, the transport is paused once 20 messages are queued
+                while not protocol.reading_paused:
+                    await asyncio.sleep(0.01)
+                queued = len(protocol.messages)
+                received = []
+                with self.assertRaises(FramingError):
+                    async for message in protocol:
+                        received.append(message)
+                transport.close()
+                return queued, received
+        queued, received = asyncio.run(run())
+        self.assertLess(queued, 300)
+        self.assertEqual(received, self.messages)
+
+if __name__ == '__main__':
+    unittest.main()
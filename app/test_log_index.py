@@ -0,0 +1,94 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from app.log_index import *
+except ImportError:
+    np = None
+
+@unittest.skipUnless(np, 'numpy not available')
+class Testing_LogIndex(unittest.TestCase):
+
+    @staticmethod
+    def frame(body: str) -> bytes:
+        ''' the message with BeginString, BodyLength and CheckSum, the fields separated by | '''
+        encoded = body.replace('|', '\x01').encode('latin-1')
+        head = b'8=FIX.4.4\x019=%d\x01' % len(encoded)
+        return head + encoded + b'10=%03d\x01' % ((sum(head) + sum(encoded)) % 256)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cash = LogIndex.schema_from_file('resources/FIXLF44_Cash.xml')
+        cls.data = LogIndex.schema_from_file('resources/FIX44_Data.xml')
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'session.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def append(self, data: bytes) -> None:
+        with open(self.log_path, 'ab') as log_file:
+            log_file.write(data)
+
+    def test_Index(self):
+        orders = [
+            self.frame('35=D|34=7|49=SENDER|52=20250102-10:00:00.123|56=TARGET|453=1|448=TRADER1|447=D|452=12|55=BOND|11=ORDER-1|38=1500|40=2|54=1|'),
+            self.frame('35=D|34=8|49=SENDER|52=20250102-10:00:01|56=TARGET|55=BOND|11=ORDER-2|38=2|40=1|54=2|'),
+        ]
+        report = self.frame('35=8|34=9|49=TARGET|52=20250102-10:00:02.000|56=SENDER|11=ORDER-1|37=OID-1|17=EXEC-1|150=0|39=0|55=BOND|54=1|')
+        # the lines of a log, a timestamp before each message and a message with a wrong BodyLength
+        self.append(b'2025-01-02 10:00:00 IN ' + orders[0] + b'\n' + b'8=FIX.4.4\x019=500\x0135=D\x01\n' + b'OUT ' + report + b'\n')
+        index = LogIndex(self.log_path, self.cash, ['ClOrdID'])
+        self.assertEqual(index.update(), 2)
+        self.assertEqual(os.path.getsize(index.index_path), len(index.header()) + 2 * index.record.size)
+        self.assertEqual(list(index.read(index.find(keys={'ClOrdID': b'ORDER-1'}))), [orders[0], report])
+        self.assertEqual([entry.msg_type for entry in index.find(msg_seq_num=9)], ['8'])
+        self.assertEqual(index.find(keys={'ClOrdID': b'ORDER-2'}), [])
+
+        # the second order is written in two parts, the first part is not indexed
+        self.append(orders[1][:30])
+        self.assertEqual(index.update(), 0)
+        self.append(orders[1][30:] + b'\n')
+        self.assertEqual(index.update(), 1)
+        self.assertEqual(index.update(), 0)
+        entries = index.find(msg_type='D')
+        self.assertEqual([(entry.msg_seq_num, entry.sending_time) for entry in entries], [(7, 1735812000123000000), (8, 1735812001000000000)])
+        self.assertEqual(list(index.read(index.find(msg_type='D', keys={'ClOrdID': b'ORDER-2'}))), [orders[1]])
+        self.assertEqual([entry.msg_seq_num for entry in index.find(since=1735812000500000000, until=1735812002000000000)], [8])
+
+        # a record cut by a crash during an update is left out of the queries
+        with open(index.index_path, 'ab') as index_file:
+            index_file.write(b'\x00' * 5)
+        self.assertEqual([entry.msg_seq_num for entry in index.find(msg_type='D')], [7, 8])
+
+        # an index of other key fields is built again
+        by_order = LogIndex(self.log_path, self.cash, ['OrderID', 'ClOrdID'])
+        self.assertEqual(by_order.update(), 3)
+        self.assertEqual([entry.msg_seq_num for entry in by_order.find(keys={'OrderID': b'OID-1', 'ClOrdID': b'ORDER-1'})], [9])
+        with self.assertRaises(Exception):
+            index.find(keys={'ClOrdID': b'ORDER-1'})
+        with self.assertRaises(Exception):
+            LogIndex(self.log_path, self.cash, ['ClOrdID', 'OrderID', 'ExecID'])
+
+    def test_DataFields(self):
+        # the payload holds SOH and text looking like the fields of the index
+        payload = '<x>|34=99|52=x|</x>'
+        self.append(self.frame(f'35=A|34=1|49=S|52=20250102-10:00:00|56=T|98=0|95={len(payload)}|96={payload}|108=30|'))
+        self.append(self.frame(f'35=A|95={len(payload)}|96={payload}|34=2|49=S|52=20250102-10:00:01|56=T|98=0|108=60|'))
+        index = LogIndex(self.log_path, self.data)
+        self.assertEqual(index.update(), 2)
+        self.assertEqual([(entry.msg_seq_num, entry.sending_time) for entry in index.find(msg_type='A')], [(1, 1735812000000000000), (2, 1735812001000000000)])
+
+    def test_Timestamp(self):
+        self.assertEqual([LogIndex.parse_timestamp(value) for value in [b'20250102-10:00:00.123456', b'20240229-23:59:60.999999999', b'20250230-10:00:00', b'20250102']],
+                         [1735812000123456000, 1709251200999999999, NULL_TIME, NULL_TIME])
+
+if __name__ == '__main__':
+    unittest.main()
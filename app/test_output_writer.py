@@ -0,0 +1,39 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+import unittest
+from app.output_writer import *
+
+class Testing_OutputWriter(unittest.TestCase):
+
+    def test_WriteOnlyChangedFiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = OutputWriter(directory)
+            self.assertTrue(writer.write("fix44/messages.h", "struct A {};\n"))
+            self.assertTrue(writer.write("fix44/fields.h", "enum B {};\n"))
+            file_path = os.path.join(directory, "fix44", "messages.h")
+            os.utime(file_path, (1, 1))
+
+            writer = OutputWriter(directory)
+            self.assertFalse(writer.write("fix44/messages.h", "struct A {};\n"))
+            self.assertTrue(writer.write("fix44/fields.h", "enum B { C };\n"))
+            self.assertEqual(os.stat(file_path).st_mtime, 1)
+            self.assertEqual(writer.written, ["fix44/fields.h"])
+            self.assertEqual(writer.unchanged, ["fix44/messages.h"])
+            self.assertEqual(writer.summary(), "1 files written, 1 unchanged")
+
+            with open(os.path.join(directory, "fix44", "fields.h")) as fields_file:
+                self.assertEqual(fields_file.read(), "enum B { C };\n")
+            self.assertEqual(sorted(os.listdir(os.path.join(directory, "fix44"))), ["fields.h", "messages.h"])
+
+    def test_KeepFileMode(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = OutputWriter(directory)
+            writer.write("codec.rs", "fn a() {}\n")
+            file_path = os.path.join(directory, "codec.rs")
+            self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o666 & ~OutputWriter.current_umask())
+            os.chmod(file_path, 0o640)
+            writer.write("codec.rs", "fn b() {}\n")
+            self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o640)
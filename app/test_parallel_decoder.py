@@ -0,0 +1,57 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+import unittest
+from app.definition_helper import *
+from app.stream_parser import *
+from app import test_columnar
+
+try:
+    import numpy as np
+    from app.columnar import ColumnarDecoder
+    from app.parallel_decoder import *
+except ImportError:
+    np = None
+
+@unittest.skipUnless(np, 'numpy not available')
+class Testing_ParallelDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'session.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def decode(self, schema_path: str, log: bytes, chunk_bytes_list: list) -> None:
+        ''' the rows decoded in 2 processes are the ones of a single decode, for chunks of each size '''
+        with open(self.log_path, 'wb') as log_file:
+            log_file.write(log)
+        decoder = ColumnarDecoder(test_columnar.Testing_Columnar.schema(schema_path))
+        expected = decoder.decode(log)
+        self.assertNotEqual(len(expected), 0)
+        for chunk_bytes in chunk_bytes_list:
+            tables = ParallelDecoder(decoder, 2, chunk_bytes).decode(self.log_path)
+            self.assertEqual(list(tables), list(expected), chunk_bytes)
+            for msg_type, rows in expected.items():
+                self.assertEqual(tables[msg_type].tobytes(), rows.tobytes(), chunk_bytes)
+
+    def test_Messages(self):
+        frame = test_columnar.Testing_Columnar.frame
+        log = b''.join(b'%d IN ' % sequence + frame(f'35=D|34={sequence}|49=S|52=20250102-10:00:00|56=T|55=BOND|11=ORDER-{sequence}|38=1|40=2|44=1.5|54=1|') + b'\n'
+                       + frame(f'35=0|34={sequence + 1000}|49=S|52=20250102-10:00:01|56=T|') for sequence in range(40))
+        self.decode('resources/FIXLF44_Cash.xml', log, [1, 7, 100, 1000, len(log)])
+
+    def test_DataFields(self):
+        frame = test_columnar.Testing_Columnar.frame
+        # the payloads hold whole messages, a cut inside a payload finds them first
+        inner = frame('35=0|34=999|49=S|52=20250102-10:00:00|56=T|').decode('latin-1').replace('\x01', '|')
+        payload = inner * 3
+        log = b''.join(frame(f'35=A|34={sequence}|49=S|52=20250102-10:00:00|56=T|98=0|95={len(payload)}|96={payload}|108=30|') for sequence in range(20))
+        self.decode('resources/FIX44_Data.xml', log, [1, 13, 64, 500])
+        self.assertEqual(ParallelDecoder(ColumnarDecoder(test_columnar.Testing_Columnar.schema('resources/FIX44_Data.xml')), 2, 50).decode(self.log_path)['A']['MsgSeqNum'].tolist(), list(range(20)))
+
+if __name__ == '__main__':
+    unittest.main()
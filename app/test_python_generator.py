@@ -0,0 +1,131 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import importlib
+import sys
+import tempfile
+import unittest
+from app.definition_helper import *
+from app.generation.python import Generator
+from app.generator import GeneratorBase
+from app.stream_parser import *
+from app import test_rust_generator
+
+class Testing_PythonGenerator(unittest.TestCase):
+
+    @staticmethod
+    def stream(text: str) -> bytes:
+        return text.replace('|', '\x01').encode('latin-1')
+
+    @classmethod
+    def generate(cls, schema_path: str, package: str):
+        ''' the generated package imported under its own name, the packages of the tests do not collide '''
+        ir = GeneratorBase.make_ir(DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file(schema_path).get_schema(None)))
+        ir['package'] = package
+        Generator(cls.directory.name).generate_from_ir(ir)
+        return importlib.import_module(package)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        sys.path.insert(0, cls.directory.name)
+        importlib.invalidate_caches()
+        cls.cash = cls.generate('resources/FIXLF44_Cash.xml', 'fix44_python_cash')
+        cls.data = cls.generate('resources/FIX44_Data.xml', 'fix44_python_data')
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(cls.directory.name)
+        cls.directory.cleanup()
+
+    def test_MessageView(self):
+        fields, messages = self.cash.fields, self.cash.messages
+        input = self.stream(test_rust_generator.Testing_RustGenerator.NEW_ORDER_SINGLE)
+        message = messages.NewOrderSingle.decode(input)
+        self.assertEqual(message.cl_ord_id, b'ORDER-000001')
+        self.assertEqual(message.msg_seq_num, 7)
+        self.assertEqual((message.order_qty, message.price), (15000000, 10125000000))
+        self.assertEqual((message.side, message.side.as_bytes(), message.ord_type), (fields.Side.Buy, b'1', fields.OrdType.Limit))
+        self.assertIsNone(message.stop_px)
+        self.assertEqual([(party.party_id, party.party_id_source, party.party_role) for party in message.no_party_ids], [
+            (b'TRADER1', fields.PartyIDSource.Proprietarycustomcode, fields.PartyRole.ExecutingTrader),
+            (b'FIRM2', fields.PartyIDSource.KassenvereinNumber, fields.PartyRole.ExecutingFirm),
+        ])
+        self.assertEqual(message.symbol, b'BOND')
+        self.assertEqual(message.no_security_alt_id, [])
+        self.assertEqual((message.has_required_fields(), message.missing_required_tag()), (False, 454))
+        partial = messages.NewOrderSingle.decode(b'35=D\x0134=7\x01453=1\x01448=TRADER1\x01')
+        party = partial.no_party_ids[0]
+        self.assertEqual((partial.missing_required_tag(), party.has_required_fields(), party.missing_required_tag()), (8, False, 447))
+        self.assertEqual((fields.MsgType.from_bytes(b'UCZ'), fields.MsgType.from_bytes(b'UC')), (fields.MsgType.UserPartyEntitlementsUpdateReport, None))
+        self.assertEqual(fields.OrdType.Limit.as_bytes(), b'2')
+        self.assertEqual(messages.decode_message(input).cl_ord_id, b'ORDER-000001')
+        self.assertIsNone(messages.decode_message(b'35=UC\x0134=7\x01'))
+        # a message in the middle of a buffer
+        self.assertEqual(messages.decode_message(b'xx' + input + b'yy', 2, len(input) + 2).msg_seq_num, 7)
+        with self.assertRaises(self.cash.runtime.DecodeError) as raised:
+            messages.NewOrderSingle.decode(b'35=D\x0134=7\x013x=1\x01')
+        self.assertEqual(raised.exception.offset, 10)
+        with self.assertRaises(self.cash.runtime.DecodeError) as raised:
+            messages.NewOrderSingle.decode(b'35=D\x0134=7')
+        self.assertEqual(raised.exception.offset, 5)
+
+    def test_Encoder(self):
+        fields, encoder, runtime = self.cash.fields, self.cash.encoder, self.cash.runtime
+        order = encoder.NewOrderSingleEncoder(b'FIX.4.4')
+        for sequence in range(1, 3):
+            order.start().msg_seq_num(sequence).sender_comp_id(b'SENDER').sending_time(1735812000000000000, 3).target_comp_id(b'TARGET')
+            (order.no_party_ids(2)
+                .party_id(b'P1').party_id_source(fields.PartyIDSource.ShortCodeIdentifier).party_role(fields.PartyRole.ClientId)
+                .party_id(b'P2').party_id_source(fields.PartyIDSource.ShortCodeIdentifier).party_role(fields.PartyRole.ExecutingFirm))
+            order.symbol(b'BOND').cl_ord_id(b'ORDER-1').order_qty(15000000).ord_type(fields.OrdType.Limit).price(-1012500000).side(fields.Side.Sell).trade_at_close_opt_in(True)
+        message = order.finish()
+        # the message of the Rust encoder test
+        expected = test_rust_generator.Testing_RustGenerator.frame('35=D|34=2|49=SENDER|52=20250102-10:00:00.000|56=TARGET|453=2|448=P1|447=P|452=3|448=P2|447=P|452=1|'
+                                                                   '55=BOND|11=ORDER-1|38=1500|40=2|44=-10.125|54=2|30625=Y|')
+        self.assertEqual(message, self.stream(expected))
+        view = self.cash.messages.NewOrderSingle.decode(message)
+        self.assertEqual((view.has_required_fields(), view.price, len(view.no_party_ids)), (False, -1012500000, 2))
+        self.assertEqual([runtime.write_decimal(runtime.Decimal(*value)) for value in [(-5, 3), (123, 2), (42, 0), (100, 2), (-2 ** 63, 18)]],
+                         [b'-0.005', b'1.23', b'42', b'1.00', b'-9.223372036854775808'])
+
+    def test_Timestamp(self):
+        runtime = self.cash.runtime
+        for value, nanoseconds in test_rust_generator.Testing_RustGenerator.PARSED_TIMESTAMPS:
+            self.assertEqual(runtime.to_timestamp(value.encode()), nanoseconds if nanoseconds != 0 else None, value)
+        for value, _ in test_rust_generator.Testing_RustGenerator.FORMATTED_TIMESTAMPS:
+            precision = len(value) - 18 if '.' in value else 0
+            self.assertEqual(runtime.write_timestamp(runtime.to_timestamp(value.encode()), precision), value.encode())
+        self.assertEqual(runtime.write_date(-1), b'19691231')
+
+    def test_Scaled(self):
+        runtime = self.cash.runtime
+        for scale, value, expected in test_rust_generator.Testing_RustGenerator.PARSED_SCALED:
+            self.assertEqual(runtime.to_scaled(value.encode(), scale), expected, value)
+        for value, scale, expected in test_rust_generator.Testing_RustGenerator.FORMATTED_SCALED:
+            self.assertEqual(runtime.write_scaled(value, scale), expected.encode())
+
+    def test_Checksum(self):
+        runtime = self.cash.runtime
+        # several blocks of CHECKSUM_BLOCK bytes, some of them of 0xFF only
+        data = bytes(range(256)) * 300 + b'\xff' * 1000
+        for start, end in [(0, None), (0, 0), (3, 700), (1000, 77777)]:
+            self.assertEqual(runtime.checksum(data, start, end), sum(data[start:end]) % 256)
+
+    def test_DataFields(self):
+        messages = self.data.messages
+        # the payloads hold SOH and text looking like the next field
+        payload = '<x>|10=000|</x>'
+        logon = messages.Logon.decode(self.stream(f'8=FIX.4.4|9=0|35=A|34=1|49=S|52=20250102-10:00:00|56=T|98=0|95={len(payload)}|96={payload}|108=30|93=3|89=S|G|10=000|'))
+        self.assertEqual((logon.raw_data, logon.heart_bt_int, logon.signature_length, logon.signature), (self.stream(payload), 30, 3, b'S\x01G'))
+        lines = ['58=first|354=5|355=58=x||', '58=second|', '58=third|354=1|355=||']
+        news = messages.News.decode(self.stream(f'35=B|148=headline|33=3|{"".join(lines)}93=4|89=sign|'))
+        self.assertEqual([(line.text, line.encoded_text) for line in news.no_lines_of_text], [(b'first', b'58=x\x01'), (b'second', None), (b'third', b'\x01')])
+        self.assertEqual(news.signature, b'sign')
+        for message, offset in [('35=A|98=0|95=3|96=ab|cd|108=30|', 15), ('35=A|98=0|96=ab|108=30|', 10)]:
+            with self.assertRaises(self.data.runtime.DecodeError) as raised:
+                messages.Logon.decode(self.stream(message))
+            self.assertEqual(raised.exception.offset, offset)
+
+if __name__ == '__main__':
+    unittest.main()
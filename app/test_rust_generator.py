@@ -0,0 +1,544 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from typing import List
+from app.definition_helper import *
+from app.generation.rust import Generator
+from app.generator import GeneratorOptions
+from app.stream_parser import *
+
+class Testing_RustGenerator(unittest.TestCase):
+
+    NEW_ORDER_SINGLE = '8=FIX.4.4|9=100|35=D|34=7|49=SENDER|56=TARGET|52=20250102-10:00:00.123|453=2|448=TRADER1|447=D|452=12|448=FIRM2|447=H|452=1|55=BOND|48=DE0001|22=4|9999=custom|11=ORDER-000001|38=1500|40=2|44=101.25|54=1|10=123|'
+
+    VIEW_DRIVER = r'''
+mod fix44;
+
+use fix44::fields;
+use fix44::messages::{self, NewOrderSingle};
+use std::alloc::{GlobalAlloc, Layout, System};
+use std::sync::atomic::{AtomicUsize, Ordering};
+
+struct CountingAllocator;
+
+static ALLOCATIONS: AtomicUsize = AtomicUsize::new(0);
+
+unsafe impl GlobalAlloc for CountingAllocator {
+    unsafe fn alloc(&self, layout: Layout) -> *mut u8 {
+        ALLOCATIONS.fetch_add(1, Ordering::Relaxed);
+        System.alloc(layout)
+    }
+    unsafe fn dealloc(&self, pointer: *mut u8, layout: Layout) {
+        System.dealloc(pointer, layout)
+    }
+}
+
+#[global_allocator]
+static ALLOCATOR: CountingAllocator = CountingAllocator;
+
+fn text(value: Option<&[u8]>) -> &str {
+    std::str::from_utf8(value.unwrap_or(b"-")).unwrap()
+}
+
+fn main() {
+    let input: Vec<u8> = b"@MESSAGE@".iter().map(|&character| if character == b'|' { 1 } else { character }).collect();
+    let before = ALLOCATIONS.load(Ordering::Relaxed);
+    let message = NewOrderSingle::decode(&input).unwrap();
+    let cl_ord_id = message.cl_ord_id();
+    let msg_seq_num = message.msg_seq_num();
+    let order_qty = message.order_qty();
+    let price = message.price();
+    let side = message.side();
+    let ord_type = message.ord_type();
+    let has_stop_px = message.has_stop_px();
+    let parties = message.no_party_ids();
+    let count = parties.len();
+    let mut roles = [None; 2];
+    let mut sources = [None; 2];
+    let mut ids = [None; 2];
+    for (slot, party) in message.no_party_ids().enumerate() {
+        roles[slot] = party.party_role();
+        sources[slot] = party.party_id_source();
+        ids[slot] = party.party_id();
+    }
+    let symbol = message.symbol();
+    let allocations = ALLOCATIONS.load(Ordering::Relaxed) - before;
+
+    println!("cl_ord_id {}", text(cl_ord_id));
+    println!("msg_seq_num {:?}", msg_seq_num);
+    println!("order_qty {:?} price {:?}", order_qty, price);
+    println!("side {:?} {} ord_type {:?}", side, text(side.map(fields::Side::as_bytes)), ord_type);
+    println!("has_price {} has_stop_px {}", message.has_price(), has_stop_px);
+    println!("parties {}", count);
+    for slot in 0..2 {
+        println!("party {} {:?} {:?}", text(ids[slot]), sources[slot], roles[slot]);
+    }
+    println!("symbol {}", text(symbol));
+    println!("allocations {}", allocations);
+    println!("required {} {:?}", message.has_required_fields(), message.missing_required_tag());
+    let partial = NewOrderSingle::decode(b"35=D\x0134=7\x01453=1\x01448=TRADER1\x01").unwrap();
+    let party = partial.no_party_ids().next().unwrap();
+    println!("partial {} {:?} {} {:?}", partial.has_required_fields(), partial.missing_required_tag(), party.has_required_fields(), party.missing_required_tag());
+    println!("size {}", std::mem::size_of::<NewOrderSingle>());
+    println!("enums {:?} {:?} {:?} {:?}", fields::MsgType::from_bytes(b"UCZ"), fields::MsgType::from_bytes(b"UC"), fields::ExecType::from_bytes(b"F"), fields::ExecType::from_bytes(b"X"));
+    println!("kinds {:?} {:?} {:?} {:?}", messages::MessageKind::from_msg_type(b"D"), messages::MessageKind::from_msg_type(b"UCL").is_some(), messages::MessageKind::from_msg_type(b"UC"), messages::MessageKind::from_msg_type(b""));
+    match messages::decode_message(&input) {
+        Some(Ok(messages::Message::NewOrderSingle(order))) => println!("decoded {}", text(order.cl_ord_id())),
+        _ => println!("not decoded"),
+    }
+    println!("as_bytes {}", text(Some(fields::OrdType::Limit.as_bytes())));
+    let mut counterparties = fix44::runtime::CounterpartyStats::default();
+    let mut stats = fix44::runtime::FastPathStats::default();
+    for _ in 0..2 {
+        stats = fix44::runtime::FastPathStats::default();
+        let order = NewOrderSingle::decode_with_stats(&input, &mut stats).unwrap();
+        counterparties.record(order.sender_comp_id().unwrap(), &stats);
+    }
+    let sender = counterparties.by_counterparty()[&b"SENDER"[..]];
+    println!("fast path {} {} {} {} {}", stats.hits, stats.misses, counterparties.by_counterparty().len(), sender.messages, sender.hits);
+    println!("malformed {:?}", NewOrderSingle::decode(b"35=D\x0134=7\x013x=1\x01").err());
+}
+'''
+
+    FRAMER_DRIVER = r'''
+mod fix44;
+
+use fix44::framer::{FrameStatus, Framer, RingBuffer};
+
+fn main() {
+    let stream: Vec<u8> = "@STREAM@".bytes().map(|byte| if byte == b'|' { 0x01 } else { byte }).collect();
+
+    let mut framer = Framer::default();
+    let mut cursor = 0;
+    let mut lengths = Vec::new();
+    while framer.feed(&stream, &mut cursor) == FrameStatus::Complete {
+        lengths.push(framer.length().to_string());
+    }
+    println!("contiguous {} {}", lengths.join(" "), cursor);
+
+    // received 7 bytes at a time in a ring smaller than the stream, the messages wrap around its end
+    let mut storage = [0u8; 256];
+    let mut ring = RingBuffer::new(&mut storage);
+    let mut resumed = Framer::default();
+    let mut received = 0;
+    let mut framed = Vec::new();
+    let mut wrapped = 0;
+    while received < stream.len() {
+        let writable = ring.writable();
+        let count = writable.len().min(7).min(stream.len() - received);
+        writable[..count].copy_from_slice(&stream[received..received + count]);
+        ring.commit(count);
+        received += count;
+        while let Ok(Some(frame)) = ring.next_frame(&mut resumed) {
+            let (first, second) = ring.parts(&frame);
+            framed.extend_from_slice(first);
+            framed.extend_from_slice(second);
+            wrapped += if second.is_empty() { 0 } else { 1 };
+            ring.release(&frame);
+        }
+    }
+    println!("ring {} {}", framed == stream, wrapped);
+
+    let mut corrupted = stream.clone();
+    corrupted[30] += 1;
+    let mut cursor = 0;
+    let status = Framer::default().feed(&corrupted, &mut cursor);
+    println!("corrupted {:?} {}", status, cursor);
+
+    let mut cursor = 0;
+    let status = Framer::default().feed(b"8=FIX.4.4\x019=1x", &mut cursor);
+    println!("bad length {:?} {}", status, cursor);
+}
+'''
+
+    @staticmethod
+    def frame(body: str) -> str:
+        ''' the message with BeginString, BodyLength and CheckSum, the fields separated by | '''
+        head = f'8=FIX.4.4|9={len(body)}|'
+        checksum = sum((head + body).replace('|', '\x01').encode('latin-1')) % 256
+        return f'{head}{body}10={checksum:03}|'
+
+    @staticmethod
+    def compile_and_run(schema_path: str, driver: str, options: GeneratorOptions = GeneratorOptions()) -> List[str]:
+        ''' the lines printed by the driver compiled with the package generated from the schema '''
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file(schema_path).get_schema(None))
+        with tempfile.TemporaryDirectory() as directory:
+            Generator(directory).generate(schema_definition, options)
+            with open(os.path.join(directory, 'main.rs'), 'w') as driver_file:
+                driver_file.write(driver)
+            executable = os.path.join(directory, 'main')
+            subprocess.run(['rustc', '--edition', '2021', '-D', 'warnings', '-o', executable, os.path.join(directory, 'main.rs')], check=True)
+            return subprocess.run([executable], check=True, capture_output=True, text=True).stdout.splitlines()
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_Framer(self):
+        messages = [self.frame(f'35=D|34={sequence}|49=SENDER|56=TARGET|11=ORDER-{sequence:06}|55=BOND|' + 'x' * (sequence * 13) + '|') for sequence in range(1, 9)]
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.FRAMER_DRIVER.replace('@STREAM@', ''.join(messages)))
+        self.assertEqual(output, [
+            'contiguous ' + ' '.join(str(len(message)) for message in messages) + f' {len("".join(messages))}',
+            'ring true 4',
+            f'corrupted Malformed {len(messages[0]) - 1}',
+            'bad length Malformed 13',
+        ])
+
+    ENCODER_DRIVER = r'''
+mod fix44;
+
+use fix44::encoder::{self, HeartbeatEncoder, NewOrderSingleEncoder};
+use fix44::fields::{OrdType, PartyIDSource, PartyRole, Side};
+use fix44::framer::Framer;
+use fix44::messages::NewOrderSingle;
+use fix44::runtime::{Decimal, Timestamp};
+
+fn text(bytes: &[u8]) -> String {
+    String::from_utf8_lossy(bytes).replace('\x01', "|")
+}
+
+fn main() {
+    let mut buffer = [0u8; 512];
+    let mut order = NewOrderSingleEncoder::new(&mut buffer, b"FIX.4.4");
+    for sequence in 1..=2 {
+        order.start().msg_seq_num(sequence).sender_comp_id(b"SENDER").sending_time(Timestamp { nanoseconds: 1735812000000000000, precision: 3 }).target_comp_id(b"TARGET");
+        order
+            .no_party_ids(2)
+            .party_id(b"P1").party_id_source(PartyIDSource::ShortCodeIdentifier).party_role(PartyRole::ClientId)
+            .party_id(b"P2").party_id_source(PartyIDSource::ShortCodeIdentifier).party_role(PartyRole::ExecutingFirm);
+        order.symbol(b"BOND").cl_ord_id(b"ORDER-1").order_qty(15000000).ord_type(OrdType::Limit)
+            .price(-1012500000).side(Side::Sell).trade_at_close_opt_in(true);
+    }
+    let message = order.finish().unwrap().to_vec();
+    println!("message {}", text(&message));
+
+    let mut framer = Framer::default();
+    let mut cursor = 0;
+    let status = framer.feed(&message, &mut cursor);
+    let view = NewOrderSingle::decode(&message).unwrap();
+    println!("framed {:?} {} decoded {} {:?} {}", status, framer.length(), view.has_required_fields(), view.price(), view.no_party_ids().count());
+
+    let mut digits = [0u8; 48];
+    for value in [(-5, 3), (123, 2), (42, 0), (100, 2), (i64::MIN, 18)] {
+        let count = encoder::write_decimal(&mut digits, Decimal { mantissa: value.0, scale: value.1 });
+        println!("decimal {}", text(&digits[..count]));
+    }
+    let count = encoder::write_int(&mut digits, i64::MIN);
+    println!("int {}", text(&digits[..count]));
+
+    let mut small = [0u8; 64];
+    let mut heartbeat = HeartbeatEncoder::new(&mut small, b"FIX.4.4");
+    heartbeat.start().msg_seq_num(1).sender_comp_id(b"SENDER").target_comp_id(b"TARGET");
+    let heartbeat_length = heartbeat.finish().map_or(0, |message| message.len());
+    heartbeat.start().msg_seq_num(2).sender_comp_id(b"A_SENDER_FAR_TOO_LONG_FOR_THE_BUFFER").target_comp_id(b"TARGET");
+    let overflow_length = heartbeat.finish().map(|message| message.len());
+    println!("small {} {:?} {}", heartbeat_length, overflow_length, heartbeat.encoder().overflow());
+}
+'''
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_Encoder(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.ENCODER_DRIVER)
+        message = self.frame('35=D|34=2|49=SENDER|52=20250102-10:00:00.000|56=TARGET|453=2|448=P1|447=P|452=3|448=P2|447=P|452=1|'
+                             '55=BOND|11=ORDER-1|38=1500|40=2|44=-10.125|54=2|30625=Y|')
+        self.assertEqual(output, [
+            f'message {message}',
+            f'framed Complete {len(message)} decoded false Some(-1012500000) 2',
+            'decimal -0.005',
+            'decimal 1.23',
+            'decimal 42',
+            'decimal 1.00',
+            'decimal -9.223372036854775808',
+            'int -9223372036854775808',
+            f'small {len(self.frame("35=0|34=1|49=SENDER|56=TARGET|"))} None true',
+        ])
+
+    SESSION_HEADER_DRIVER = r'''
+mod fix44;
+
+use fix44::encoder::{HeartbeatEncoder, NewOrderSingleEncoder, SessionHeader};
+use fix44::fields::Side;
+use fix44::messages::NewOrderSingle;
+
+fn text(bytes: &[u8]) -> String {
+    String::from_utf8_lossy(bytes).replace('\x01', "|")
+}
+
+fn main() {
+    let mut header = SessionHeader::default();
+    header.sender_comp_id(b"SENDER").target_comp_id(b"TARGET");
+    println!("template {}", text(header.bytes()));
+
+    let mut buffer = [0u8; 512];
+    let mut order = NewOrderSingleEncoder::new(&mut buffer, b"FIX.4.4");
+    let mut message = Vec::new();
+    for sequence in 7..=8u64 {
+        let sending_time = format!("20250102-10:00:00.00{}", sequence);
+        order.start_with_header(&header, sequence, sending_time.as_bytes()).symbol(b"BOND").cl_ord_id(b"ORDER-1").side(Side::Buy);
+        message = order.finish().unwrap().to_vec();
+        println!("order {}", text(&message));
+    }
+    let view = NewOrderSingle::decode(&message).unwrap();
+    println!("decoded {:?}", view.msg_seq_num());
+
+    let mut heartbeat_buffer = [0u8; 256];
+    let mut heartbeat = HeartbeatEncoder::new(&mut heartbeat_buffer, b"FIX.4.4");
+    heartbeat.start_with_header(&header, 9, b"20250102-10:00:01.000");
+    println!("heartbeat {}", text(heartbeat.finish().unwrap()));
+
+    header.poss_dup_flag(true);
+    order.start_with_header(&header, 10, b"20250102-10:00:02.000").symbol(b"BOND");
+    println!("modified {}", text(order.finish().unwrap()));
+    order.start().msg_seq_num(11).symbol(b"BOND");
+    println!("plain {}", text(order.finish().unwrap()));
+
+    order.start_with_header(&header, 1000000000, b"20250102-10:00:03.000");
+    let sequence_length = order.finish().map(|message| message.len());
+    order.start_with_header(&header, 12, b"20250102-10:00:03");
+    let time_length = order.finish().map(|message| message.len());
+    println!("slots {:?} {:?} {}", sequence_length, time_length, order.encoder().overflow());
+}
+'''
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_SessionHeader(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.SESSION_HEADER_DRIVER)
+        self.assertEqual(output, [
+            'template 34=000000000|52=000000000000000000000|49=SENDER|56=TARGET|',
+            'order ' + self.frame('35=D|34=000000007|52=20250102-10:00:00.007|49=SENDER|56=TARGET|55=BOND|11=ORDER-1|54=1|'),
+            'order ' + self.frame('35=D|34=000000008|52=20250102-10:00:00.008|49=SENDER|56=TARGET|55=BOND|11=ORDER-1|54=1|'),
+            'decoded Some(8)',
+            'heartbeat ' + self.frame('35=0|34=000000009|52=20250102-10:00:01.000|49=SENDER|56=TARGET|'),
+            'modified ' + self.frame('35=D|34=000000010|52=20250102-10:00:02.000|49=SENDER|56=TARGET|43=Y|55=BOND|'),
+            'plain ' + self.frame('35=D|34=11|55=BOND|'),
+            'slots None None true',
+        ])
+
+    TIMESTAMP_DRIVER = r'''
+mod fix44;
+
+use fix44::encoder::{self, TimestampCache};
+use fix44::runtime::{self, Timestamp};
+
+fn main() {
+    for value in ["20250102-10:00:00", "20250102-10:00:00.123", "20250102-10:00:00.123456", "20250102-10:00:00.123456789",
+                  "20240229-23:59:60.999", "19691231-23:59:59.999", "16780101-00:00:00", "22611231-23:59:59.999999999", "20250102",
+                  "20250230-10:00:00", "20250102-24:00:00", "20250102 10:00:00", "20250102-10:00:00.12", "2025010x-10:00:00"] {
+        println!("parsed {} {}", value, runtime::to_timestamp(value.as_bytes()).unwrap_or(0));
+    }
+
+    let mut cache = TimestampCache::default();
+    let mut text = [0u8; 32];
+    for (nanoseconds, precision) in [(1735812000123456789, 3), (1735812000123456789, 6), (1735812000123456789, 9), (1735812000987000000, 0),
+                                     (1735812001000000000, 3), (-1, 9), (1709251199999000000, 3)] {
+        let count = encoder::write_timestamp(&mut text, Timestamp { nanoseconds, precision }, &mut cache);
+        let exact = runtime::to_timestamp(&text[..count]) == Some(nanoseconds);
+        println!("formatted {} {}", String::from_utf8_lossy(&text[..count]), exact as i32);
+    }
+    encoder::write_date(&mut text, -1);
+    println!("date {}", String::from_utf8_lossy(&text[..8]));
+}
+'''
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_Timestamp(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.TIMESTAMP_DRIVER)
+        self.assertEqual(output, [f'parsed {value} {nanoseconds}' for value, nanoseconds in self.PARSED_TIMESTAMPS] + [
+            f'formatted {value} {int(exact)}' for value, exact in self.FORMATTED_TIMESTAMPS] + ['date 19691231'])
+
+    # the values parsed by the generated decoders and the nanoseconds since the epoch, 0 for a malformed value
+    PARSED_TIMESTAMPS = [
+        ('20250102-10:00:00', 1735812000000000000),
+        ('20250102-10:00:00.123', 1735812000123000000),
+        ('20250102-10:00:00.123456', 1735812000123456000),
+        ('20250102-10:00:00.123456789', 1735812000123456789),
+        ('20240229-23:59:60.999', 1709251200999000000),
+        ('19691231-23:59:59.999', -1000000),
+        ('16780101-00:00:00', -9214560000000000000),
+        ('22611231-23:59:59.999999999', 9214646399999999999),
+        ('20250102', 1735776000000000000),
+        ('20250230-10:00:00', 0),
+        ('20250102-24:00:00', 0),
+        ('20250102 10:00:00', 0),
+        ('20250102-10:00:00.12', 0),
+        ('2025010x-10:00:00', 0),
+    ]
+
+    # the values written by the generated encoders, true when they parse back to the same nanoseconds
+    FORMATTED_TIMESTAMPS = [
+        ('20250102-10:00:00.123', False),
+        ('20250102-10:00:00.123456', False),
+        ('20250102-10:00:00.123456789', True),
+        ('20250102-10:00:00', False),
+        ('20250102-10:00:01.000', True),
+        ('19691231-23:59:59.999999999', True),
+        ('20240229-23:59:59.999', True),
+    ]
+
+    SCALED_DRIVER = r'''
+mod fix44;
+
+use fix44::encoder;
+use fix44::runtime;
+
+fn main() {
+@PARSE@
+    let mut text = [0u8; 32];
+    for (value, scale) in [@FORMAT@] {
+        let count = encoder::write_scaled(&mut text, value, scale);
+        println!("formatted {} {} {}", value, scale, String::from_utf8_lossy(&text[..count]));
+    }
+}
+'''
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_Scaled(self):
+        parse = '\n'.join(f'    println!("parsed {scale} {value} {{}}", runtime::to_scaled::<{scale}>(b"{value}").unwrap_or(0));' for scale, value, _ in self.PARSED_SCALED)
+        format = ', '.join(f'({value if value != -2 ** 63 else "i64::MIN"}, {scale})' for value, scale, _ in self.FORMATTED_SCALED)
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.SCALED_DRIVER.replace('@PARSE@', parse).replace('@FORMAT@', format))
+        self.assertEqual(output, [f'parsed {scale} {value} {scaled or 0}' for scale, value, scaled in self.PARSED_SCALED] + [
+            f'formatted {value} {scale} {text}' for value, scale, text in self.FORMATTED_SCALED])
+
+    # scale, value, the i64 parsed by the generated decoders or None for a malformed or out of range value
+    PARSED_SCALED = [
+        (8, '92233720368.54775807', 2 ** 63 - 1),
+        (8, '-92233720368.54775808', -2 ** 63),
+        (8, '92233720368.54775808', None),
+        (8, '-92233720368.54775809', None),
+        (8, '92233720369', None),
+        (0, '9223372036854775807', 2 ** 63 - 1),
+        (0, '-9223372036854775808', -2 ** 63),
+        (0, '9223372036854775808', None),
+        (0, '12.000', 12),
+        (0, '12.5', None),
+        (18, '9.223372036854775807', 2 ** 63 - 1),
+        (18, '-9.223372036854775808', -2 ** 63),
+        (18, '10', None),
+        (2, '101.25', 10125),
+        (2, '101.250000', 10125),
+        (2, '101.251', None),
+        (2, '-0.05', -5),
+        (2, '.5', 50),
+        (2, '5.', 500),
+        (2, '000000000000000000000001.5', 150),
+        (4, '12345678901234567890', None),
+        (2, '1.2.3', None),
+        (2, '', None),
+        (2, '-', None),
+        (2, '.', None),
+        (2, '1e5', None),
+        (2, '+1', None),
+    ]
+
+    # value, scale, the text written by the generated encoders
+    FORMATTED_SCALED = [
+        (2 ** 63 - 1, 8, '92233720368.54775807'),
+        (-2 ** 63, 8, '-92233720368.54775808'),
+        (-2 ** 63, 0, '-9223372036854775808'),
+        (2 ** 63 - 1, 18, '9.223372036854775807'),
+        (-5, 2, '-0.05'),
+        (10125000000, 8, '101.25'),
+        (0, 8, '0'),
+        (100, 2, '1'),
+        (-1012500000, 8, '-10.125'),
+    ]
+
+    DATA_DRIVER = r'''
+mod fix44;
+
+use fix44::messages::{dispatch, Logon, News};
+use fix44::runtime::FieldHandler;
+
+fn stream(text: &str) -> Vec<u8> {
+    text.bytes().map(|byte| if byte == b'|' { 0x01 } else { byte }).collect()
+}
+
+#[derive(Default)]
+struct Handler<'a> {
+    fields: usize,
+    raw_data: &'a [u8],
+}
+
+impl<'a> FieldHandler<'a> for Handler<'a> {
+    fn on_field(&mut self, index: usize, value: &'a [u8]) {
+        self.fields += 1;
+        if index == 10 {
+            self.raw_data = value;
+        }
+    }
+
+    fn on_unknown_field(&mut self, _tag: &'a [u8], _value: &'a [u8]) {
+        self.fields += 1;
+    }
+}
+
+fn main() {
+    let logon = stream("@LOGON@");
+    let view = Logon::decode(&logon).unwrap();
+    println!("logon {} {:?} {:?}", view.raw_data().unwrap().len(), view.heart_bt_int(), view.signature_length());
+    println!("payload {}", view.raw_data().unwrap() == &stream("@PAYLOAD@")[..]);
+
+    let mut handler = Handler::default();
+    let mut cursor = 0;
+    let handled = dispatch::Logon::decode(&logon, &mut cursor, &mut handler);
+    println!("handler {} {} {}", handled, handler.fields, handler.raw_data == view.raw_data().unwrap());
+
+    let news = stream("@NEWS@");
+    let news_view = News::decode(&news).unwrap();
+    let lines: Vec<String> = news_view
+        .no_lines_of_text()
+        .map(|line| format!("{}:{}", String::from_utf8_lossy(line.text().unwrap()), line.encoded_text().map_or(0, |text| text.len())))
+        .collect();
+    println!("news {} {}", lines.join(" "), String::from_utf8_lossy(news_view.signature().unwrap()));
+
+    println!("short length {:?}", Logon::decode(&stream("35=A|98=0|95=3|96=ab|cd|108=30|")).err());
+    println!("missing length {:?}", Logon::decode(&stream("35=A|98=0|96=ab|108=30|")).err());
+}
+'''
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_DataFields(self):
+        # the payloads hold SOH and text looking like the next field
+        payload = '<x>|10=000|</x>'
+        logon = f'8=FIX.4.4|9=0|35=A|34=1|49=S|52=20250102-10:00:00|56=T|98=0|95={len(payload)}|96={payload}|108=30|93=3|89=S|G|10=000|'
+        lines = ['58=first|354=5|355=58=x||', '58=second|', '58=third|354=1|355=||']
+        news = f'35=B|148=headline|33=3|{"".join(lines)}93=4|89=sign|'
+        driver = self.DATA_DRIVER.replace('@LOGON@', logon).replace('@PAYLOAD@', payload).replace('@NEWS@', news)
+        for dispatch in ['auto', 'trie']:
+            output = self.compile_and_run('resources/FIX44_Data.xml', driver, GeneratorOptions(dispatch=dispatch))
+            self.assertEqual(output, [
+                f'logon {len(payload)} Some(30) Some(3)',
+                'payload true',
+                'handler true 14 true',
+                'news first:5 second:0 third:1 sign',
+                'short length Some(15)',
+                'missing length Some(10)',
+            ], dispatch)
+
+    @unittest.skipUnless(shutil.which('rustc'), 'rustc not available')
+    def test_MessageView(self):
+        output = self.compile_and_run('resources/FIXLF44_Cash.xml', self.VIEW_DRIVER.replace('@MESSAGE@', self.NEW_ORDER_SINGLE))
+        self.assertEqual(output, [
+            'cl_ord_id ORDER-000001',
+            'msg_seq_num Some(7)',
+            'order_qty Some(15000000) price Some(10125000000)',
+            'side Some(Buy) 1 ord_type Some(Limit)',
+            'has_price true has_stop_px false',
+            'parties 2',
+            'party TRADER1 Some(Proprietarycustomcode) Some(ExecutingTrader)',
+            'party FIRM2 Some(KassenvereinNumber) Some(ExecutingFirm)',
+            'symbol BOND',
+            'allocations 0',
+            'required false Some(454)',
+            'partial false Some(8) false Some(447)',
+            'size 464',
+            'enums Some(UserPartyEntitlementsUpdateReport) None Some(Trade) None',
+            'kinds Some(NewOrderSingle) true None None',
+            'decoded ORDER-000001',
+            'as_bytes 2',
+            'fast path 8 10 1 2 16',
+            'malformed Some(10)',
+        ])
+
@@ -0,0 +1,114 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+import unittest
+from app.parser import *
+from app.schema import *
+from app.stream_parser import *
+
+class Testing_StreamParser(unittest.TestCase):
+
+    def test_SameSchemaAsParser(self):
+        for path in ["resources/FIXLF44_Cash.xml", "resources/fix_definition.xml"]:
+            dom_schema = Parser.from_file(path).get_schema("TestPackage")
+            stream_schema = StreamParser.from_file(path).get_schema("TestPackage")
+            self.assertEqual(dom_schema, stream_schema)
+            self.assertEqual(list(dom_schema.message), list(stream_schema.message))
+            self.assertEqual(list(dom_schema.fields), list(stream_schema.fields))
+
+    def test_ReferenceBeforeDefinition(self):
+        xml_ref = '\
+<fix major="4" minor="2">\
+  <header>\
+    <field name="BeginString" required="Y"/>\
+  </header>\
+  <trailer>\
+    <field name="CheckSum" required="Y"/>\
+  </trailer>\
+  <messages>\
+    <message name="TestRequest" msgtype="1">\
+      <field name="TestReqID" required="Y"/>\
+      <group name="NoRelatedSym">\
+        <field name="Symbol" required="Y"/>\
+        <component name="InstrmtLegGrp" required="N"/>\
+      </group>\
+    </message>\
+  </messages>\
+  <components>\
+    <component name="InstrmtLegGrp">\
+        <field name="Side" required="Y"/>\
+    </component>\
+  </components>\
+  <fields>\
+    <field number="8" name="BeginString" type="STRING"/>\
+    <field number="10" name="CheckSum" type="STRING"/>\
+    <field number="55" name="Symbol" type="STRING"/>\
+    <field number="146" name="NoRelatedSym" type="NUMINGROUP"/>\
+    <field number="54" name="Side" type="CHAR">\
+      <value enum="1" description="BUY"/>\
+      <value enum="2" description="SELL"/>\
+    </field>\
+    <field number="112" name="TestReqID" type="STRING"/>\
+  </fields>\
+</fix>\
+'
+        schema_result = StreamParser.from_string(xml_ref).get_schema(None)
+        self.assertEqual(schema_result, Parser.from_string(xml_ref).get_schema(None))
+
+        message_TestRequest = schema_result.message["TestRequest"]
+        self.assertEqual(message_TestRequest.msg_type, "1")
+        group_NoRelatedSym = message_TestRequest.fields["NoRelatedSym"]
+        self.assertEqual(group_NoRelatedSym.required, False)
+        self.assertEqual(list(group_NoRelatedSym.field_by_name), ["Symbol", "InstrmtLegGrp"])
+        self.assertEqual(len(schema_result.fields["Side"].value_by_description), 2)
+
+    def test_UndefinedReferences(self):
+        xml_ref = '\
+<fix major="4" minor="2">\
+  <header><field name="BeginString"/></header>\
+  <trailer><field name="CheckSum"/></trailer>\
+  <messages>\
+    <message name="Heartbeat" msgtype="0">\
+      <component name="Unknown"/>\
+    </message>\
+  </messages>\
+  <fields>\
+    <field number="8" name="BeginString" type="STRING"/>\
+    <field number="10" name="CheckSum" type="STRING"/>\
+  </fields>\
+</fix>\
+'
+        with self.assertRaisesRegex(Exception, 'undefined component "Unknown"'):
+            StreamParser.from_string(xml_ref).get_schema(None)
+        with self.assertRaisesRegex(Exception, 'field "CheckSum" is not present'):
+            StreamParser.from_string(xml_ref.replace('<field number="10" name="CheckSum" type="STRING"/>', '')).get_schema(None)
+        with self.assertRaisesRegex(Exception, 'unsupported tag "value" in the message definition'):
+            StreamParser.from_string(xml_ref.replace('<component name="Unknown"/>', '<value/>'))
+
+    def test_NamespaceAndInclude(self):
+        main_xml = '\
+<f:fix xmlns:f="urn:fix" xmlns:xi="http://www.w3.org/2001/XInclude" major="4" minor="4">\
+  <f:header><f:field name="BeginString" required="Y"/></f:header>\
+  <f:trailer><f:field name="CheckSum" required="Y"/></f:trailer>\
+  <xi:include href="fields.xml"/>\
+</f:fix>\
+'
+        fields_xml = '\
+<fields>\
+  <field number="8" name="BeginString" type="STRING"/>\
+  <field number="10" name="CheckSum" type="STRING"/>\
+</fields>\
+'
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "main.xml"), "w") as main_file:
+                main_file.write(main_xml)
+            with open(os.path.join(directory, "fields.xml"), "w") as fields_file:
+                fields_file.write(fields_xml)
+
+            stream_parser = StreamParser.from_file(os.path.join(directory, "main.xml"))
+            schema_result = stream_parser.get_schema(None)
+            self.assertEqual(stream_parser.included_files, [os.path.join(directory, "fields.xml")])
+            self.assertEqual(list(schema_result.fields), ["BeginString", "CheckSum"])
+            self.assertEqual(schema_result, Parser.from_file(os.path.join(directory, "main.xml")).get_schema(None))
@@ -0,0 +1,81 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import os
+import tempfile
+import unittest
+from app.definition_helper import *
+from app.dispatch import *
+from app.generator import GeneratorBase, GeneratorOptions
+from app.stream_parser import *
+from app.tag_profile import *
+
+class Testing_TagProfile(unittest.TestCase):
+
+    LOG = [
+        '2025-01-02 10:00:00.000 IN 8=FIX.4.4\x019=60\x0135=D\x0134=2\x0149=A\x0156=B\x0111=1\x0155=X\x0154=1\x0138=10\x0144=1.5\x0110=000\x01\n',
+        '2025-01-02 10:00:00.001 IN 8=FIX.4.4|9=60|35=D|34=3|49=A|56=B|11=2|55=X|54=2|38=10|10=000|\n',
+        '2025-01-02 10:00:00.002 session logon\n',
+        '8=FIX.4.4|9=20|35=0|34=4|49=A|56=B|10=000|\n',
+        '8=FIX.4.4|9=20|35=0|34=5|49=A|56=B|10=0',
+    ]
+
+    def test_CollectFromLog(self):
+        profile = TagProfile()
+        profile.add_log(self.LOG)
+        self.assertEqual(profile.message_counts, {'D': 2, '0': 2})
+        self.assertEqual(profile.tag_counts['D'][44], 1)
+        self.assertEqual(profile.tag_counts['D'][35], 2)
+        self.assertEqual(profile.tag_counts['0'][10], 2)
+
+        weights = profile.tag_weights('D')
+        self.assertEqual(weights[55], 1.0)
+        self.assertEqual(weights[44], 0.5)
+        self.assertEqual(profile.tag_weights('8'), {})
+        self.assertEqual(profile.tag_weights(None)[35], 1.0)
+
+    def test_SaveLoadMerge(self):
+        profile = TagProfile()
+        profile.add_log(self.LOG)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            profile.save(path)
+            loaded = TagProfile.load(path)
+        self.assertEqual(loaded, profile)
+        self.assertEqual(loaded.digest(), profile.digest())
+        # the options holding a profile are hashable, the profile is not, it can be changed
+        self.assertEqual(hash(GeneratorOptions(tag_profile=loaded)), hash(GeneratorOptions(tag_profile=profile)))
+        with self.assertRaises(TypeError):
+            hash(profile)
+
+        loaded.merge(profile)
+        self.assertEqual(loaded.message_counts['D'], 4)
+        self.assertEqual(loaded.tag_weights('D'), profile.tag_weights('D'))
+        self.assertNotEqual(loaded.digest(), profile.digest())
+        with self.assertRaisesRegex(Exception, 'unsupported tag profile version'):
+            TagProfile.from_json({'version': 0, 'messages': {}})
+
+    def test_HotTagsFirst(self):
+        tags = [8, 9, 35, 1128, 1129, 1130, 1131, 1132, 1133, 1134, 1135, 1136, 1137, 1138, 1139, 1140, 1141, 1142, 1143, 10]
+        weights = {8: 1.0, 9: 1.0, 35: 1.0, 10: 1.0, 1141: 1.0}
+        dispatch = make_dispatch(tags, 'binary_search', weights)
+        self.assertTrue(dispatch['profiled'])
+        self.assertEqual([hot['tag'] for hot in dispatch['hot_tags']][:5], [8, 9, 35, 1141, 10])
+        self.assertEqual(dispatch['hot_tags'][3]['index'], tags.index(1141))
+        self.assertEqual(make_dispatch(tags, 'binary_search')['hot_tags'], [])
+        self.assertFalse(make_dispatch(tags, 'binary_search')['profiled'])
+
+    def test_TrieOrder(self):
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file("resources/FIXLF44_Cash.xml").get_schema(None))
+        profile = TagProfile()
+        profile.add_log(['8=FIX.4.4|35=0|49=A|49=A|49=A|10=000|', '8=FIX.4.4|35=0|49=A|10=000|'])
+        ir = GeneratorBase.make_ir(schema_definition, GeneratorOptions(dispatch='trie', tag_profile=profile))
+        heartbeat = next(message for message in ir['messages'] if message['name'] == 'Heartbeat')
+        tree = heartbeat['dispatch']['tree']
+        # 49 is read twice per message, the branch of the 4 then of the 9 come first
+        self.assertEqual(tree[0]['label'], '4')
+        self.assertEqual(tree[0]['weight'], 2.0)
+        self.assertEqual(tree[0]['children'][0]['label'], '9')
+        self.assertEqual([node['weight'] for node in tree], sorted([node['weight'] for node in tree], reverse=True))
+
+        self.assertNotEqual(GeneratorOptions(tag_profile=profile).cache_key(), GeneratorOptions().cache_key())
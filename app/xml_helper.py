@@ -5,7 +5,7 @@ from __future__ import annotations
 import os
 import xml.etree.ElementTree as ET
 import xml.etree.ElementInclude as EI
-from typing import ClassVar, Optional, Any
+from typing import ClassVar, Optional, Any, Dict
 
 class SentinelClass:
     instance_: ClassVar[Optional[SentinelClass]] = None
@@ -39,15 +39,18 @@ def load_xml_from_string(string_xml: str) -> ET.Element:
     return root
 
 def attr(node: ET.Element, name: str, default: Any = SENTINEL, cast = SENTINEL) -> Any:
-    if name in node.attrib:
+    return attr_from_dict(node.attrib, node, name, default, cast)
+
+def attr_from_dict(attributes: Dict[str, str], owner: Any, name: str, default: Any = SENTINEL, cast = SENTINEL) -> Any:
+    if name in attributes:
         if isinstance(cast, SentinelClass):
-            return node.attrib[name]
+            return attributes[name]
         else:
             try:
-                return cast(node.attrib[name])
+                return cast(attributes[name])
             except (ValueError, TypeError):
-                raise Exception(f'can\'t cast "{node.attrib[name]}" to "{cast}"')
+                raise Exception(f'can\'t cast "{attributes[name]}" to "{cast}"')
     else:
         if isinstance(default, SentinelClass):
-            raise Exception(f'attribute "{name}" not found in xml-node ({node})')
+            raise Exception(f'attribute "{name}" not found in xml-node ({owner})')
         return default
@@ -0,0 +1,68 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Bulk decoding of a log of FIXLF44_Cash messages into a structured array by MsgType with the columnar decoder,
+    against a loop splitting each message on SOH into a dict of bytes by tag. The throughput is the MB/s of the log,
+    the MsgSeqNum of each MsgType are checked against the ones of the loop.
+
+    python -m benchmarks.bench_columnar [--messages 50000] [--rounds 5] '''
+
+import time
+from argparse import ArgumentParser
+from app.columnar import ColumnarDecoder
+from app.definition_helper import DefinitionHelper
+from app.stream_parser import StreamParser
+from benchmarks.fix_corpus import *
+
+def naive_decode(log: bytes) -> list:
+    ''' a dict of the values by tag for each message, the messages separated by the 8= of BeginString '''
+    messages = []
+    for message in (b'\x01' + log).split(b'\x018=')[1:]:
+        values = {}
+        for field in message.split(b'\x01'):
+            tag, _, value = field.partition(b'=')
+            values[tag] = value
+        messages.append(values)
+    return messages
+
+def best_time(run, rounds: int) -> float:
+    ''' the seconds of the best round '''
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best == None else min(best, elapsed)
+    return best
+
+def main() -> None:
+    parser = ArgumentParser(description='columnar decoding of a log against a split on SOH')
+    parser.add_argument('--messages', default=50000, type=int)
+    parser.add_argument('--rounds', default=5, type=int, help='the best round is kept')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    schema = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file('resources/FIXLF44_Cash.xml').get_schema(None))
+    print(f'{args.messages} messages, {args.rounds} rounds')
+    print(f'{"":<28}{"MB":>8}{"naive MB/s":>14}{"columnar MB/s":>16}{"ratio":>8}')
+    for label, names, fields in [
+        ('ExecutionReport', ['ExecutionReport'], None),
+        ('ExecutionReport 4 columns', ['ExecutionReport'], ['MsgSeqNum', 'SendingTime', 'LastPx', 'Side']),
+        ('mixed', CASH_MESSAGES, None),
+    ]:
+        log = b''.join(frame_message(body) for _, body in CorpusGenerator(ir).corpus(names, args.messages))
+        decoder = ColumnarDecoder(schema, fields=fields)
+        naive_time = best_time(lambda: naive_decode(log), args.rounds)
+        columnar_time = best_time(lambda: decoder.decode(log), args.rounds)
+
+        expected = {}
+        for values in naive_decode(log):
+            expected.setdefault(values[b'35'].decode(), []).append(int(values[b'34']))
+        tables = decoder.decode(log)
+        if {msg_type: rows['MsgSeqNum'].tolist() for msg_type, rows in tables.items()} != expected:
+            raise Exception(f'the columns of {label} are not the values of the messages')
+        megabytes = len(log) / 1e6
+        print(f'{label:<28}{megabytes:>8.1f}{megabytes / naive_time:>14.1f}{megabytes / columnar_time:>16.1f}{naive_time / columnar_time:>8.2f}')
+
+if __name__ == '__main__':
+    main()
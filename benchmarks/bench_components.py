@@ -0,0 +1,37 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Scaling of the component resolution with the nesting depth and the number of references.
+
+    python -m benchmarks.bench_components
+
+    The time per resolved field has to stay flat when the depth or the number of references grows. '''
+
+import time
+from app.definition_helper import DefinitionHelper
+from app.stream_parser import StreamParser
+from benchmarks.synthetic_schema import generate_nested_dictionary
+
+def resolve(depth: int, references: int, repeat: int = 5) -> tuple:
+    schema = StreamParser.from_string(generate_nested_dictionary(depth, references)).get_schema(None)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        schema_definition = DefinitionHelper.generate_schema_definition_from_schema_parser(schema)
+        timings.append(time.perf_counter() - start)
+    resolved_fields = sum(len(message.fields) for message in schema_definition.messages.values())
+    return min(timings), resolved_fields
+
+def report(title: str, cases: list) -> None:
+    print(title)
+    print(f'{"depth":>8}{"references":>12}{"fields":>10}{"ms":>10}{"ns/field":>10}')
+    for depth, references in cases:
+        elapsed, resolved_fields = resolve(depth, references)
+        print(f'{depth:>8}{references:>12}{resolved_fields:>10}{elapsed * 1000:>10.1f}{elapsed * 1e9 / resolved_fields:>10.0f}')
+
+def main() -> None:
+    report('nesting depth, 50 references', [(depth, 50) for depth in (5, 10, 20, 40, 80)])
+    report('references, depth 20', [(20, references) for references in (25, 50, 100, 200, 400)])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Decoding of messages carrying a DATA payload of 4 KB and 64 KB: the C++ view jumps over the payload with the
+    value of its LENGTH field, the scan baseline looks for the SOH ending each value as a decoder without the pairing
+    would. The payloads hold no SOH so that both decoders find the same fields. Needs g++.
+
+    python -m benchmarks.bench_data_fields [--messages 200] [--repeat 20] [--rounds 7] '''
+
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from app.generation.cpp import Generator as CppGenerator
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_data_fields'
+
+""" the sizes of the payloads of a corpus """
+PAYLOAD_SIZES = [4096, 65536]
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <vector>
+#include "fix_data_fields/messages.h"
+
+// the fields of the message found value by value, the payload is read up to its end
+static std::size_t scan(const char* cursor, const char* end)
+{
+    std::size_t fields = 0;
+    while (cursor != end) {
+        const char* value_end = static_cast<const char*>(std::memchr(cursor, fix_data_fields::SOH, static_cast<std::size_t>(end - cursor)));
+        if (value_end == nullptr) {
+            return 0;
+        }
+        cursor = value_end + 1;
+        ++fields;
+    }
+    return fields;
+}
+
+// the size of the payload, 0 for a malformed message
+static std::size_t decode(const char* begin, const char* end)
+{
+    fix_data_fields::XMLnonFIXView view;
+    if (!view.decode(begin, end) || !view.has_required_fields()) {
+        return 0;
+    }
+    return view.xml_data().size();
+}
+
+int main(int argc, char** argv)
+{
+    std::ifstream file(argv[1], std::ios::binary);
+    const std::vector<char> corpus((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    const std::size_t message_size = static_cast<std::size_t>(std::atol(argv[2]));
+    const int repeat = std::atoi(argv[3]);
+    const int rounds = std::atoi(argv[4]);
+    const bool with_scan = std::strcmp(argv[5], "scan") == 0;
+
+    double best = 0;
+    std::size_t checksum = 0;
+    for (int round = 0; round < rounds; ++round) {
+        const auto start = std::chrono::steady_clock::now();
+        for (int iteration = 0; iteration < repeat; ++iteration) {
+            for (std::size_t offset = 0; offset < corpus.size(); offset += message_size) {
+                const char* begin = corpus.data() + offset;
+                const std::size_t decoded = with_scan ? scan(begin, begin + message_size) : decode(begin, begin + message_size);
+                if (decoded == 0) {
+                    std::printf("malformed message\\n");
+                    return 1;
+                }
+                checksum += decoded;
+            }
+        }
+        const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+        if (best == 0 || elapsed < best) {
+            best = elapsed;
+        }
+    }
+    std::printf("%.3f %zu\\n", double(corpus.size()) * repeat / best * 1e3, checksum);
+    return 0;
+}
+'''
+
+def write_corpus(path: str, payload_size: int, count: int) -> int:
+    ''' XMLnonFIX messages of the same size, each one with its own payload, returns the size of a message '''
+    generator = random.Random(1)
+    sizes = set()
+    with open(path, 'wb') as corpus_file:
+        for sequence in range(count):
+            payload = ''.join(generator.choice('<>/=abcdefghij 0123456789') for _ in range(payload_size))
+            body = [(35, 'n'), (34, str(100000 + sequence)), (49, 'SENDER'), (52, '20250102-10:00:00.000'), (56, 'TARGET'),
+                    (212, str(payload_size)), (213, payload)]
+            encoded = frame_message(body)
+            sizes.add(len(encoded))
+            corpus_file.write(encoded)
+    assert len(sizes) == 1
+    return sizes.pop()
+
+def main() -> None:
+    parser = ArgumentParser(description='decoding of messages carrying a DATA payload')
+    parser.add_argument('--messages', default=200, type=int)
+    parser.add_argument('--repeat', default=20, type=int, help='passes over the corpus per round')
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    args = parser.parse_args()
+    if not shutil.which('g++'):
+        print('g++ not available')
+        return
+
+    ir = load_ir('resources/FIX44_Data.xml')
+    ir['package'] = PACKAGE
+    with tempfile.TemporaryDirectory() as directory:
+        CppGenerator(directory).generate_from_ir(ir)
+        with open(os.path.join(directory, 'main.cpp'), 'w') as main_file:
+            main_file.write(CPP_MAIN)
+        executable = os.path.join(directory, 'bench_cpp')
+        subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+
+        print(f'{args.messages} XMLnonFIX messages per payload size, {args.rounds} rounds of {args.repeat} passes')
+        print(f'{"payload":>10} {"skip MB/s":>12} {"scan MB/s":>12}')
+        for payload_size in PAYLOAD_SIZES:
+            corpus_path = os.path.join(directory, 'corpus.bin')
+            message_size = write_corpus(corpus_path, payload_size, args.messages)
+            results = []
+            for mode in ['skip', 'scan']:
+                throughput, _ = subprocess.run([executable, corpus_path, str(message_size), str(args.repeat), str(args.rounds), mode],
+                                               check=True, capture_output=True, text=True).stdout.split()
+                results.append(float(throughput))
+            print(f'{payload_size // 1024:>8} KB {results[0]:>12.0f} {results[1]:>12.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Parsing of PRICE values with the to_scaled of the generated decoders, an int64 scaled by 10^8, against strtod
+    in C++ and str::parse::<f64> in Rust. The corpus mixes prices of 0 to 8 decimals as the exchanges send them,
+    every value is checked against the rounded double before the timing. Needs g++ and/or rustc.
+
+    python -m benchmarks.bench_decimal [--values 1000000] [--rounds 7] [--turns 3] '''
+
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from app.generation.cpp import Generator as CppGenerator
+from app.generation.rust import Generator as RustGenerator
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_decimal'
+
+""" the decimals of a PRICE field """
+SCALE = 8
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <string>
+#include <vector>
+#include "fix_decimal/runtime.h"
+
+using namespace fix_decimal;
+
+int main(int argc, char** argv)
+{
+    std::ifstream corpus(argv[1]);
+    const bool scaled = std::string(argv[2]) == "scaled";
+    const int rounds = std::atoi(argv[3]);
+    std::vector<std::string> values;
+    for (std::string value; std::getline(corpus, value);) {
+        values.push_back(value);
+    }
+    for (const std::string& value : values) {
+        if (detail::to_scaled<@SCALE@>(value) != std::llround(std::strtod(value.c_str(), nullptr) * 1e@SCALE@)) {
+            std::printf("mismatch %s\\n", value.c_str());
+            return 1;
+        }
+    }
+    double best = 0;
+    std::int64_t checksum = 0;
+    for (int round = 0; round < rounds; ++round) {
+        const auto start = std::chrono::steady_clock::now();
+        for (const std::string& value : values) {
+            if (scaled) {
+                checksum += detail::to_scaled<@SCALE@>(value);
+            } else {
+                checksum += static_cast<std::int64_t>(std::strtod(value.c_str(), nullptr));
+            }
+        }
+        const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+        if (best == 0 || elapsed < best) {
+            best = elapsed;
+        }
+    }
+    std::printf("%.3f %lld\\n", best / double(values.size()), static_cast<long long>(checksum));
+    return 0;
+}
+'''
+
+RUST_MAIN = '''
+mod fix_decimal;
+
+use fix_decimal::runtime;
+use std::time::Instant;
+
+fn main() {
+    let arguments: Vec<String> = std::env::args().collect();
+    let corpus = std::fs::read_to_string(&arguments[1]).unwrap();
+    let scaled = arguments[2] == "scaled";
+    let rounds: usize = arguments[3].parse().unwrap();
+    let values: Vec<&str> = corpus.lines().collect();
+    for value in &values {
+        if runtime::to_scaled::<@SCALE@>(value.as_bytes()) != Some((value.parse::<f64>().unwrap() * 1e@SCALE@).round() as i64) {
+            println!("mismatch {}", value);
+            std::process::exit(1);
+        }
+    }
+    let mut best = f64::MAX;
+    let mut checksum: i64 = 0;
+    for _ in 0..rounds {
+        let start = Instant::now();
+        for value in &values {
+            if scaled {
+                checksum = checksum.wrapping_add(runtime::to_scaled::<@SCALE@>(std::hint::black_box(value.as_bytes())).unwrap_or(0));
+            } else {
+                checksum = checksum.wrapping_add(std::hint::black_box(value).parse::<f64>().unwrap_or(0.0) as i64);
+            }
+        }
+        best = best.min(start.elapsed().as_nanos() as f64);
+    }
+    println!("{:.3} {}", best / values.len() as f64, checksum);
+}
+'''
+
+def price_corpus(count: int, seed: int = 1) -> list:
+    ''' prices of 0 to SCALE decimals, most of them of 2 to 4 as in the order flow '''
+    generator = random.Random(seed)
+    values = []
+    for _ in range(count):
+        decimals = generator.choice([0, 2, 2, 2, 3, 4, 4, 6, SCALE])
+        value = f'{generator.randint(1, 99999999) / 10 ** 4:.{decimals}f}'
+        values.append(value if generator.random() > 0.05 else '-' + value)
+    return values
+
+def build_cpp(directory: str, ir: dict) -> str:
+    CppGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, 'bench_cpp.cpp'), 'w') as main_file:
+        main_file.write(CPP_MAIN.replace('@SCALE@', str(SCALE)))
+    executable = os.path.join(directory, 'bench_cpp')
+    subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, 'bench_cpp.cpp')], check=True)
+    return executable
+
+def build_rust(directory: str, ir: dict) -> str:
+    RustGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, 'bench_rust.rs'), 'w') as main_file:
+        main_file.write(RUST_MAIN.replace('@SCALE@', str(SCALE)))
+    executable = os.path.join(directory, 'bench_rust')
+    subprocess.run(['rustc', '--edition', '2021', '-O', '-A', 'dead_code', '-A', 'unused_imports', '-o', executable, os.path.join(directory, 'bench_rust.rs')], check=True)
+    return executable
+
+def best_in_turns(executable: str, corpus_path: str, rounds: int, turns: int) -> tuple:
+    ''' the best ns per value of strtod or parse and of to_scaled, run in turns so that both see the same load '''
+    best = {}
+    for _ in range(turns):
+        for parser in ['double', 'scaled']:
+            output = subprocess.run([executable, corpus_path, parser, str(rounds)], check=True, capture_output=True, text=True).stdout
+            per_value = float(output.split()[0])
+            best[parser] = min(best.get(parser, per_value), per_value)
+    return best['double'], best['scaled']
+
+def main() -> None:
+    parser = ArgumentParser(description='parsing of PRICE values with to_scaled and with strtod')
+    parser.add_argument('--values', default=1000000, type=int)
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    parser.add_argument('--turns', default=3, type=int)
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    print(f'{args.values} prices of scale {SCALE}, {args.rounds} rounds, {args.turns} turns')
+    print(f'{"":<8}{"double ns/value":>18}{"scaled ns/value":>18}{"speedup":>10}')
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, 'prices.txt')
+        with open(corpus_path, 'w') as corpus_file:
+            corpus_file.write('\n'.join(price_corpus(args.values)) + '\n')
+        if shutil.which('g++'):
+            results['c++'] = best_in_turns(build_cpp(directory, ir), corpus_path, args.rounds, args.turns)
+        if shutil.which('rustc'):
+            results['rust'] = best_in_turns(build_rust(directory, ir), corpus_path, args.rounds, args.turns)
+    for language, (double_ns, scaled_ns) in results.items():
+        print(f'{language:<8}{double_ns:>18.1f}{scaled_ns:>18.1f}{double_ns / scaled_ns:>9.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Encoding of a NewOrderSingle of FIXLF44_Cash with the generated C++ and Rust encoders: the header, three parties,
+    the instrument and the order, about 300 bytes framed with BodyLength and CheckSum. The MsgSeqNum, quantity and
+    price change with each message, the target is under 200 ns per message. Needs g++ and/or rustc.
+
+    python -m benchmarks.bench_encoder [--messages 1000000] [--rounds 7] '''
+
+import os
+import shutil
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from collections import namedtuple
+from app.generation.cpp import Generator as CppGenerator
+from app.generation.python import Generator as PythonGenerator
+from app.generation.rust import Generator as RustGenerator
+from app.generator import GeneratorBase
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_encoder'
+
+""" the target of the encoding of one NewOrderSingle """
+TARGET_NS = 200
+
+""" a UTCTIMESTAMP value, nanoseconds since the epoch written with precision decimals """
+Timestamp = namedtuple('Timestamp', ['nanoseconds', 'precision'])
+
+""" the fields of the NewOrderSingle in the order of the message: field, value. A group field has the number of its
+    entries, its entries follow it. SEQUENCE is replaced by the number of the message, a microsecond apart """
+ORDER_FIELDS = [
+    ('MsgSeqNum', 'SEQUENCE'), ('SenderCompID', 'SENDER'), ('SendingTime', Timestamp('1735812000000000000 + SEQUENCE * 1000', 3)), ('TargetCompID', 'TARGET'),
+    ('NoPartyIDs', [
+        [('PartyID', 'TRADER-0001'), ('PartyIDSource', None), ('PartyRole', None)],
+        [('PartyID', 'FIRM-0002'), ('PartyIDSource', None), ('PartyRole', None)],
+        [('PartyID', 'CLIENT-0003'), ('PartyIDSource', None), ('PartyRole', None)],
+    ]),
+    ('Symbol', 'DE0001102580'), ('SecurityID', 'DE0001102580'), ('SecurityIDSource', None),
+    ('NoSecurityAltID', [[('SecurityAltID', 'DE0001102580'), ('SecurityAltIDSource', None)]]),
+    ('CouponRate', (250, 2)), ('DeliveryType', None), ('LastCouponDeviationIndicator', None), ('RefinancingEligibilityIndicator', None),
+    ('NoValueChecks', [[('ValueCheckType', None), ('ValueCheckAction', None)]]),
+    ('ClOrdID', 'ORDER-0000000042'), ('OrderQty', ('SEQUENCE % 1000 + 100', 0)), ('OrdType', None),
+    ('Price', ('SEQUENCE % 100 + 10000', 2)), ('Side', None), ('TimeInForce', None), ('TradingCapacity', None),
+]
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include "fix_encoder/encoder.h"
+
+using namespace fix_encoder;
+
+int main(int argc, char** argv)
+{
+    const std::int64_t messages = std::atoll(argv[1]);
+    const int rounds = std::atoi(argv[2]);
+    static char buffer[1024];
+    NewOrderSingleEncoder order(buffer, sizeof(buffer), "FIX.4.4");
+@SETUP@
+    double best = 0;
+    std::uint64_t checksum = 0;
+    for (int round = 0; round < rounds; ++round) {
+        const auto start = std::chrono::steady_clock::now();
+        for (std::int64_t sequence = 1; sequence <= messages; ++sequence) {
+@ENCODE@
+            const std::string_view message = order.finish();
+            checksum += message.size() + static_cast<unsigned char>(message[message.size() - 2]);
+        }
+        const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+        if (best == 0 || elapsed < best) {
+            best = elapsed;
+        }
+    }
+    std::printf("%.3f %llu\\n", best / double(messages), static_cast<unsigned long long>(checksum));
+    return 0;
+}
+'''
+
+RUST_MAIN = '''
+mod fix_encoder;
+
+use fix_encoder::encoder::NewOrderSingleEncoder;
+use fix_encoder::fields::*;
+use fix_encoder::runtime::{Decimal, Timestamp};
+use std::time::Instant;
+
+fn main() {
+    let arguments: Vec<String> = std::env::args().collect();
+    let messages: i64 = arguments[1].parse().unwrap();
+    let rounds: usize = arguments[2].parse().unwrap();
+    let mut buffer = [0u8; 1024];
+    let mut order = NewOrderSingleEncoder::new(&mut buffer, b"FIX.4.4");
+@SETUP@
+    let mut best = f64::MAX;
+    let mut checksum: u64 = 0;
+    for _ in 0..rounds {
+        let start = Instant::now();
+        for sequence in 1..=messages {
+@ENCODE@
+            let message = order.finish().unwrap();
+            checksum += message.len() as u64 + message[message.len() - 2] as u64;
+        }
+        best = best.min(start.elapsed().as_nanos() as f64);
+    }
+    println!("{:.3} {}", best / messages as f64, checksum);
+}
+'''
+
+def first_variant(fields: dict, name: str) -> str:
+    return GeneratorBase.variant_name(fields[name]['values'][0]['name'])
+
+def timestamp_argument(value: Timestamp, language: str) -> str:
+    nanoseconds = value.nanoseconds.replace('SEQUENCE', 'sequence')
+    if language == 'python':
+        return f'{nanoseconds}, {value.precision}'
+    return f'Timestamp{{{nanoseconds}, {value.precision}}}' if language == 'c++' else f'Timestamp {{ nanoseconds: {nanoseconds}, precision: {value.precision} }}'
+
+def decimal_argument(mantissa: str, scale: int, language: str) -> str:
+    if language == 'python':
+        return f'runtime.Decimal({mantissa}, {scale})'
+    return f'Decimal{{{mantissa}, {scale}}}' if language == 'c++' else f'Decimal {{ mantissa: {mantissa}, scale: {scale} }}'
+
+def encode_calls(ir: dict, language: str, order_fields: list = ORDER_FIELDS, start: str = 'order.start()', indent: int = 12) -> str:
+    ''' the calls of the encoders for the fields after start, the groups through their entry encoders. The language
+        is c++, rust or python '''
+    fields = {field['name']: field for field in ir['fields']}
+    accessor_name = {'c++': CppGenerator.accessor_name, 'rust': RustGenerator.accessor_name, 'python': PythonGenerator.accessor_name}[language]
+    end = '' if language == 'python' else ';'
+    def call(name: str, value) -> str:
+        if value == None:
+            argument = f'fields.{name}.{PythonGenerator.enum_variant_name(first_variant(fields, name))}' if language == 'python' else f'{name}::{first_variant(fields, name)}'
+        elif isinstance(value, Timestamp):
+            argument = timestamp_argument(value, language)
+        elif isinstance(value, tuple) and fields[name].get('scale') != None:
+            # a PRICE, QTY, AMT or PERCENTAGE field takes the value scaled to the decimals of the field
+            argument = f'({value[0]}) * {10 ** (fields[name]["scale"] - value[1])}'.replace('SEQUENCE', 'sequence')
+        elif isinstance(value, tuple):
+            argument = decimal_argument(str(value[0]).replace('SEQUENCE', 'sequence'), value[1], language)
+        elif value == 'SEQUENCE':
+            argument = 'sequence'
+        else:
+            argument = f'"{value}"' if language == 'c++' else f'b"{value}"'
+        return f'.{accessor_name(name)}({argument})'
+    lines = [start]
+    for name, value in order_fields:
+        if isinstance(value, list):
+            lines[-1] += end
+            entries = ''.join(call(entry_name, entry_value) for entry in value for entry_name, entry_value in entry)
+            lines.append(f'order.{accessor_name(name)}({len(value)}){entries}{end}')
+            lines.append('order')
+        else:
+            lines[-1] += call(name, value)
+    lines[-1] += end
+    return '\n'.join(' ' * indent + line for line in lines)
+
+def build_cpp(directory: str, ir: dict, encode: str = None, setup: str = '', name: str = 'bench_cpp') -> str:
+    ''' the executable encoding the messages, the calls of ORDER_FIELDS by default '''
+    CppGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, f'{name}.cpp'), 'w') as main_file:
+        main_file.write(CPP_MAIN.replace('@SETUP@', setup).replace('@ENCODE@', encode or encode_calls(ir, 'c++')))
+    executable = os.path.join(directory, name)
+    subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, f'{name}.cpp')], check=True)
+    return executable
+
+def build_rust(directory: str, ir: dict, encode: str = None, setup: str = '', name: str = 'bench_rust') -> str:
+    RustGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, f'{name}.rs'), 'w') as main_file:
+        main_file.write(RUST_MAIN.replace('@SETUP@', setup).replace('@ENCODE@', encode or encode_calls(ir, 'rust')))
+    executable = os.path.join(directory, name)
+    subprocess.run(['rustc', '--edition', '2021', '-O', '-A', 'unused_imports', '-o', executable, os.path.join(directory, f'{name}.rs')], check=True)
+    return executable
+
+def run(executable: str, messages: int, rounds: int) -> tuple:
+    ''' the best ns per message and the checksum of the messages '''
+    per_message, checksum = subprocess.run([executable, str(messages), str(rounds)], check=True, capture_output=True, text=True).stdout.split()
+    return float(per_message), checksum
+
+def bench_cpp(directory: str, ir: dict, messages: int, rounds: int) -> tuple:
+    return run(build_cpp(directory, ir), messages, rounds)
+
+def bench_rust(directory: str, ir: dict, messages: int, rounds: int) -> tuple:
+    return run(build_rust(directory, ir), messages, rounds)
+
+def main() -> None:
+    parser = ArgumentParser(description='encoding of a NewOrderSingle with the generated encoders')
+    parser.add_argument('--messages', default=1000000, type=int)
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    print(f'{args.messages} NewOrderSingle, {args.rounds} rounds, target {TARGET_NS} ns/msg')
+    print(f'{"":<8}{"ns/msg":>12}')
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        if shutil.which('g++'):
+            results['c++'] = bench_cpp(directory, ir, args.messages, args.rounds)
+        if shutil.which('rustc'):
+            results['rust'] = bench_rust(directory, ir, args.messages, args.rounds)
+    for language, (per_message, _) in results.items():
+        print(f'{language:<8}{per_message:>12.1f}{"" if per_message < TARGET_NS else "  over target"}')
+    if len(set(checksum for _, checksum in results.values())) > 1:
+        raise Exception('the encoders wrote different messages')
+
+if __name__ == '__main__':
+    main()
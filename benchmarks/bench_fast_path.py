@@ -0,0 +1,152 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Hit rate of the schema order fast path of the C++ views, by the ratio of the optional fields present in the
+    messages: with every field present the tags follow the dictionary and the tag dispatch is only used on the
+    repeating groups. Each corpus is decoded once counting in FastPathStats per SenderCompID, then timed without
+    statistics. Needs g++.
+
+    python -m benchmarks.bench_fast_path [--messages 20000] [--repeat 20] [--rounds 7] '''
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from app.generation.cpp import Generator as CppGenerator
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_fast_path'
+
+""" the ratios of the optional fields present in a corpus """
+OPTIONAL_RATIOS = [1.0, 0.75, 0.5, 0.25, 0.0]
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <type_traits>
+#include <vector>
+#include "fix_fast_path/messages.h"
+
+struct Record
+{
+    std::uint32_t kind;
+    const char* begin;
+    const char* end;
+};
+
+// the bytes decoded, 0 for a malformed message
+template <typename Stats>
+static std::size_t decode(std::uint32_t kind, const char* begin, const char* end, Stats& stats, fix_fast_path::CounterpartyStats* counterparties)
+{
+    switch (kind) {
+@CASES@
+    }
+    return 0;
+}
+
+int main(int argc, char** argv)
+{
+    std::ifstream file(argv[1], std::ios::binary);
+    const std::vector<char> corpus((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    const int repeat = std::atoi(argv[2]);
+    const int rounds = std::atoi(argv[3]);
+    std::vector<Record> records;
+    for (std::size_t offset = 0; offset < corpus.size();) {
+        std::uint32_t header[2];
+        std::memcpy(header, corpus.data() + offset, sizeof(header));
+        offset += sizeof(header);
+        records.push_back(Record{header[0], corpus.data() + offset, corpus.data() + offset + header[1]});
+        offset += header[1];
+    }
+
+    fix_fast_path::CounterpartyStats counterparties;
+    for (const Record& record : records) {
+        fix_fast_path::FastPathStats stats;
+        if (decode(record.kind, record.begin, record.end, stats, &counterparties) == 0) {
+            std::printf("malformed message\\n");
+            return 1;
+        }
+    }
+    fix_fast_path::FastPathStats total;
+    for (const auto& counterparty : counterparties.by_counterparty()) {
+        total += counterparty.second;
+    }
+
+    double best = 0;
+    std::size_t decoded = 0;
+    for (int round = 0; round < rounds; ++round) {
+        const auto start = std::chrono::steady_clock::now();
+        for (int iteration = 0; iteration < repeat; ++iteration) {
+            for (const Record& record : records) {
+                fix_fast_path::detail::NoFastPathStats stats;
+                decoded += decode(record.kind, record.begin, record.end, stats, nullptr);
+            }
+        }
+        const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+        if (best == 0 || elapsed < best) {
+            best = elapsed;
+        }
+    }
+    std::printf("%.3f %.4f %zu %zu\\n", best / double(records.size() * repeat), total.hit_rate(), counterparties.by_counterparty().size(), decoded);
+    return 0;
+}
+'''
+
+def cpp_cases(messages: list) -> str:
+    cases = []
+    for kind, message in enumerate(messages):
+        cases += [f'    case {kind}: {{', f'        {PACKAGE}::{message["name"]}View view;',
+                  '        if (!view.decode(begin, end, stats)) {', '            return 0;', '        }',
+                  '        if constexpr (std::is_same_v<Stats, fix_fast_path::FastPathStats>) {',
+                  '            counterparties->record(view.sender_comp_id(), stats);', '        }',
+                  '        return view.size();', '    }']
+    return '\n'.join(cases)
+
+def write_corpus(path: str, ir: dict, message_names: list, count: int, optional_ratio: float) -> int:
+    ''' framed messages with their fields in the order of the dictionary, returns the size of the corpus '''
+    size = 0
+    with open(path, 'wb') as corpus_file:
+        for name, body in CorpusGenerator(ir, optional_ratio=optional_ratio).corpus(message_names, count):
+            encoded = frame_message(body)
+            corpus_file.write(struct.pack('<II', message_names.index(name), len(encoded)))
+            corpus_file.write(encoded)
+            size += len(encoded)
+    return size
+
+def main() -> None:
+    parser = ArgumentParser(description='hit rate of the schema order fast path of the C++ views')
+    parser.add_argument('--messages', default=20000, type=int)
+    parser.add_argument('--repeat', default=20, type=int, help='passes over the corpus per round')
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    args = parser.parse_args()
+    if not shutil.which('g++'):
+        print('g++ not available')
+        return
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    messages = [message for name in CASH_MESSAGES for message in ir['messages'] if message['name'] == name]
+    with tempfile.TemporaryDirectory() as directory:
+        CppGenerator(directory).generate_from_ir(ir)
+        with open(os.path.join(directory, 'main.cpp'), 'w') as main_file:
+            main_file.write(CPP_MAIN.replace('@CASES@', cpp_cases(messages)))
+        executable = os.path.join(directory, 'bench_cpp')
+        subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+
+        print(f'{args.messages} messages of {", ".join(CASH_MESSAGES)}, {args.rounds} rounds of {args.repeat} passes')
+        print(f'{"optional":>10} {"hit rate":>10} {"senders":>8} {"ns/msg":>10}')
+        for optional_ratio in OPTIONAL_RATIOS:
+            corpus_path = os.path.join(directory, 'corpus.bin')
+            write_corpus(corpus_path, ir, CASH_MESSAGES, args.messages, optional_ratio)
+            per_message, hit_rate, senders, _ = subprocess.run([executable, corpus_path, str(args.repeat), str(args.rounds)],
+                                                            check=True, capture_output=True, text=True).stdout.split()
+            print(f'{optional_ratio:>10.2f} {float(hit_rate):>10.1%} {senders:>8} {float(per_message):>10.1f}')
+
+if __name__ == '__main__':
+    main()
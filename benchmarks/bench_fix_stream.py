@@ -0,0 +1,107 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Reception of FIXLF44_Cash messages replayed at full speed by a loopback server, framed by FixStreamReader and
+    FixProtocol (read by batches of the messages received) and by a loop appending each read to a bytes buffer and
+    slicing each message off it, the StreamReader read by 64 KB and 1 MB. Each reader only frames the messages, then
+    frames and decodes them with the generated Python codec.
+
+    python -m benchmarks.bench_fix_stream [--messages 50000] [--rounds 3] '''
+
+import asyncio
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from app.definition_helper import DefinitionHelper
+from app.fix_stream import FixProtocol, FixStreamReader
+from app.stream_parser import StreamParser
+from benchmarks.bench_python_codec import PACKAGE, load_codec
+from benchmarks.fix_corpus import *
+
+async def naive_reader(reader: asyncio.StreamReader, decode, read_size: int) -> int:
+    ''' the messages of the stream, the buffer is copied by each read and each message '''
+    buffer = b''
+    count = 0
+    while True:
+        data = await reader.read(read_size)
+        if len(data) == 0:
+            return count
+        buffer += data
+        while True:
+            length_start = buffer.find(b'\x019=')
+            length_end = buffer.find(b'\x01', length_start + 1) if length_start != -1 else -1
+            if length_end == -1:
+                break
+            end = length_end + 1 + int(buffer[length_start + 3:length_end]) + 7
+            if end > len(buffer):
+                break
+            message, buffer = buffer[:end], buffer[end:]
+            if decode != None:
+                decode(message)
+            count += 1
+
+async def stream_reader(reader: asyncio.StreamReader, schema, decode, read_size: int) -> int:
+    stream = FixStreamReader(reader, schema, decode, read_size)
+    count = 0
+    while True:
+        messages = await stream.read_messages()
+        if len(messages) == 0:
+            return count
+        count += len(messages)
+
+async def receive(data: bytes, client) -> float:
+    ''' the seconds from the connection to the last message received by client, a coroutine counting the messages
+        of a connection '''
+    async def replay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(data)
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+    server = await asyncio.start_server(replay, '127.0.0.1', 0)
+    async with server:
+        port = server.sockets[0].getsockname()[1]
+        start = time.perf_counter()
+        await client(port)
+        return time.perf_counter() - start
+
+def main() -> None:
+    parser = ArgumentParser(description='framing and decoding of FIX messages received from a loopback server')
+    parser.add_argument('--messages', default=50000, type=int)
+    parser.add_argument('--rounds', default=3, type=int, help='the best round is kept')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    schema = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file('resources/FIXLF44_Cash.xml').get_schema(None))
+    data = b''.join(frame_message(body) for _, body in CorpusGenerator(ir).corpus(CASH_MESSAGES, args.messages))
+
+    with tempfile.TemporaryDirectory() as directory:
+        codec = load_codec(directory, ir)
+        print(f'{args.messages} messages, {len(data) / 1e6:.1f} MB, {args.rounds} rounds')
+        print(f'{"":<22}{"frame msg/s":>14}{"frame MB/s":>12}{"decode msg/s":>14}')
+        for label, read_size in [('bytes buffer 64K', 64 << 10), ('bytes buffer 1M', 1 << 20), ('FixStreamReader 64K', 64 << 10), ('FixStreamReader 1M', 1 << 20), ('FixProtocol', None)]:
+            rates = []
+            for decode in [None, codec.messages.decode_message]:
+                async def client(port: int) -> None:
+                    if label == 'FixProtocol':
+                        transport, protocol = await asyncio.get_running_loop().create_connection(lambda: FixProtocol(schema, decode), '127.0.0.1', port)
+                        count = 0
+                        while True:
+                            messages = await protocol.read_messages()
+                            if len(messages) == 0:
+                                break
+                            count += len(messages)
+                        transport.close()
+                    else:
+                        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                        count = await (naive_reader(reader, decode, read_size) if label.startswith('bytes buffer') else stream_reader(reader, schema, decode, read_size))
+                        writer.close()
+                    if count != args.messages:
+                        raise Exception(f'{label} received {count} messages of {args.messages}')
+                rates.append(args.messages / min(asyncio.run(receive(data, client)) for _ in range(args.rounds)))
+            print(f'{label:<22}{rates[0]:>14,.0f}{rates[0] * len(data) / args.messages / 1e6:>12.1f}{rates[1]:>14,.0f}')
+        sys.path.remove(directory)
+
+if __name__ == '__main__':
+    main()
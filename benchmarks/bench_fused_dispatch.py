@@ -0,0 +1,356 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Decoding of the fields of FIXLF44_Cash messages: the generated trie fused with the tag parsing against
+    parsing the tag as an integer then a switch on it. Both deliver the same fields to the same handler,
+    the checksums of the handlers must match. Needs g++ and/or rustc.
+
+    python -m benchmarks.bench_fused_dispatch [--messages 20000] [--repeat 20] [--rounds 7] '''
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from app.generation.cpp import Generator as CppGenerator
+from app.generation.rust import Generator as RustGenerator
+from app.generator import GeneratorOptions
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_fused'
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <iterator>
+#include <vector>
+#include "fix_fused/messages.h"
+#include "baseline.h"
+
+struct ChecksumHandler
+{
+    std::uint64_t checksum = 0;
+    std::uint64_t fields = 0;
+
+    template <int Index>
+    void on_field(std::string_view value)
+    {
+        checksum = checksum * 31 + Index + value.size();
+        ++fields;
+    }
+
+    void on_unknown_field(std::string_view tag, std::string_view value)
+    {
+        checksum = checksum * 31 + tag.size() * 1000 + value.size();
+        ++fields;
+    }
+};
+
+struct Record
+{
+    std::uint32_t kind;
+    const char* begin;
+    const char* end;
+};
+
+struct Result
+{
+    double best = 0;
+    std::uint64_t fields = 0;
+    std::uint64_t checksum = 0;
+};
+
+template <typename Decode>
+void run(Result& result, const std::vector<Record>& records, int repeat, Decode decode)
+{
+    ChecksumHandler handler;
+    const auto start = std::chrono::steady_clock::now();
+    for (int iteration = 0; iteration < repeat; ++iteration) {
+        for (const Record& record : records) {
+            const char* cursor = record.begin;
+            if (!decode(record.kind, cursor, record.end, handler)) {
+                std::printf("malformed message\\n");
+                std::exit(1);
+            }
+        }
+    }
+    const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+    if (result.best == 0 || elapsed < result.best) {
+        result.best = elapsed;
+    }
+    result.fields = handler.fields;
+    result.checksum = handler.checksum;
+}
+
+void print(const char* name, const Result& result, std::size_t messages)
+{
+    std::printf("%s %.3f %.3f %llu\\n", name, result.best / double(messages), result.best / double(result.fields),
+                static_cast<unsigned long long>(result.checksum));
+}
+
+int main(int argc, char** argv)
+{
+    std::ifstream file(argv[1], std::ios::binary);
+    const std::vector<char> corpus((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    const int repeat = std::atoi(argv[2]);
+    const int rounds = std::atoi(argv[3]);
+    std::vector<Record> records;
+    for (std::size_t offset = 0; offset < corpus.size();) {
+        std::uint32_t header[2];
+        std::memcpy(header, corpus.data() + offset, sizeof(header));
+        offset += sizeof(header);
+        records.push_back(Record{header[0], corpus.data() + offset, corpus.data() + offset + header[1]});
+        offset += header[1];
+    }
+
+    // the rounds alternate the decoders, the best round of each is kept
+    Result fused;
+    Result baseline;
+    for (int round = 0; round < rounds; ++round) {
+        run(fused, records, repeat, [](std::uint32_t kind, const char*& cursor, const char* end, ChecksumHandler& handler) {
+            switch (kind) {
+@FUSED_CASES@
+            }
+            return false;
+        });
+        run(baseline, records, repeat, [](std::uint32_t kind, const char*& cursor, const char* end, ChecksumHandler& handler) {
+            switch (kind) {
+@SWITCH_CASES@
+            }
+            return false;
+        });
+    }
+    print("fused", fused, records.size() * repeat);
+    print("switch", baseline, records.size() * repeat);
+    return 0;
+}
+'''
+
+RUST_MAIN = '''
+mod fix_fused;
+mod baseline;
+
+use fix_fused::runtime::FieldHandler;
+use std::time::Instant;
+
+struct ChecksumHandler {
+    checksum: u64,
+    fields: u64,
+}
+
+impl<'a> FieldHandler<'a> for ChecksumHandler {
+    #[inline(always)]
+    fn on_field(&mut self, index: usize, value: &'a [u8]) {
+        self.checksum = self.checksum.wrapping_mul(31).wrapping_add((index + value.len()) as u64);
+        self.fields += 1;
+    }
+    #[inline(always)]
+    fn on_unknown_field(&mut self, tag: &'a [u8], value: &'a [u8]) {
+        self.checksum = self.checksum.wrapping_mul(31).wrapping_add((tag.len() * 1000 + value.len()) as u64);
+        self.fields += 1;
+    }
+}
+
+#[derive(Default)]
+struct BenchResult {
+    best: f64,
+    fields: u64,
+    checksum: u64,
+}
+
+fn run<F: Fn(u32, &[u8], &mut ChecksumHandler) -> bool>(result: &mut BenchResult, records: &[(u32, &[u8])], repeat: usize, decode: F) {
+    let mut handler = ChecksumHandler { checksum: 0, fields: 0 };
+    let start = Instant::now();
+    for _ in 0..repeat {
+        for &(kind, input) in records {
+            if !decode(kind, input, &mut handler) {
+                println!("malformed message");
+                std::process::exit(1);
+            }
+        }
+    }
+    let elapsed = start.elapsed().as_nanos() as f64;
+    if result.best == 0.0 || elapsed < result.best {
+        result.best = elapsed;
+    }
+    result.fields = handler.fields;
+    result.checksum = handler.checksum;
+}
+
+fn print(name: &str, result: &BenchResult, messages: usize) {
+    println!("{} {:.3} {:.3} {}", name, result.best / messages as f64, result.best / result.fields as f64, result.checksum);
+}
+
+fn main() {
+    let arguments: Vec<String> = std::env::args().collect();
+    let corpus = std::fs::read(&arguments[1]).unwrap();
+    let repeat: usize = arguments[2].parse().unwrap();
+    let rounds: usize = arguments[3].parse().unwrap();
+    let mut records = Vec::new();
+    let mut offset = 0;
+    while offset < corpus.len() {
+        let kind = u32::from_le_bytes(corpus[offset..offset + 4].try_into().unwrap());
+        let length = u32::from_le_bytes(corpus[offset + 4..offset + 8].try_into().unwrap()) as usize;
+        offset += 8;
+        records.push((kind, &corpus[offset..offset + length]));
+        offset += length;
+    }
+
+    // the rounds alternate the decoders, the best round of each is kept
+    let mut fused = BenchResult::default();
+    let mut baseline = BenchResult::default();
+    for _ in 0..rounds {
+        run(&mut fused, &records, repeat, |kind, input, handler| {
+            let mut cursor = 0;
+            match kind {
+@FUSED_CASES@
+                _ => false,
+            }
+        });
+        run(&mut baseline, &records, repeat, |kind, input, handler| {
+            let mut cursor = 0;
+            match kind {
+@SWITCH_CASES@
+                _ => false,
+            }
+        });
+    }
+    print("fused", &fused, records.len() * repeat);
+    print("switch", &baseline, records.len() * repeat);
+}
+'''
+
+def cpp_baseline(messages: list) -> str:
+    ''' the parse integer then switch decoder, on the helpers of the generated runtime '''
+    lines = ['#pragma once', '#include "fix_fused/runtime.h"', 'namespace baseline {']
+    for message in messages:
+        lines += [f'struct {message["name"]}', '{',
+                  '    template <typename Handler>',
+                  '    static int decode_field(const char*& cursor, const char* end, Handler& handler)',
+                  '    {',
+                  '        const char* tag_begin = cursor;',
+                  '        std::uint32_t tag = 0;',
+                  f'        if (!{PACKAGE}::detail::parse_tag(cursor, end, tag)) {{',
+                  '            return -2;',
+                  '        }',
+                  '        switch (tag) {']
+        for index, field in enumerate(message['fields_by_order']):
+            lines += [f'        case {field["id"]}:', f'            return {PACKAGE}::detail::deliver_field<{index}>(cursor, cursor, end, handler);']
+        lines += ['        default:', f'            return {PACKAGE}::detail::deliver_unknown_value(tag_begin, cursor, end, handler);',
+                  '        }', '    }',
+                  '    template <typename Handler>',
+                  '    static bool decode(const char*& cursor, const char* end, Handler& handler)',
+                  '    {',
+                  '        while (cursor != end) {',
+                  '            if (decode_field(cursor, end, handler) == -2) {',
+                  '                return false;',
+                  '            }',
+                  '        }',
+                  '        return true;',
+                  '    }',
+                  '};']
+    lines.append('} // namespace baseline')
+    return '\n'.join(lines) + '\n'
+
+def rust_baseline(messages: list) -> str:
+    lines = [f'use super::{PACKAGE}::runtime::{{self, FieldHandler}};']
+    for message in messages:
+        lines += [f'pub struct {message["name"]};', f'impl {message["name"]} {{',
+                  '    #[inline]',
+                  "    pub fn decode_field<'a, H: FieldHandler<'a>>(input: &'a [u8], cursor: &mut usize, handler: &mut H) -> i32 {",
+                  '        let tag_begin = *cursor;',
+                  '        let tag = match runtime::parse_tag(input, cursor) {',
+                  '            Some(tag) => tag,',
+                  '            None => return -2,',
+                  '        };',
+                  '        match tag {']
+        for index, field in enumerate(message['fields_by_order']):
+            lines.append(f'            {field["id"]} => runtime::deliver_field(input, cursor, *cursor, {index}, handler),')
+        lines += ['            _ => runtime::deliver_unknown_value(input, tag_begin, cursor, handler),',
+                  '        }', '    }',
+                  "    pub fn decode<'a, H: FieldHandler<'a>>(input: &'a [u8], cursor: &mut usize, handler: &mut H) -> bool {",
+                  '        while *cursor != input.len() {',
+                  '            if Self::decode_field(input, cursor, handler) == -2 {',
+                  '                return false;',
+                  '            }',
+                  '        }',
+                  '        true',
+                  '    }',
+                  '}']
+    return '\n'.join(lines) + '\n'
+
+def write_corpus(path: str, ir: dict, message_names: list, count: int) -> None:
+    ''' the bodies without framing, a message body only has the tags of its own dispatch '''
+    corpus = CorpusGenerator(ir, with_groups=False).corpus(message_names, count)
+    with open(path, 'wb') as corpus_file:
+        for name, body in corpus:
+            encoded = encode_fields(body)
+            corpus_file.write(struct.pack('<II', message_names.index(name), len(encoded)))
+            corpus_file.write(encoded)
+
+def parse_output(output: str) -> dict:
+    results = {}
+    for line in output.splitlines():
+        name, per_message, per_field, checksum = line.split()
+        results[name] = (float(per_message), float(per_field), checksum)
+    return results
+
+def print_results(language: str, results: dict) -> None:
+    for name in ['switch', 'fused']:
+        per_message, per_field, _ = results[name]
+        print(f'{language:<8}{name:<10}{per_message:>12.1f}{per_field:>12.2f}')
+    if results['switch'][2] != results['fused'][2]:
+        raise Exception(f'{language}: the decoders delivered different fields')
+    print(f'{language:<8}{"speedup":<10}{results["switch"][0] / results["fused"][0]:>12.2f}x')
+
+def bench_cpp(directory: str, ir: dict, messages: list, corpus_path: str, repeat: int, rounds: int) -> None:
+    CppGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, 'baseline.h'), 'w') as baseline_file:
+        baseline_file.write(cpp_baseline(messages))
+    fused_cases = '\n'.join(f'            case {kind}: return {PACKAGE}::dispatch::{message["name"]}::decode(cursor, end, handler);' for kind, message in enumerate(messages))
+    switch_cases = '\n'.join(f'            case {kind}: return baseline::{message["name"]}::decode(cursor, end, handler);' for kind, message in enumerate(messages))
+    with open(os.path.join(directory, 'main.cpp'), 'w') as main_file:
+        main_file.write(CPP_MAIN.replace('@FUSED_CASES@', fused_cases).replace('@SWITCH_CASES@', switch_cases))
+    executable = os.path.join(directory, 'bench_cpp')
+    subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+    output = subprocess.run([executable, corpus_path, str(repeat), str(rounds)], check=True, capture_output=True, text=True).stdout
+    print_results('c++', parse_output(output))
+
+def bench_rust(directory: str, ir: dict, messages: list, corpus_path: str, repeat: int, rounds: int) -> None:
+    RustGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, 'baseline.rs'), 'w') as baseline_file:
+        baseline_file.write(rust_baseline(messages))
+    fused_cases = '\n'.join(f'                {kind} => {PACKAGE}::messages::dispatch::{message["name"]}::decode(input, &mut cursor, handler),' for kind, message in enumerate(messages))
+    switch_cases = '\n'.join(f'                {kind} => baseline::{message["name"]}::decode(input, &mut cursor, handler),' for kind, message in enumerate(messages))
+    with open(os.path.join(directory, 'main.rs'), 'w') as main_file:
+        main_file.write(RUST_MAIN.replace('@FUSED_CASES@', fused_cases).replace('@SWITCH_CASES@', switch_cases))
+    executable = os.path.join(directory, 'bench_rust')
+    subprocess.run(['rustc', '--edition', '2021', '-O', '-A', 'dead_code', '-o', executable, os.path.join(directory, 'main.rs')], check=True)
+    output = subprocess.run([executable, corpus_path, str(repeat), str(rounds)], check=True, capture_output=True, text=True).stdout
+    print_results('rust', parse_output(output))
+
+def main() -> None:
+    parser = ArgumentParser(description='fused trie dispatch against parse integer then switch')
+    parser.add_argument('--messages', default=20000, type=int)
+    parser.add_argument('--repeat', default=20, type=int, help='passes over the corpus per round')
+    parser.add_argument('--rounds', default=7, type=int, help='the decoders alternate, the best round is kept')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml', GeneratorOptions(dispatch='trie'))
+    ir['package'] = PACKAGE
+    messages = [message for name in CASH_MESSAGES for message in ir['messages'] if message['name'] == name]
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, 'corpus.bin')
+        write_corpus(corpus_path, ir, CASH_MESSAGES, args.messages)
+        print(f'{args.messages} messages of {", ".join(CASH_MESSAGES)}, {os.path.getsize(corpus_path)} bytes, {args.rounds} rounds of {args.repeat} passes')
+        print(f'{"":<8}{"decoder":<10}{"ns/msg":>12}{"ns/field":>12}')
+        if shutil.which('g++'):
+            bench_cpp(directory, ir, messages, corpus_path, args.repeat, args.rounds)
+        if shutil.which('rustc'):
+            bench_rust(directory, ir, messages, corpus_path, args.repeat, args.rounds)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Indexing of a log of FIXLF44_Cash messages and queries by ClOrdID and by MsgSeqNum, against a scan of the log
+    splitting each message on SOH for the same query. The index is built once, then updated with a tenth more
+    messages appended to the log. The queries are then timed on an index of --records synthetic records, the size
+    of the index of a log of several GB, against a loop unpacking each record.
+
+    python -m benchmarks.bench_log_index [--messages 100000] [--queries 20] [--records 5000000] '''
+
+import os
+import random
+import tempfile
+import time
+from argparse import ArgumentParser
+import numpy as np
+from app.log_index import LogIndex
+from benchmarks.fix_corpus import *
+
+def scan_log(path: str, tag: bytes, value: bytes) -> list:
+    ''' the messages of the log with the value for tag, the messages separated by the 8= of BeginString '''
+    with open(path, 'rb') as log_file:
+        data = b'\x01' + log_file.read()
+    found = []
+    for message in data.split(b'\x018=')[1:]:
+        for field in message.split(b'\x01'):
+            if field.partition(b'=')[0::2] == (tag, value):
+                found.append(b'8=' + message + b'\x01')
+                break
+    return found
+
+def scan_records(index: LogIndex, msg_seq_num: int) -> list:
+    ''' the offsets of the records of msg_seq_num, each record of the index unpacked '''
+    with open(index.index_path, 'rb') as index_file:
+        records = index_file.read()[len(index.header()):]
+    return [record[0] for record in index.record.iter_unpack(records[:len(records) - len(records) % index.record.size]) if record[2] == msg_seq_num]
+
+def write_records(index: LogIndex, count: int) -> None:
+    ''' an index of count records of D, 8 and 0 messages one millisecond apart, MsgSeqNum and ClOrdID hashes random '''
+    generator = np.random.default_rng(1)
+    records = np.zeros(count, dtype=index.record_dtype)
+    records['length'] = 200
+    records['offset'] = np.arange(count, dtype=np.uint64) * 200
+    records['msg_seq_num'] = generator.integers(1, 1 << 24, count)
+    records['sending_time'] = 1735812000000000000 + np.arange(count, dtype=np.int64) * 1000000
+    records['msg_type'] = np.array([b'D', b'8', b'0'])[generator.integers(0, 3, count)]
+    records['key0'] = generator.integers(1, np.iinfo(np.uint64).max, count, dtype=np.uint64, endpoint=True)
+    with open(index.index_path, 'wb') as index_file:
+        index_file.write(index.header())
+        index_file.write(records.tobytes())
+
+def main() -> None:
+    parser = ArgumentParser(description='queries of a log through its index against a scan of the log')
+    parser.add_argument('--messages', default=100000, type=int)
+    parser.add_argument('--queries', default=20, type=int)
+    parser.add_argument('--records', default=5000000, type=int, help='records of the synthetic index')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    schema = LogIndex.schema_from_file('resources/FIXLF44_Cash.xml')
+    bodies = [body for _, body in CorpusGenerator(ir).corpus(CASH_MESSAGES, args.messages + args.messages // 10)]
+    corpus = [frame_message(body) for body in bodies]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'session.log')
+        with open(path, 'wb') as log_file:
+            log_file.write(b''.join(corpus[:args.messages]))
+        index = LogIndex(path, schema, ['ClOrdID'])
+        start = time.perf_counter()
+        index.update()
+        build = time.perf_counter() - start
+        with open(path, 'ab') as log_file:
+            log_file.write(b''.join(corpus[args.messages:]))
+        start = time.perf_counter()
+        appended = index.update()
+        update = time.perf_counter() - start
+        size = os.path.getsize(path)
+        print(f'{len(corpus)} messages, {size / 1e6:.1f} MB of log, {os.path.getsize(index.index_path) / 1e6:.1f} MB of index')
+        print(f'build {args.messages / build:,.0f} msg/s, update of {appended} messages {update * 1000:.0f} ms')
+
+        values = sorted({field[1] for body in bodies for field in body if field[0] == 11})
+        picked = random.Random(1).sample(values, min(args.queries, len(values)))
+        start = time.perf_counter()
+        indexed = [list(index.read(index.find(keys={'ClOrdID': value.encode()}))) for value in picked]
+        query = (time.perf_counter() - start) / len(picked)
+        start = time.perf_counter()
+        scanned = [scan_log(path, b'11', value.encode()) for value in picked[:3]]
+        scan = (time.perf_counter() - start) / len(scanned)
+        if indexed[:3] != scanned:
+            raise Exception('the messages found by the index are not the ones of the scan')
+        print(f'ClOrdID query {query * 1000:.1f} ms through the index, {scan * 1000:.1f} ms scanning the log')
+        start = time.perf_counter()
+        for sequence in range(1, args.queries + 1):
+            index.find(msg_seq_num=sequence)
+        print(f'MsgSeqNum query {(time.perf_counter() - start) / args.queries * 1000:.1f} ms through the index')
+
+        large = LogIndex(path, schema, ['ClOrdID'], os.path.join(directory, 'large.idx'))
+        write_records(large, args.records)
+        print(f'{args.records} records, {os.path.getsize(large.index_path) / 1e6:.0f} MB of index')
+        times = {}
+        for label, query in [('MsgSeqNum', lambda: large.find(msg_seq_num=12345)),
+                             ('MsgType and a minute of SendingTime', lambda: large.find(msg_type='8', since=1735815600000000000, until=1735815660000000000)),
+                             ('absent ClOrdID', lambda: large.find(keys={'ClOrdID': b'ABSENT'}))]:
+            start = time.perf_counter()
+            query()
+            times[label] = time.perf_counter() - start
+            print(f'{label} query {times[label] * 1000:.0f} ms through the index')
+        start = time.perf_counter()
+        scanned = scan_records(large, 12345)
+        scan = time.perf_counter() - start
+        if scanned != [entry.offset for entry in large.find(msg_seq_num=12345)]:
+            raise Exception('the records found by the index are not the ones of the unpacking loop')
+        print(f'MsgSeqNum query {scan * 1000:.0f} ms unpacking each record, {scan / times["MsgSeqNum"]:.0f}x')
+
+if __name__ == '__main__':
+    main()
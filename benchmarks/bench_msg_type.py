@@ -0,0 +1,115 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Routing of messages by MsgType: the generated message_kind() of FIXLF44_Cash, a perfect hash of the packed
+    MsgType, against a std::unordered_map<std::string, int> from the MsgType to the kind. Both see the same
+    MsgType values taken uniformly over the types of the schema, the checksums must match. Needs g++.
+
+    python -m benchmarks.bench_msg_type [--lookups 1000000] [--rounds 7] '''
+
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from app.generation.cpp import Generator as CppGenerator
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_routing'
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <iterator>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "fix_routing/messages.h"
+
+template <typename Lookup>
+double run(const std::vector<std::string_view>& msg_types, int rounds, std::uint64_t& checksum, Lookup lookup)
+{
+    double best = 0;
+    for (int round = 0; round < rounds; ++round) {
+        std::uint64_t sum = 0;
+        const auto start = std::chrono::steady_clock::now();
+        for (std::string_view msg_type : msg_types) {
+            sum += static_cast<std::uint64_t>(lookup(msg_type));
+        }
+        const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+        if (best == 0 || elapsed < best) {
+            best = elapsed;
+        }
+        checksum = sum;
+    }
+    return best / double(msg_types.size());
+}
+
+int main(int argc, char** argv)
+{
+    std::ifstream file(argv[1], std::ios::binary);
+    const std::string input((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    const int rounds = std::atoi(argv[2]);
+    std::vector<std::string_view> msg_types;
+    for (std::size_t begin = 0; begin < input.size();) {
+        const std::size_t end = input.find('\\n', begin);
+        msg_types.emplace_back(input.data() + begin, end - begin);
+        begin = end + 1;
+    }
+    const std::unordered_map<std::string, int> kinds = {
+@MAP_ENTRIES@
+    };
+
+    std::uint64_t hash_checksum = 0;
+    std::uint64_t map_checksum = 0;
+    const double hash = run(msg_types, rounds, hash_checksum, [](std::string_view msg_type) {
+        return static_cast<int>(fix_routing::message_kind(msg_type));
+    });
+    const double map = run(msg_types, rounds, map_checksum, [&kinds](std::string_view msg_type) {
+        const auto found = kinds.find(std::string(msg_type));
+        return found == kinds.end() ? @UNKNOWN@ : found->second;
+    });
+    std::printf("perfect_hash %.3f %llu\\n", hash, static_cast<unsigned long long>(hash_checksum));
+    std::printf("unordered_map %.3f %llu\\n", map, static_cast<unsigned long long>(map_checksum));
+    return 0;
+}
+'''
+
+def main() -> None:
+    parser = ArgumentParser(description='generated MsgType perfect hash against std::unordered_map')
+    parser.add_argument('--lookups', default=1000000, type=int)
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    args = parser.parse_args()
+    if not shutil.which('g++'):
+        print('g++ not available')
+        return
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    msg_types = [message['type'] for message in ir['messages']]
+    generator = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'msg_types.txt')
+        with open(input_path, 'w') as input_file:
+            input_file.write(''.join(generator.choice(msg_types) + '\n' for _ in range(args.lookups)))
+        CppGenerator(directory).generate_from_ir(ir)
+        map_entries = ',\n'.join(f'        {{"{msg_type}", {kind}}}' for kind, msg_type in enumerate(msg_types))
+        with open(os.path.join(directory, 'main.cpp'), 'w') as main_file:
+            main_file.write(CPP_MAIN.replace('@MAP_ENTRIES@', map_entries).replace('@UNKNOWN@', str(len(msg_types))))
+        executable = os.path.join(directory, 'bench_msg_type')
+        subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+        output = subprocess.run([executable, input_path, str(args.rounds)], check=True, capture_output=True, text=True).stdout
+    results = {name: (float(per_lookup), checksum) for name, per_lookup, checksum in (line.split() for line in output.splitlines())}
+    print(f'{args.lookups} lookups over the {len(msg_types)} MsgTypes of FIXLF44_Cash, best of {args.rounds} rounds')
+    print(f'{"":<16}{"ns/lookup":>12}')
+    for name, (per_lookup, _) in results.items():
+        print(f'{name:<16}{per_lookup:>12.2f}')
+    if results['perfect_hash'][1] != results['unordered_map'][1]:
+        raise Exception('the lookups found different kinds')
+    print(f'{"speedup":<16}{results["unordered_map"][0] / results["perfect_hash"][0]:>11.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Columnar decoding of a log file of FIXLF44_Cash messages in 1, 2, 4, 8 and 16 processes against the decoding of
+    the mapped file in this process. The times include the start of the processes, the rows of every run are
+    checked to be the ones of the single process decoding. The speedup is bounded by the cores of the machine.
+
+    python -m benchmarks.bench_parallel_decoder [--messages 200000] [--rounds 3] [--workers 1 2 4 8 16] '''
+
+import mmap
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+from app.columnar import ColumnarDecoder
+from app.definition_helper import DefinitionHelper
+from app.parallel_decoder import ParallelDecoder
+from app.stream_parser import StreamParser
+from benchmarks.fix_corpus import *
+
+def best_time(run, rounds: int) -> float:
+    ''' the seconds of the best round '''
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best == None else min(best, elapsed)
+    return best
+
+def main() -> None:
+    parser = ArgumentParser(description='columnar decoding of a log file in several processes')
+    parser.add_argument('--messages', default=200000, type=int)
+    parser.add_argument('--rounds', default=3, type=int, help='the best round is kept')
+    parser.add_argument('--workers', default=[1, 2, 4, 8, 16], type=int, nargs='+')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    schema = DefinitionHelper.generate_schema_definition_from_schema_parser(StreamParser.from_file('resources/FIXLF44_Cash.xml').get_schema(None))
+    decoder = ColumnarDecoder(schema)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'session.log')
+        with open(path, 'wb') as log_file:
+            for _, body in CorpusGenerator(ir).corpus(CASH_MESSAGES, args.messages):
+                log_file.write(frame_message(body))
+        megabytes = os.path.getsize(path) / 1e6
+        print(f'{args.messages} messages, {megabytes:.1f} MB, {os.cpu_count()} cores, {args.rounds} rounds')
+        print(f'{"":<16}{"MB/s":>10}{"speedup":>10}')
+
+        with open(path, 'rb') as log_file, mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            expected = decoder.decode(data)
+            single = best_time(lambda: decoder.decode(data), args.rounds)
+        print(f'{"single process":<16}{megabytes / single:>10.1f}{1:>10.2f}')
+        for workers in args.workers:
+            # 4 chunks by worker to balance them
+            parallel = ParallelDecoder(decoder, workers, max(os.path.getsize(path) // (workers * 4), 1 << 20))
+            tables = parallel.decode(path)
+            if list(tables) != list(expected) or any(tables[msg_type].tobytes() != rows.tobytes() for msg_type, rows in expected.items()):
+                raise Exception(f'the rows decoded by {workers} workers are not the ones of a single process')
+            elapsed = best_time(lambda: parallel.decode(path), args.rounds)
+            print(f'{f"{workers} workers":<16}{megabytes / elapsed:>10.1f}{single / elapsed:>10.2f}')
+
+if __name__ == '__main__':
+    main()
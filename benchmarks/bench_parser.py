@@ -0,0 +1,81 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Peak RSS and wall time of the DOM loader (Parser) against the streaming loader (StreamParser).
+
+    python -m benchmarks.bench_parser [--scale 20]
+
+    Every measure runs in a fresh interpreter, so the peak RSS of one loader does not hide the other one. '''
+
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser, SUPPRESS
+from benchmarks.synthetic_schema import generate_dictionary
+
+LOADERS = ['dom', 'stream']
+
+def load_schema(loader: str, path: str):
+    if loader == 'dom':
+        from app.parser import Parser
+        return Parser.from_file(path).get_schema(None)
+    from app.stream_parser import StreamParser
+    return StreamParser.from_file(path).get_schema(None)
+
+def measure(loader: str, path: str, repeat: int) -> dict:
+    # import the modules before taking the baseline
+    from app.parser import Parser
+    from app.stream_parser import StreamParser
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        schema = load_schema(loader, path)
+        timings.append(time.perf_counter() - start)
+        del schema
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'wall_ms': statistics.median(timings) * 1000.0,
+        'peak_rss_kb': peak_kb,
+        'delta_rss_kb': peak_kb - baseline_kb,
+    }
+
+def run_isolated(loader: str, path: str, repeat: int) -> dict:
+    output = subprocess.check_output([sys.executable, '-m', 'benchmarks.bench_parser', '--measure', loader, '--path', path, '--repeat', str(repeat)])
+    return json.loads(output)
+
+def main() -> None:
+    parser = ArgumentParser(prog='bench_parser', description='DOM against streaming dictionary loader')
+    parser.add_argument('--scale', help='multiplier of the synthetic dictionary size', default=20, type=int)
+    parser.add_argument('--repeat', help='number of loads per measure', default=5, type=int)
+    parser.add_argument('--measure', help=SUPPRESS, choices=LOADERS)
+    parser.add_argument('--path', help=SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.path, args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic_path = os.path.join(directory, 'synthetic.xml')
+        with open(synthetic_path, 'w') as synthetic_file:
+            synthetic_file.write(generate_dictionary(
+                number_of_fields = 1000 * args.scale,
+                number_of_components = 50 * args.scale,
+                number_of_messages = 100 * args.scale))
+
+        inputs = [('FIXLF44_Cash.xml', 'resources/FIXLF44_Cash.xml'), (f'synthetic x{args.scale}', synthetic_path)]
+        print(f'{"dictionary":<22}{"size":>10}{"loader":>8}{"wall ms":>10}{"peak RSS MB":>13}{"delta MB":>10}')
+        for name, path in inputs:
+            size_kb = os.path.getsize(path) // 1024
+            for loader in LOADERS:
+                result = run_isolated(loader, path, args.repeat)
+                print(f'{name:<22}{size_kb:>8}KB{loader:>8}{result["wall_ms"]:>10.1f}{result["peak_rss_kb"] / 1024:>13.1f}{result["delta_rss_kb"] / 1024:>10.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Decoding and encoding of NewOrderSingle and ExecutionReport of FIXLF44_Cash with the generated Python codec.
+    The decoders read synthetic messages with their repeating groups, MsgSeqNum and the entries of the groups are
+    read back. The encoders write the NewOrderSingle of bench_encoder and an ExecutionReport of the same order, the
+    encoded messages are decoded again to check them.
+
+    python -m benchmarks.bench_python_codec [--messages 20000] [--rounds 5] '''
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from app.generation.python import Generator as PythonGenerator
+from benchmarks.bench_encoder import ORDER_FIELDS, Timestamp, encode_calls
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_python'
+
+""" the fields of an ExecutionReport filling the NewOrderSingle of ORDER_FIELDS, same layout """
+EXECUTION_FIELDS = [
+    ('MsgSeqNum', 'SEQUENCE'), ('SenderCompID', 'TARGET'), ('SendingTime', Timestamp('1735812000000000000 + SEQUENCE * 1000', 3)), ('TargetCompID', 'SENDER'),
+    ('NoPartyIDs', [
+        [('PartyID', 'TRADER-0001'), ('PartyIDSource', None), ('PartyRole', None)],
+        [('PartyID', 'FIRM-0002'), ('PartyIDSource', None), ('PartyRole', None)],
+    ]),
+    ('Symbol', 'DE0001102580'), ('SecurityID', 'DE0001102580'), ('SecurityIDSource', None),
+    ('NoSecurityAltID', [[('SecurityAltID', 'DE0001102580'), ('SecurityAltIDSource', None)]]),
+    ('CouponRate', (250, 2)), ('DeliveryType', None), ('LastCouponDeviationIndicator', None), ('RefinancingEligibilityIndicator', None),
+    ('ClOrdID', 'ORDER-0000000042'), ('Currency', 'EUR'), ('CumQty', ('SEQUENCE % 1000 + 100', 0)), ('ExecID', 'EXEC-0000000042'),
+    ('LastPx', ('SEQUENCE % 100 + 10000', 2)), ('LastQty', ('SEQUENCE % 1000 + 100', 0)), ('OrderID', 'OID-0000000042'),
+    ('OrderQty', ('SEQUENCE % 1000 + 100', 0)), ('OrdStatus', None), ('OrdType', None), ('Price', ('SEQUENCE % 100 + 10000', 2)),
+    ('Side', None), ('TimeInForce', None), ('ExecType', None), ('LeavesQty', (0, 0)), ('TradingCapacity', None),
+]
+
+""" the messages benchmarked and the fields of their encoders """
+BENCHMARKED_MESSAGES = {'NewOrderSingle': ORDER_FIELDS, 'ExecutionReport': EXECUTION_FIELDS}
+
+def load_codec(directory: str, ir: dict):
+    ''' the generated package imported from directory '''
+    PythonGenerator(directory).generate_from_ir(ir)
+    sys.path.insert(0, directory)
+    importlib.invalidate_caches()
+    return importlib.import_module(PACKAGE)
+
+def make_encode(ir: dict, name: str, order_fields: list):
+    ''' a function encoding the message number sequence, the calls of bench_encoder in Python '''
+    source = f'def encode(order, sequence):\n{encode_calls(ir, "python", order_fields, "order.start()", 4)}\n    return order.finish()\n'
+    namespace = {}
+    exec(source, {'fields': importlib.import_module(f'{PACKAGE}.fields'), 'runtime': importlib.import_module(f'{PACKAGE}.runtime')}, namespace)
+    return namespace['encode']
+
+def best_rate(run, count: int, rounds: int) -> float:
+    ''' the messages per second of the best round '''
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best == None else min(best, elapsed)
+    return count / best
+
+def bench_decode(message_class, message: dict, corpus: list, rounds: int) -> float:
+    group_accessors = [PythonGenerator.accessor_name(field['name']) for field in message['fields_by_order'] if field['token'] == 'group']
+    def run() -> None:
+        checksum = 0
+        for data in corpus:
+            decoded = message_class.decode(data)
+            checksum += decoded.msg_seq_num
+            for accessor in group_accessors:
+                checksum += len(getattr(decoded, accessor))
+    return best_rate(run, len(corpus), rounds)
+
+def main() -> None:
+    parser = ArgumentParser(description='decoding and encoding with the generated Python codec')
+    parser.add_argument('--messages', default=20000, type=int)
+    parser.add_argument('--rounds', default=5, type=int, help='the best round is kept')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    print(f'{args.messages} messages of each type, {args.rounds} rounds')
+    print(f'{"":<18}{"decode msg/s":>14}{"encode msg/s":>14}{"bytes":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        load_codec(directory, ir)
+        messages = importlib.import_module(f'{PACKAGE}.messages')
+        encoder = importlib.import_module(f'{PACKAGE}.encoder')
+        for name, order_fields in BENCHMARKED_MESSAGES.items():
+            message_class = getattr(messages, name)
+            corpus = [frame_message(body) for _, body in CorpusGenerator(ir).corpus([name], args.messages)]
+            decode_rate = bench_decode(message_class, next(message for message in ir['messages'] if message['name'] == name), corpus, args.rounds)
+
+            encode = make_encode(ir, name, order_fields)
+            order = getattr(encoder, f'{name}Encoder')(b'FIX.4.4')
+            encode_rate = best_rate(lambda: [encode(order, sequence) for sequence in range(1, args.messages + 1)], args.messages, args.rounds)
+            encoded = encode(order, 42)
+            if message_class.decode(encoded).msg_seq_num != 42:
+                raise Exception(f'the {name} encoded does not decode')
+            print(f'{name:<18}{decode_rate:>14,.0f}{encode_rate:>14,.0f}{len(encoded):>8}')
+        sys.path.remove(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Encoding of the NewOrderSingle of bench_encoder with the header fields appended by each message, then with a
+    session header rendered once and only its MsgSeqNum and SendingTime slots patched. The saving per message of a
+    high rate order stream is the difference. The two encoders run in turns, the best of each is kept. Needs g++
+    and/or rustc.
+
+    python -m benchmarks.bench_session_header [--messages 1000000] [--rounds 7] [--turns 5] '''
+
+import shutil
+import tempfile
+from argparse import ArgumentParser
+from benchmarks.bench_encoder import ORDER_FIELDS, PACKAGE, build_cpp, build_rust, encode_calls, run, timestamp_argument
+from benchmarks.fix_corpus import *
+
+""" the header fields of ORDER_FIELDS, the session header holds the static ones """
+HEADER_FIELDS = ['MsgSeqNum', 'SenderCompID', 'SendingTime', 'TargetCompID']
+
+SENDING_TIME = dict(ORDER_FIELDS)['SendingTime']
+
+CPP_SETUP = '''    SessionHeader header;
+    header.sender_comp_id("SENDER").target_comp_id("TARGET");'''
+
+RUST_SETUP = '''    let mut header = fix_encoder::encoder::SessionHeader::default();
+    header.sender_comp_id(b"SENDER").target_comp_id(b"TARGET");'''
+
+def best_in_turns(executables: list, messages: int, rounds: int, turns: int) -> list:
+    ''' the best ns per message of each executable, run in turns so that both see the same load '''
+    best = [None] * len(executables)
+    for _ in range(turns):
+        for index, executable in enumerate(executables):
+            per_message, _ = run(executable, messages, rounds)
+            best[index] = per_message if best[index] == None else min(best[index], per_message)
+    return best
+
+def main() -> None:
+    parser = ArgumentParser(description='encoding of a NewOrderSingle with and without a session header')
+    parser.add_argument('--messages', default=1000000, type=int)
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    parser.add_argument('--turns', default=5, type=int)
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    body_fields = [field for field in ORDER_FIELDS if field[0] not in HEADER_FIELDS]
+    print(f'{args.messages} NewOrderSingle, {args.rounds} rounds, {args.turns} turns')
+    print(f'{"":<8}{"fields ns/msg":>16}{"header ns/msg":>16}{"saving":>10}')
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        if shutil.which('g++'):
+            results['c++'] = best_in_turns([
+                build_cpp(directory, ir, name='fields_cpp'),
+                build_cpp(directory, ir, encode_calls(ir, 'c++', body_fields, f'order.start(header, sequence, {timestamp_argument(SENDING_TIME, "c++")})'), CPP_SETUP, 'header_cpp'),
+            ], args.messages, args.rounds, args.turns)
+        if shutil.which('rustc'):
+            results['rust'] = best_in_turns([
+                build_rust(directory, ir, name='fields_rust'),
+                build_rust(directory, ir, encode_calls(ir, 'rust', body_fields, f'order.start_with_header_at(&header, sequence as u64, {timestamp_argument(SENDING_TIME, "rust")})'), RUST_SETUP, 'header_rust'),
+            ], args.messages, args.rounds, args.turns)
+    for language, (fields_ns, header_ns) in results.items():
+        print(f'{language:<8}{fields_ns:>16.1f}{header_ns:>16.1f}{(fields_ns - header_ns) / fields_ns:>10.0%}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Construction time and memory of the tag trie: the former recursive TreeDefinition against TagTree.
+
+    python -m benchmarks.bench_tag_tree '''
+
+import time
+import tracemalloc
+from app.definition import *
+from app.definition_helper import DefinitionHelper
+from app.stream_parser import StreamParser
+
+class LegacyTreeNode:
+    ''' the dict per node tree built by DefinitionHelper.generate_tree_definition before TagTree '''
+    def __init__(self):
+        self.value = None
+        self.tree_ids = dict()
+        self.depth = 1
+
+def legacy_node_value(value, depth):
+    result_node = LegacyTreeNode()
+    result_node.tree_ids = None
+    result_node.depth = depth
+    result_node.value = value
+    return result_node
+
+def legacy_node_eq(value, depth):
+    result_node = LegacyTreeNode()
+    result_node.depth = depth
+    result_node.tree_ids['='] = legacy_node_value(value, depth + 1)
+    return result_node
+
+def legacy_generate_tree_definition(field_id, current_node, value):
+    if len(field_id) == 1:
+        if field_id in current_node.tree_ids:
+            raise Exception(f'Internal Error: already defined value')
+        current_node.tree_ids[field_id] = legacy_node_eq(value, current_node.depth + 1)
+    else:
+        current_value = field_id[0]
+        if current_value in current_node.tree_ids:
+            new_node = current_node.tree_ids[current_value]
+        else:
+            new_node = LegacyTreeNode()
+            new_node.depth = current_node.depth + 1
+            current_node.tree_ids[current_value] = new_node
+        legacy_generate_tree_definition(field_id[1:], new_node, value)
+
+def legacy_build(fields):
+    root_node = LegacyTreeNode()
+    for field in sorted(fields.items(), key=lambda x: str(x[0])):
+        legacy_generate_tree_definition(str(field[0]), root_node, field[1])
+    return root_node
+
+def tag_tree_build(fields):
+    return TagTree.from_fields(fields)
+
+def bundled_tag_sets(path: str) -> list:
+    ''' tag sets of the messages of a bundled dictionary '''
+    schema = StreamParser.from_file(path).get_schema(None)
+    component_definition = DefinitionHelper.generate_component_definition(schema.components, schema.fields)
+    messages = DefinitionHelper.generate_message_definition(schema.message, schema.fields, component_definition, schema.header, schema.trailer)
+    return [message.fields for message in messages.values()]
+
+def synthetic_tag_set(number_of_tags: int) -> list:
+    ''' one message with standard tags and custom 5 digit tags '''
+    fields = {}
+    for index in range(number_of_tags):
+        number = 1 + index if index < number_of_tags // 2 else 20000 + index * 3
+        fields[number] = FieldValue(name = f'Field{number}')
+    return [fields]
+
+def measure(build, tag_sets: list, repeat: int) -> tuple:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for fields in tag_sets:
+            build(fields)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best == None else min(best, elapsed)
+    tracemalloc.start()
+    trees = [build(fields) for fields in tag_sets]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del trees
+    return best, retained
+
+def main() -> None:
+    inputs = [
+        ('FIXLF44_Cash.xml', bundled_tag_sets('resources/FIXLF44_Cash.xml')),
+        ('fix_definition.xml', bundled_tag_sets('resources/fix_definition.xml')),
+        ('synthetic 5000 tags', synthetic_tag_set(5000)),
+    ]
+    print(f'{"tag sets":<22}{"tags":>8}{"builder":>10}{"ms":>10}{"retained KB":>14}')
+    for name, tag_sets in inputs:
+        number_of_tags = sum(len(fields) for fields in tag_sets)
+        for builder_name, build in [('legacy', legacy_build), ('TagTree', tag_tree_build)]:
+            elapsed, retained = measure(build, tag_sets, 20)
+            print(f'{name:<22}{number_of_tags:>8}{builder_name:>10}{elapsed * 1000:>10.2f}{retained / 1024:>14.1f}')
+
+if __name__ == '__main__':
+    main()
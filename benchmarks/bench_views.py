@@ -0,0 +1,215 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Decoding of framed FIXLF44_Cash messages into the generated views: the C++ XView classes against the
+    borrowing Rust structs. Each decoder reads MsgSeqNum and iterates the entries of the repeating groups,
+    the checksums of both must match. Needs g++ and/or rustc.
+
+    python -m benchmarks.bench_views [--messages 20000] [--repeat 20] [--rounds 7] '''
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from app.generation.cpp import Generator as CppGenerator
+from app.generation.rust import Generator as RustGenerator
+from app.generator import GeneratorBase
+from benchmarks.fix_corpus import *
+
+PACKAGE = 'fix_views'
+
+CPP_MAIN = '''
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <vector>
+#include "fix_views/messages.h"
+
+struct Record
+{
+    std::uint32_t kind;
+    const char* begin;
+    const char* end;
+};
+
+static bool decode(std::uint32_t kind, const char* begin, const char* end, std::uint64_t& checksum)
+{
+    switch (kind) {
+@CASES@
+    }
+    return false;
+}
+
+int main(int argc, char** argv)
+{
+    std::ifstream file(argv[1], std::ios::binary);
+    const std::vector<char> corpus((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    const int repeat = std::atoi(argv[2]);
+    const int rounds = std::atoi(argv[3]);
+    std::vector<Record> records;
+    for (std::size_t offset = 0; offset < corpus.size();) {
+        std::uint32_t header[2];
+        std::memcpy(header, corpus.data() + offset, sizeof(header));
+        offset += sizeof(header);
+        records.push_back(Record{header[0], corpus.data() + offset, corpus.data() + offset + header[1]});
+        offset += header[1];
+    }
+
+    double best = 0;
+    std::uint64_t checksum = 0;
+    for (int round = 0; round < rounds; ++round) {
+        checksum = 0;
+        const auto start = std::chrono::steady_clock::now();
+        for (int iteration = 0; iteration < repeat; ++iteration) {
+            for (const Record& record : records) {
+                if (!decode(record.kind, record.begin, record.end, checksum)) {
+                    std::printf("malformed message\\n");
+                    return 1;
+                }
+            }
+        }
+        const double elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+        if (best == 0 || elapsed < best) {
+            best = elapsed;
+        }
+    }
+    std::printf("%.3f %llu\\n", best / double(records.size() * repeat), static_cast<unsigned long long>(checksum));
+    return 0;
+}
+'''
+
+RUST_MAIN = '''
+mod fix_views;
+
+use fix_views::messages;
+use std::time::Instant;
+
+fn decode(kind: u32, input: &[u8], checksum: &mut u64) -> bool {
+    match kind {
+@CASES@
+        _ => false,
+    }
+}
+
+fn main() {
+    let arguments: Vec<String> = std::env::args().collect();
+    let corpus = std::fs::read(&arguments[1]).unwrap();
+    let repeat: usize = arguments[2].parse().unwrap();
+    let rounds: usize = arguments[3].parse().unwrap();
+    let mut records = Vec::new();
+    let mut offset = 0;
+    while offset < corpus.len() {
+        let kind = u32::from_le_bytes(corpus[offset..offset + 4].try_into().unwrap());
+        let length = u32::from_le_bytes(corpus[offset + 4..offset + 8].try_into().unwrap()) as usize;
+        offset += 8;
+        records.push((kind, &corpus[offset..offset + length]));
+        offset += length;
+    }
+
+    let mut best = 0.0;
+    let mut checksum = 0u64;
+    for _ in 0..rounds {
+        checksum = 0;
+        let start = Instant::now();
+        for _ in 0..repeat {
+            for &(kind, input) in &records {
+                if !decode(kind, input, &mut checksum) {
+                    println!("malformed message");
+                    std::process::exit(1);
+                }
+            }
+        }
+        let elapsed = start.elapsed().as_nanos() as f64;
+        if best == 0.0 || elapsed < best {
+            best = elapsed;
+        }
+    }
+    println!("{:.3} {}", best / (records.len() * repeat) as f64, checksum);
+}
+'''
+
+def group_fields(message: dict) -> list:
+    return [field['name'] for field in message['fields_by_order'] if field['token'] == 'group']
+
+def cpp_cases(messages: list) -> str:
+    cases = []
+    for kind, message in enumerate(messages):
+        cases += [f'    case {kind}: {{', f'        {PACKAGE}::{message["name"]}View view;',
+                  '        if (!view.decode(begin, end)) {', '            return false;', '        }',
+                  '        checksum += static_cast<std::uint64_t>(view.msg_seq_num());']
+        for name in group_fields(message):
+            cases += [f'        for (const {PACKAGE}::{name}Entry& entry : view.{CppGenerator.accessor_name(name)}()) {{',
+                      '            (void)entry;', '            ++checksum;', '        }']
+        cases += ['        return true;', '    }']
+    return '\n'.join(cases)
+
+def rust_cases(messages: list) -> str:
+    cases = []
+    for kind, message in enumerate(messages):
+        cases += [f'        {kind} => match messages::{message["name"]}::decode(input) {{', '            Ok(message) => {',
+                  '                *checksum += message.msg_seq_num().unwrap_or(0) as u64;']
+        for name in group_fields(message):
+            cases += [f'                *checksum += message.{RustGenerator.accessor_name(name)}().count() as u64;']
+        cases += ['                true', '            }', '            Err(_) => false,', '        },']
+    return '\n'.join(cases)
+
+def write_corpus(path: str, ir: dict, message_names: list, count: int) -> None:
+    ''' complete messages with their repeating groups, framed with BodyLength and CheckSum '''
+    corpus = CorpusGenerator(ir).corpus(message_names, count)
+    with open(path, 'wb') as corpus_file:
+        for name, body in corpus:
+            encoded = frame_message(body)
+            corpus_file.write(struct.pack('<II', message_names.index(name), len(encoded)))
+            corpus_file.write(encoded)
+
+def bench_cpp(directory: str, ir: dict, messages: list, corpus_path: str, repeat: int, rounds: int) -> tuple:
+    CppGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, 'main.cpp'), 'w') as main_file:
+        main_file.write(CPP_MAIN.replace('@CASES@', cpp_cases(messages)))
+    executable = os.path.join(directory, 'bench_cpp')
+    subprocess.run(['g++', '-std=c++17', '-O2', '-I', directory, '-o', executable, os.path.join(directory, 'main.cpp')], check=True)
+    per_message, checksum = subprocess.run([executable, corpus_path, str(repeat), str(rounds)], check=True, capture_output=True, text=True).stdout.split()
+    return float(per_message), checksum
+
+def bench_rust(directory: str, ir: dict, messages: list, corpus_path: str, repeat: int, rounds: int) -> tuple:
+    RustGenerator(directory).generate_from_ir(ir)
+    with open(os.path.join(directory, 'main.rs'), 'w') as main_file:
+        main_file.write(RUST_MAIN.replace('@CASES@', rust_cases(messages)))
+    executable = os.path.join(directory, 'bench_rust')
+    subprocess.run(['rustc', '--edition', '2021', '-O', '-o', executable, os.path.join(directory, 'main.rs')], check=True)
+    per_message, checksum = subprocess.run([executable, corpus_path, str(repeat), str(rounds)], check=True, capture_output=True, text=True).stdout.split()
+    return float(per_message), checksum
+
+def main() -> None:
+    parser = ArgumentParser(description='generated C++ views against the generated Rust structs')
+    parser.add_argument('--messages', default=20000, type=int)
+    parser.add_argument('--repeat', default=20, type=int, help='passes over the corpus per round')
+    parser.add_argument('--rounds', default=7, type=int, help='the best round is kept')
+    args = parser.parse_args()
+
+    ir = load_ir('resources/FIXLF44_Cash.xml')
+    ir['package'] = PACKAGE
+    messages = [message for name in CASH_MESSAGES for message in ir['messages'] if message['name'] == name]
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, 'corpus.bin')
+        write_corpus(corpus_path, ir, CASH_MESSAGES, args.messages)
+        corpus_bytes = os.path.getsize(corpus_path) - 8 * args.messages
+        print(f'{args.messages} messages of {", ".join(CASH_MESSAGES)}, {corpus_bytes} bytes, {args.rounds} rounds of {args.repeat} passes')
+        print(f'{"":<8}{"ns/msg":>12}{"MB/s":>12}')
+        results = {}
+        if shutil.which('g++'):
+            results['c++'] = bench_cpp(directory, ir, messages, corpus_path, args.repeat, args.rounds)
+        if shutil.which('rustc'):
+            results['rust'] = bench_rust(directory, ir, messages, corpus_path, args.repeat, args.rounds)
+        for language, (per_message, _) in results.items():
+            print(f'{language:<8}{per_message:>12.1f}{corpus_bytes / args.messages / per_message * 1000:>12.1f}')
+        if len(set(checksum for _, checksum in results.values())) > 1:
+            raise Exception('the decoders read different values')
+
+if __name__ == '__main__':
+    main()
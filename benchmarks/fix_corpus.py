@@ -0,0 +1,105 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+''' Synthetic FIX traffic for the benchmarks: messages of a dictionary filled with plausible values,
+    framed with BodyLength and CheckSum. The generation is seeded, the same arguments give the same bytes. '''
+
+import random
+from typing import List, Tuple
+from app.definition_helper import DefinitionHelper
+from app.generator import GeneratorBase, GeneratorOptions
+from app.stream_parser import StreamParser
+
+SOH = '\x01'
+
+""" header and trailer tags written by frame_message, never part of a generated body """
+FRAMING_TAGS = [8, 9, 10]
+
+""" the messages of FIXLF44_Cash used by the benchmarks, order flow first """
+CASH_MESSAGES = ['NewOrderSingle', 'ExecutionReport', 'OrderCancelRequest', 'OrderCancelReplaceRequest', 'Heartbeat', 'Quote']
+
+def load_ir(path: str, options: GeneratorOptions = GeneratorOptions()) -> dict:
+    schema = StreamParser.from_file(path).get_schema(None)
+    return GeneratorBase.make_ir(DefinitionHelper.generate_schema_definition_from_schema_parser(schema), options)
+
+def field_value(field: dict, generator: random.Random) -> str:
+    if len(field['values']) != 0:
+        return generator.choice(field['values'])['value']
+    field_type = field['type']
+    if field_type in ['INT', 'LENGTH', 'NUMINGROUP', 'SEQNUM']:
+        return str(generator.randint(1, 99999))
+    if field_type in ['PRICE', 'AMT', 'PRICEOFFSET', 'FLOAT', 'PERCENTAGE']:
+        return f'{generator.randint(1, 9999999) / 100:.2f}'
+    if field_type == 'QTY':
+        return str(generator.randint(1, 10000))
+    if field_type == 'BOOLEAN':
+        return generator.choice(['Y', 'N'])
+    if field_type == 'CHAR':
+        return generator.choice('0123456789ABCDEF')
+    if field_type == 'UTCTIMESTAMP':
+        return f'20250102-{generator.randint(0, 23):02}:{generator.randint(0, 59):02}:{generator.randint(0, 59):02}.{generator.randint(0, 999):03}'
+    if field_type in ['UTCDATEONLY', 'LOCALMKTDATE']:
+        return f'202501{generator.randint(1, 28):02}'
+    if field_type == 'UTCTIMEONLY':
+        return f'{generator.randint(0, 23):02}:{generator.randint(0, 59):02}:{generator.randint(0, 59):02}'
+    if field_type == 'CURRENCY':
+        return generator.choice(['EUR', 'USD', 'GBP'])
+    return ''.join(generator.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789') for _ in range(generator.randint(4, 12)))
+
+class CorpusGenerator:
+    def __init__(self, ir: dict, seed: int = 1, optional_ratio: float = 0.5, with_groups: bool = True) -> None:
+        self.ir = ir
+        self.generator = random.Random(seed)
+        self.optional_ratio = optional_ratio
+        self.with_groups = with_groups
+        self.fields = {field['name']: field for field in ir['fields']}
+        self.groups = {group['name']: group for group in ir['groups']}
+        self.messages = {message['name']: message for message in ir['messages']}
+        self.sequence = 0
+
+    def entries(self, fields_by_order: list, body: list) -> None:
+        for index, entry in enumerate(fields_by_order):
+            if entry['id'] in FRAMING_TAGS:
+                continue
+            # the start field of a group entry is always present
+            required = index == 0 or entry['required'] in [True, 'True']
+            if not required and self.generator.random() >= self.optional_ratio:
+                continue
+            if entry['token'] == 'group':
+                if not self.with_groups:
+                    continue
+                group = self.groups[entry['name']]
+                count = self.generator.randint(1, 3)
+                body.append((entry['id'], str(count)))
+                for _ in range(count):
+                    self.entries(group['fields_by_order'], body)
+            else:
+                body.append((entry['id'], self.value(entry)))
+
+    def value(self, entry: dict) -> str:
+        if entry['id'] == 35:
+            return self.current['type']
+        if entry['id'] == 34:
+            return str(self.sequence)
+        return field_value(self.fields[entry['name']], self.generator)
+
+    def body(self, message_name: str) -> List[Tuple[int, str]]:
+        ''' the fields of a message without BeginString, BodyLength and CheckSum '''
+        self.current = self.messages[message_name]
+        self.sequence += 1
+        body = []
+        self.entries(self.current['fields_by_order'], body)
+        return body
+
+    def corpus(self, message_names: List[str], count: int) -> List[Tuple[str, List[Tuple[int, str]]]]:
+        return [(name, self.body(name)) for name in [self.generator.choice(message_names) for _ in range(count)]]
+
+def encode_fields(fields: List[Tuple[int, str]]) -> bytes:
+    return ''.join(f'{tag}={value}{SOH}' for tag, value in fields).encode('latin-1')
+
+def frame_message(body: List[Tuple[int, str]], begin_string: str = 'FIX.4.4') -> bytes:
+    ''' the complete message, BodyLength counts the bytes after its SOH up to the CheckSum '''
+    encoded_body = encode_fields(body)
+    head = f'8={begin_string}{SOH}9={len(encoded_body)}{SOH}'.encode('latin-1')
+    checksum = (sum(head) + sum(encoded_body)) % 256
+    return head + encoded_body + f'10={checksum:03}{SOH}'.encode('latin-1')
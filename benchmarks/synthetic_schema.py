@@ -0,0 +1,166 @@
+# Copyright (C) 2025 Roberto Martin Fantini <martin.fantini@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from typing import List
+
+HEADER_FIELDS = [
+    (8, 'BeginString', 'STRING'),
+    (9, 'BodyLength', 'LENGTH'),
+    (35, 'MsgType', 'STRING'),
+    (34, 'MsgSeqNum', 'SEQNUM'),
+    (49, 'SenderCompID', 'STRING'),
+    (52, 'SendingTime', 'UTCTIMESTAMP'),
+    (56, 'TargetCompID', 'STRING'),
+]
+
+TRAILER_FIELDS = [
+    (10, 'CheckSum', 'STRING'),
+]
+
+""" cycle of types used for the synthetic fields, CHAR fields are generated as enums """
+FIELD_TYPES = ['STRING', 'INT', 'PRICE', 'QTY', 'CHAR', 'UTCTIMESTAMP']
+
+class _TagAllocator:
+    ''' standard range first, custom range (9000+) for the second half '''
+    def __init__(self, number_of_fields: int) -> None:
+        self.standard_limit = number_of_fields // 2
+        self.count = 0
+        self.next_standard = 100
+        self.next_custom = 9000
+
+    def next(self) -> int:
+        self.count += 1
+        if self.count <= self.standard_limit:
+            self.next_standard += 1
+            return self.next_standard
+        self.next_custom += 1
+        return self.next_custom
+
+def generate_dictionary(number_of_fields: int = 1000, number_of_components: int = 50, number_of_messages: int = 100,
+                        fields_per_component: int = 5, group_fields: int = 4, components_per_message: int = 3,
+                        fields_per_message: int = 10) -> str:
+    ''' returns a FIX dictionary in the quickFIX repository format, resolvable by DefinitionHelper '''
+    pool_size = max(number_of_fields - number_of_components * (fields_per_component + 1 + group_fields), fields_per_message)
+    allocator = _TagAllocator(pool_size + number_of_components * (fields_per_component + 1 + group_fields))
+    fields: List[str] = []
+
+    def new_field(name: str, field_type: str | None = None) -> str:
+        index = len(fields)
+        field_type = field_type or FIELD_TYPES[index % len(FIELD_TYPES)]
+        number = allocator.next()
+        if field_type == 'CHAR':
+            values = ''.join(f'<value enum="{chr(65 + value)}" description="{name.upper()}_VALUE_{value}"/>' for value in range(5))
+            fields.append(f'    <field number="{number}" name="{name}" type="CHAR">{values}</field>')
+        else:
+            fields.append(f'    <field number="{number}" name="{name}" type="{field_type}"/>')
+        return name
+
+    components = []
+    for component_index in range(number_of_components):
+        lines = [f'    <component name="Component{component_index}">']
+        for field_index in range(fields_per_component):
+            lines.append(f'      <field name="{new_field(f"C{component_index}Field{field_index}")}" required="{"Y" if field_index % 2 == 0 else "N"}"/>')
+        lines.append(f'      <group name="{new_field(f"NoC{component_index}Entries", "NUMINGROUP")}" required="N">')
+        for field_index in range(group_fields):
+            lines.append(f'        <field name="{new_field(f"C{component_index}GroupField{field_index}")}" required="{"Y" if field_index == 0 else "N"}"/>')
+        lines.append('      </group>')
+        lines.append('    </component>')
+        components.append('\n'.join(lines))
+
+    pool = [new_field(f'Field{field_index}') for field_index in range(pool_size)]
+
+    messages = []
+    message_types = []
+    for message_index in range(number_of_messages):
+        message_type = f'U{message_index}'
+        message_types.append(message_type)
+        lines = [f'    <message name="Message{message_index}" msgtype="{message_type}" msgcat="app">']
+        for field_index in range(fields_per_message):
+            field_name = pool[(message_index * 7 + field_index) % len(pool)]
+            lines.append(f'      <field name="{field_name}" required="{"Y" if field_index < 3 else "N"}"/>')
+        for component_offset in range(min(components_per_message, number_of_components)):
+            component_index = (message_index + component_offset * 11) % number_of_components
+            lines.append(f'      <component name="Component{component_index}" required="{"Y" if component_offset == 0 else "N"}"/>')
+        lines.append('    </message>')
+        messages.append('\n'.join(lines))
+
+    header_fields = []
+    for number, name, field_type in HEADER_FIELDS:
+        if name == 'MsgType':
+            values = ''.join(f'<value enum="{message_type}" description="MESSAGE_{index}"/>' for index, message_type in enumerate(message_types))
+            header_fields.append(f'    <field number="{number}" name="{name}" type="{field_type}">{values}</field>')
+        else:
+            header_fields.append(f'    <field number="{number}" name="{name}" type="{field_type}"/>')
+    trailer_fields = [f'    <field number="{number}" name="{name}" type="{field_type}"/>' for number, name, field_type in TRAILER_FIELDS]
+
+    return '\n'.join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<fix major="4" minor="4" version="synthetic">',
+        '  <header>',
+        *[f'    <field name="{name}" required="Y"/>' for _, name, _ in HEADER_FIELDS],
+        '  </header>',
+        '  <trailer>',
+        *[f'    <field name="{name}" required="Y"/>' for _, name, _ in TRAILER_FIELDS],
+        '  </trailer>',
+        '  <messages>',
+        *messages,
+        '  </messages>',
+        '  <components>',
+        *components,
+        '  </components>',
+        '  <fields>',
+        *header_fields,
+        *trailer_fields,
+        *fields,
+        '  </fields>',
+        '</fix>',
+        '',
+    ])
+
+def generate_nested_dictionary(depth: int, references: int, fields_per_component: int = 4) -> str:
+    ''' chain of components Nested0 <- Nested1 <- ... each one using the previous one, the outermost
+        component is referenced by every message. The components are written outermost first. '''
+    fields = [f'    <field number="{number}" name="{name}" type="{field_type}"/>' for number, name, field_type in HEADER_FIELDS + TRAILER_FIELDS]
+    components = []
+    next_number = 100
+    for level in range(depth):
+        lines = [f'    <component name="Nested{level}">']
+        for field_index in range(fields_per_component):
+            next_number += 1
+            fields.append(f'    <field number="{next_number}" name="Nested{level}Field{field_index}" type="STRING"/>')
+            lines.append(f'      <field name="Nested{level}Field{field_index}" required="N"/>')
+        if level != 0:
+            lines.append(f'      <component name="Nested{level - 1}" required="Y"/>')
+        lines.append('    </component>')
+        components.append('\n'.join(lines))
+    components.reverse()
+
+    messages = []
+    for message_index in range(references):
+        messages.append('\n'.join([
+            f'    <message name="Message{message_index}" msgtype="U{message_index}">',
+            f'      <component name="Nested{depth - 1}" required="Y"/>',
+            '    </message>',
+        ]))
+
+    return '\n'.join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<fix major="4" minor="4" version="synthetic">',
+        '  <header>',
+        *[f'    <field name="{name}" required="Y"/>' for _, name, _ in HEADER_FIELDS],
+        '  </header>',
+        '  <trailer>',
+        *[f'    <field name="{name}" required="Y"/>' for _, name, _ in TRAILER_FIELDS],
+        '  </trailer>',
+        '  <messages>',
+        *messages,
+        '  </messages>',
+        '  <components>',
+        *components,
+        '  </components>',
+        '  <fields>',
+        *fields,
+        '  </fields>',
+        '</fix>',
+        '',
+    ])